@@ -0,0 +1,488 @@
+"""
+Benchmark del parser CYK
+Ejecuta: python benchmark.py [--count N] [--max-length L] [--engine cyk|earley]
+         python benchmark.py --long   (bucle clásico vs kernels de bits y generado por longitud)
+         python benchmark.py --codec  (rendimiento de los formatos de salida)
+         python benchmark.py --tokenizer [--words N]  (throughput de tokenización)
+         python benchmark.py --baseline [archivo.json]  (regresiones contra una línea base)
+
+Parsea un corpus generado aleatoriamente y muestra en qué fases
+se va el tiempo (tokenización, llenado léxico, llenado binario, árbol).
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from src.grammar import create_english_grammar
+from src.chart import ChartPool
+from src.cnf_converter import CNFConverter
+from src.cyk_algorithm import CYKParser
+from src.parse_stats import ParseStats
+from src.parse_tree import ParseTreeBuilder
+from src.tokenizer import (
+    DEFAULT_TOKENIZER, PUNCT_DROP, PUNCT_SPLIT, TYPOGRAPHIC_MAP, Tokenizer
+)
+from src.tree_codec import (
+    BinaryTreeReader, BinaryTreeWriter, JsonlWriter, TreeCodec, read_jsonl
+)
+
+
+# Línea base local de los escenarios de regresión (ver run_baseline)
+BASELINE_FILE = 'benchmark_baseline.json'
+BASELINE_FORMAT = 1
+
+# Una métrica empeora significativamente si cambia más que la mayor de
+# MIN_TOLERANCE y NOISE_SIGMAS veces el ruido medido entre rondas
+MIN_TOLERANCE = 0.10
+NOISE_SIGMAS = 3.0
+
+# Métricas por escenario: nombre → True si un valor mayor es mejor
+BASELINE_METRICS = {
+    'throughput': True,
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+    'peak_kb': False,
+}
+
+
+def build_parser(**options):
+    """Crea la gramática, la convierte a CNF y devuelve (gramática, parser)"""
+    grammar = create_english_grammar()
+    cnf_grammar = CNFConverter(grammar).convert()
+    return grammar, CYKParser(cnf_grammar, original_grammar=grammar, **options)
+
+
+def run_phase_benchmark(count, max_length, seed, use_pool=False, engine='cyk'):
+    """
+    Parsea un corpus mixto (oraciones válidas y mutadas) con estadísticas
+
+    Args:
+        count: número de oraciones
+        max_length: longitud máxima de las oraciones generadas
+        seed: semilla del generador
+        use_pool: si reutilizar la memoria de la tabla con un ChartPool
+        engine: motor del parser ('cyk', 'earley' o 'auto')
+
+    Returns:
+        ParseStats agregadas de todo el lote
+    """
+    pool = ChartPool() if use_pool else None
+    grammar, parser = build_parser(collect_stats=True, chart_pool=pool, engine=engine)
+    generator = grammar.sentence_generator(max_length=max_length, seed=seed)
+
+    corpus = list(generator.iter_sentences(count // 2))
+    corpus += list(generator.iter_near_misses(count - len(corpus)))
+
+    batch = ParseStats()
+    start = time.perf_counter()
+
+    for sentence in corpus:
+        accepted, _, _ = parser.parse(sentence)
+        if accepted:
+            ParseTreeBuilder(parser).build_tree(sentence.split())
+        batch.merge(parser.last_stats)
+
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(corpus)} oraciones en {elapsed:.2f} s "
+          f"({len(corpus) / elapsed:.0f} oraciones/s)\n")
+    print(batch)
+
+    if pool is not None:
+        print("\nReutilización de la tabla (ChartPool):")
+        for name, value in pool.stats().items():
+            print(f"  {name:<19} {value}")
+
+    return batch
+
+
+def run_length_benchmark(lengths, seed, per_length=5):
+    """
+    Compara el bucle clásico con el kernel de bits y el generado según la longitud
+
+    Args:
+        lengths: longitudes de oración a medir
+        seed: semilla del generador
+        per_length: oraciones por longitud
+
+    Returns:
+        lista de (longitud, ms clásico, ms bits, ms generado)
+    """
+    grammar, classic = build_parser(bitset_min_length=None)
+    bitset = CYKParser(classic.grammar, engine='bitset')
+    codegen = CYKParser(classic.grammar, engine='codegen')
+    generator = grammar.sentence_generator(max_length=max(lengths), seed=seed)
+
+    print(f"{'longitud':>9} {'clásico':>12} {'bits':>12} {'aceleración':>12} {'generado':>12}")
+    rows = []
+    for length in lengths:
+        sentences = []
+        for _ in range(per_length):
+            try:
+                sentences.append(generator.generate(length))
+            except ValueError:
+                break
+        if not sentences:
+            continue
+
+        timings = []
+        for parser in (classic, bitset, codegen):
+            start = time.perf_counter()
+            for sentence in sentences:
+                parser.parse(sentence)
+            timings.append((time.perf_counter() - start) / len(sentences) * 1000)
+
+        rows.append((length, timings[0], timings[1], timings[2]))
+        print(f"{length:>9} {timings[0]:>9.2f} ms {timings[1]:>9.2f} ms "
+              f"{timings[0] / timings[1]:>11.1f}x {timings[2]:>9.2f} ms")
+    return rows
+
+
+def run_codec_benchmark(count, max_length, seed):
+    """
+    Mide la codificación y decodificación de árboles en binario y JSONL
+
+    Args:
+        count: número de oraciones (válidas) a parsear
+        max_length: longitud máxima de las oraciones generadas
+        seed: semilla del generador
+
+    Returns:
+        dict {formato: (bytes, árboles/s al escribir, árboles/s al leer)}
+    """
+    grammar, parser = build_parser()
+    generator = grammar.sentence_generator(max_length=max_length, seed=seed)
+
+    trees = []
+    parses = []
+    for sentence in generator.iter_sentences(count):
+        words = sentence.split()
+        parser.parse(words)
+        builder = ParseTreeBuilder(parser)
+        trees.append(builder.build_tree(words))
+        # Cada builder conserva la tabla de su parse (no hay ChartPool)
+        parses.append((words, builder))
+
+    codec = TreeCodec.from_grammar(parser.grammar)
+    results = {}
+
+    start = time.perf_counter()
+    binary = io.BytesIO()
+    writer = BinaryTreeWriter(binary, codec)
+    for tree in trees:
+        writer.write(tree)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    binary.seek(0)
+    decoded = sum(1 for _ in BinaryTreeReader(binary))
+    decode_time = time.perf_counter() - start
+    results['binario'] = (len(binary.getvalue()), len(trees) / encode_time,
+                          decoded / decode_time)
+
+    start = time.perf_counter()
+    binary.seek(0)
+    decoded = sum(1 for _ in BinaryTreeReader(binary).iter_compact())
+    results['binario (compacto)'] = (len(binary.getvalue()), len(trees) / encode_time,
+                                     decoded / (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    text = io.StringIO()
+    writer = JsonlWriter(text)
+    for words, builder in parses:
+        writer.write(words, True, builder)
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text.seek(0)
+    decoded = sum(1 for _ in read_jsonl(text))
+    decode_time = time.perf_counter() - start
+    results['jsonl'] = (len(text.getvalue().encode('utf-8')), len(trees) / encode_time,
+                        decoded / decode_time)
+
+    print(f"\n{len(trees)} árboles\n")
+    print(f"{'formato':<20} {'bytes/árbol':>12} {'escritura':>14} {'lectura':>14}")
+    for name, (size, write_rate, read_rate) in results.items():
+        print(f"{name:<20} {size / len(trees):>12.1f} {write_rate:>12.0f}/s "
+              f"{read_rate:>12.0f}/s")
+    return results
+
+
+def run_tokenizer_benchmark(words, max_length, seed):
+    """
+    Mide el throughput de tokenización sobre un corpus grande
+
+    El corpus repite oraciones generadas, con mayúscula inicial, comillas
+    tipográficas y puntuación final, hasta tener al menos `words` palabras.
+    La referencia es el `sentence.lower().split()` que hacían el parser y
+    main.py (dos veces por oración).
+
+    Args:
+        words: palabras mínimas del corpus
+        max_length: longitud máxima de las oraciones generadas
+        seed: semilla del generador
+
+    Returns:
+        dict {configuración: palabras/s}
+    """
+    grammar = create_english_grammar()
+    generator = grammar.sentence_generator(max_length=max_length, seed=seed)
+    base = []
+    for idx, sentence in enumerate(generator.iter_sentences(1000)):
+        if idx % 3 == 0:
+            sentence = sentence.replace(' ', ' “', 1) + '”'
+        base.append(sentence.capitalize() + ('.' if idx % 2 else '!'))
+    per_round = sum(len(sentence.split()) for sentence in base)
+    corpus = base * max(1, -(-words // per_round))
+    total = per_round * (len(corpus) // len(base))
+
+    def inline(sentence):
+        return sentence.lower().split()
+
+    def inline_twice(sentence):
+        sentence.lower().split()
+        return sentence.lower().split()
+
+    configurations = [
+        ('lower().split() ×2 (antes)', inline_twice),
+        ('lower().split()', inline),
+        ('DEFAULT_TOKENIZER', DEFAULT_TOKENIZER.tokenize),
+        ('puntuación separada', Tokenizer(punctuation=PUNCT_SPLIT,
+                                         replacements=TYPOGRAPHIC_MAP).tokenize),
+        ('sin puntuación', Tokenizer(punctuation=PUNCT_DROP).tokenize),
+        ('NFKC + casefold', Tokenizer(case_folding='casefold', punctuation=PUNCT_DROP,
+                                      unicode_form='NFKC').tokenize),
+    ]
+
+    print(f"\n{len(corpus)} oraciones, {total} palabras\n")
+    print(f"{'configuración':<28} {'palabras/s':>14} {'µs/oración':>12}")
+    results = {}
+    for name, tokenize in configurations:
+        start = time.perf_counter()
+        for sentence in corpus:
+            tokenize(sentence)
+        elapsed = time.perf_counter() - start
+        results[name] = total / elapsed
+        print(f"{name:<28} {total / elapsed:>14.0f} "
+              f"{elapsed / len(corpus) * 1e6:>12.2f}")
+    return results
+
+
+def regression_scenarios(seed):
+    """
+    Escenarios de la línea base
+
+    Returns:
+        dict {nombre: (oraciones, pasadas por ronda)}
+    """
+    from main import PREDEFINED_EXAMPLES
+    from test_quick import TEST_SENTENCES
+
+    generator = create_english_grammar().sentence_generator(max_length=96, seed=seed)
+    long_inputs = [" ".join(generator.generate(length)) for length in (32, 64, 96)]
+
+    return {
+        'test_quick': ([sentence for sentence, _ in TEST_SENTENCES], 100),
+        'predefined': (
+            [sentence for group in PREDEFINED_EXAMPLES.values() for sentence in group], 100
+        ),
+        'synthetic_long': (long_inputs, 10),
+    }
+
+
+def _percentile(values, q):
+    """Percentil q (0-100) por rango más cercano de una lista ordenada"""
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def measure_scenario(sentences, passes, rounds):
+    """
+    Mide un escenario con el parser por defecto (sin caché)
+
+    Args:
+        sentences: oraciones del escenario
+        passes: veces que se parsea la lista en cada ronda
+        rounds: rondas; la variación entre ellas estima el ruido
+
+    Returns:
+        dict {métrica: lista con un valor por ronda}; peak_kb es un solo valor
+    """
+    _, parser = build_parser()
+    for sentence in sentences:
+        parser.parse(sentence)
+
+    result = {metric: [] for metric in BASELINE_METRICS if metric != 'peak_kb'}
+    for _ in range(rounds):
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(passes):
+            for sentence in sentences:
+                latencies.append(parser.parse(sentence)[1] * 1000)
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        result['throughput'].append(len(latencies) / elapsed)
+        for q in (50, 95, 99):
+            result[f'p{q}_ms'].append(_percentile(latencies, q))
+
+    # La memoria se mide aparte: tracemalloc hace más lento el parsing
+    tracemalloc.start()
+    for sentence in sentences:
+        parser.parse(sentence)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result['peak_kb'] = peak / 1024
+    return result
+
+
+def _mean_and_cv(values):
+    """Media y coeficiente de variación de una métrica (lista o valor)"""
+    if not isinstance(values, list):
+        return values, 0.0
+    mean = statistics.mean(values)
+    if len(values) < 2 or mean == 0:
+        return mean, 0.0
+    return mean, statistics.stdev(values) / mean
+
+
+def compare_to_baseline(baseline, current):
+    """
+    Compara mediciones con la línea base
+
+    Returns:
+        lista de (escenario, métrica, base, actual, cambio, tolerancia, regresión);
+        cambio es relativo y positivo cuando la métrica empeora
+    """
+    rows = []
+    for scenario, metrics in sorted(current.items()):
+        base_metrics = baseline.get(scenario)
+        if base_metrics is None:
+            continue
+        for metric, higher_is_better in BASELINE_METRICS.items():
+            if metric not in base_metrics:
+                continue
+            base, base_cv = _mean_and_cv(base_metrics[metric])
+            value, cv = _mean_and_cv(metrics[metric])
+            if base == 0:
+                continue
+            change = (value - base) / base
+            if higher_is_better:
+                change = -change
+            tolerance = max(MIN_TOLERANCE, NOISE_SIGMAS * math.sqrt(base_cv ** 2 + cv ** 2))
+            rows.append((scenario, metric, base, value, change, tolerance, change > tolerance))
+    return rows
+
+
+def run_baseline(path, rounds, seed, update=False):
+    """
+    Mide los escenarios y los compara con la línea base guardada en path
+
+    Si el archivo no existe (o update es True) se guardan las mediciones
+    como nueva línea base.
+
+    Returns:
+        código de salida: 1 si alguna métrica empeoró más que su tolerancia
+    """
+    current = {}
+    for name, (sentences, passes) in regression_scenarios(seed).items():
+        print(f"Midiendo {name} ({len(sentences)} oraciones × {passes}, {rounds} rondas)...")
+        current[name] = measure_scenario(sentences, passes, rounds)
+
+    if update or not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'format': BASELINE_FORMAT,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'scenarios': current,
+            }, f, indent=2)
+        print(f"\nLínea base guardada en {path}")
+        return 0
+
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('format') != BASELINE_FORMAT:
+        raise ValueError(f"Formato de línea base no soportado: {path}")
+
+    rows = compare_to_baseline(baseline['scenarios'], current)
+    print(f"\n{'escenario':<16} {'métrica':<11} {'base':>11} {'actual':>11} "
+          f"{'cambio':>8} {'tolerancia':>11}")
+    regressions = 0
+    for scenario, metric, base, value, change, tolerance, regressed in rows:
+        mark = "  REGRESIÓN" if regressed else ""
+        print(f"{scenario:<16} {metric:<11} {base:>11.3f} {value:>11.3f} "
+              f"{change:>+7.1%} {tolerance:>10.1%}{mark}")
+        regressions += regressed
+
+    if regressions:
+        print(f"\n✗ {regressions} métrica(s) empeoraron más que el ruido medido")
+        return 1
+    print("\n✓ Sin regresiones respecto a la línea base")
+    return 0
+
+
+def main():
+    """Función principal"""
+    arg_parser = argparse.ArgumentParser(description="Benchmark del parser CYK")
+    arg_parser.add_argument('--count', type=int, default=2000,
+                            help="número de oraciones del corpus")
+    arg_parser.add_argument('--max-length', type=int, default=12,
+                            help="longitud máxima de las oraciones generadas")
+    arg_parser.add_argument('--seed', type=int, default=42,
+                            help="semilla del generador")
+    arg_parser.add_argument('--pool', action='store_true',
+                            help="reutilizar la memoria de la tabla entre parseos")
+    arg_parser.add_argument('--engine', choices=('cyk', 'earley', 'auto'), default='cyk',
+                            help="motor del parser")
+    arg_parser.add_argument('--long', action='store_true',
+                            help="comparar bucle clásico y kernel de bits por longitud")
+    arg_parser.add_argument('--codec', action='store_true',
+                            help="medir los formatos de salida binario y JSONL")
+    arg_parser.add_argument('--tokenizer', action='store_true',
+                            help="medir el throughput de tokenización")
+    arg_parser.add_argument('--words', type=int, default=1000000,
+                            help="palabras del corpus en --tokenizer")
+    arg_parser.add_argument('--baseline', nargs='?', const=BASELINE_FILE, metavar='ARCHIVO',
+                            help="comparar los escenarios de regresión con una línea "
+                                 f"base JSON (por defecto {BASELINE_FILE})")
+    arg_parser.add_argument('--update-baseline', action='store_true',
+                            help="guardar las mediciones como nueva línea base")
+    arg_parser.add_argument('--rounds', type=int, default=5,
+                            help="rondas por escenario en --baseline")
+    args = arg_parser.parse_args()
+
+    print("="*70)
+    print("BENCHMARK DEL PARSER CYK")
+    print("="*70)
+
+    if args.baseline or args.update_baseline:
+        return run_baseline(args.baseline or BASELINE_FILE, args.rounds, args.seed,
+                            update=args.update_baseline)
+
+    if args.codec:
+        run_codec_benchmark(args.count, args.max_length, args.seed)
+        return
+
+    if args.tokenizer:
+        run_tokenizer_benchmark(args.words, args.max_length, args.seed)
+        return
+
+    if args.long:
+        run_length_benchmark([8, 12, 16, 20, 24, 32, 48, 80, 120, 200], args.seed)
+        return
+
+    run_phase_benchmark(args.count, args.max_length, args.seed, args.pool, args.engine)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
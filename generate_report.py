@@ -1,480 +1,692 @@
 """
 Generador de informe técnico automático en Markdown
-Ejecuta: python generate_report.py
+Ejecuta: python generate_report.py [--workers N] [--rebuild]
 
 Genera un archivo 'INFORME_TECNICO.md' con todos los resultados
+
+El informe se arma por secciones. Cada sección tiene una llave con sus
+entradas (hash de la gramática, resultados de los ejemplos, ...) y su
+texto se guarda en REPORT_CACHE; al volver a generar el informe solo se
+reescriben las secciones cuyas entradas cambiaron. Los ejemplos se
+parsean con ParsePipeline (en varios procesos si son muchos) y su
+resultado se guarda por oración y hash de la gramática CNF, así que solo
+se parsean las oraciones nuevas.
 """
 
+import argparse
+import hashlib
+import io
+import json
+import os
 from datetime import datetime
 from src.grammar import create_english_grammar
 from src.cnf_converter import CNFConverter
-from src.cyk_algorithm import CYKParser
+from src.grammar_profile import GrammarProfile
 from src.parse_tree import ParseTreeBuilder
+from src.pipeline import ParsePipeline
+
+
+REPORT_FILE = "INFORME_TECNICO.md"
+REPORT_CACHE = ".report_cache.json"
+
+# Incrementar al cambiar el texto o el formato de una sección: invalida
+# las secciones y ejemplos guardados en REPORT_CACHE
+REPORT_VERSION = 2
+
+# Ejemplos por lote de ParsePipeline; con menos de dos lotes pendientes
+# se parsea en el proceso actual (el pool no compensa)
+EXAMPLES_PER_WORKER = 64
+
+# Ejemplos del informe por categoría (título de la subsección), cada uno
+# con su tipo para la tabla comparativa
+EXAMPLES = {
+    "### Ejemplos Semánticamente Correctos": [
+        ("she eats a cake", "Correcta"),
+        ("the dog drinks the beer", "Correcta")
+    ],
+    "### Ejemplos Sintácticamente Correctos pero Semánticamente Incorrectos": [
+        ("the fork eats the oven", "Sintáctica"),
+        ("he drinks a knife", "Sintáctica")
+    ],
+    "### Ejemplos No Aceptados por la Gramática": [
+        ("she eats", "Incompleta"),
+        ("eats she cake", "Orden incorrecto")
+    ]
+}
+
+
+class ReportContext:
+    """
+    Entradas de las secciones del informe
+
+    Atributos:
+        original_grammar, cnf_grammar: gramáticas del informe
+        results: lista de dicts por ejemplo (sentence, category, type,
+                 accepted, time, detail) en el orden de EXAMPLES
+        avg_time: tiempo promedio de parsing de los ejemplos (segundos)
+    """
+
+    def __init__(self, original_grammar, cnf_grammar, results):
+        self.original_grammar = original_grammar
+        self.cnf_grammar = cnf_grammar
+        self.results = results
+        self.avg_time = sum(r['time'] for r in results) / len(results)
+
+
+def render_example(parser, words, accepted):
+    """
+    Tabla CYK y árbol de un ejemplo (formatter de ParsePipeline)
+
+    Se ejecuta en el proceso que parseó la oración, justo después del parse.
+    """
+    f = io.StringIO()
+    f.write("**Tabla CYK**:\n\n")
+    f.write("```\n")
+    f.write(f"Palabras: {' '.join(words)}\n\n")
+    parser.write_table_rows(words, f)
+
+    f.write("```\n\n")
+
+    # Si es aceptada, mostrar árbol
+    if accepted:
+        builder = ParseTreeBuilder(parser)
+
+        f.write("**Árbol de Parsing**:\n\n")
+        f.write("```\n")
+        builder.write_ascii(words, f)
+        f.write("\n```\n\n")
+
+        f.write("**Notación de Brackets**:\n\n")
+        f.write("```\n")
+        builder.write_brackets(words, f)
+        f.write("\n```\n\n")
+    return f.getvalue()
+
 
+def parse_examples(cnf_grammar, cache, workers):
+    """
+    Resultados de los ejemplos, parseando solo los que no están en la caché
 
-def generate_technical_report():
-    """Genera el informe técnico completo en Markdown"""
+    Args:
+        cnf_grammar: gramática en CNF
+        cache: dict {llave: resultado} (se actualiza en el lugar); la llave
+               combina la oración y el hash de la gramática
+        workers: procesos máximos para parsear
+
+    Returns:
+        tuple (resultados en el orden de EXAMPLES, ejemplos parseados)
+    """
+    fingerprint = cnf_grammar.fingerprint()
+
+    def key(sentence):
+        return f"{fingerprint}:{sentence}"
+
+    missing = []
+    for examples in EXAMPLES.values():
+        for sentence, _ in examples:
+            if key(sentence) not in cache and sentence not in missing:
+                missing.append(sentence)
+
+    if missing:
+        batches = len(missing) // EXAMPLES_PER_WORKER
+        pipeline = ParsePipeline(
+            cnf_grammar, workers=min(workers, batches) if batches >= 2 else 1,
+            batch_size=EXAMPLES_PER_WORKER, formatter=render_example
+        )
+        for result in pipeline.run_sentences(missing):
+            cache[key(result.sentence)] = {
+                'accepted': result.accepted,
+                'time': result.time_taken,
+                'detail': result.output,
+            }
+
+    results = []
+    for category, examples in EXAMPLES.items():
+        for sentence, example_type in examples:
+            entry = dict(cache[key(sentence)])
+            entry['sentence'] = sentence
+            entry['category'] = category
+            entry['type'] = example_type
+            results.append(entry)
+    return results, len(missing)
+
+
+def _write_introduction(f, context):
+    """Portada, tabla de contenidos, introducción, objetivos y diseño"""
+    # Portada
+    f.write("# PROYECTO 2 - PARSER CYK\n")
+    f.write("## Teoría de la Computación\n\n")
     
-    # Preparar sistema
-    print("Inicializando sistema...")
-    original_grammar = create_english_grammar()
-    converter = CNFConverter(original_grammar)
-    cnf_grammar = converter.convert()
-    parser = CYKParser(cnf_grammar)
+    f.write("---\n\n")
     
-    # Crear archivo de informe
-    filename = "INFORME_TECNICO.md"
+    f.write("### Integrantes\n\n")
+    f.write("- **Diego André Rosales Valenzuela** – 23258\n")
+    f.write("- **Diego José López Campos** – 23242\n")
+    f.write("- **Erick Antonio Guerra Illescas** – 23208\n\n")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        # Portada
-        f.write("# PROYECTO 2 - PARSER CYK\n")
-        f.write("## Teoría de la Computación\n\n")
-        
-        f.write("---\n\n")
-        
-        f.write("### Integrantes\n\n")
-        f.write("- **Diego André Rosales Valenzuela** – 23258\n")
-        f.write("- **Diego José López Campos** – 23242\n")
-        f.write("- **Erick Antonio Guerra Illescas** – 23208\n\n")
-        
-        f.write("**Guatemala, 12 de septiembre de 2025**\n\n")
-        
-        f.write("---\n\n")
-        
-        # Tabla de contenidos
-        f.write("## Tabla de Contenidos\n\n")
-        f.write("1. [Introducción](#introducción)\n")
-        f.write("2. [Objetivos](#objetivos)\n")
-        f.write("3. [Diseño de la Aplicación](#diseño-de-la-aplicación)\n")
-        f.write("4. [Gramática Original](#gramática-original-cfg)\n")
-        f.write("5. [Conversión a CNF](#conversión-a-forma-normal-de-chomsky-cnf)\n")
-        f.write("6. [Algoritmo CYK](#algoritmo-cyk)\n")
-        f.write("7. [Ejemplos y Pruebas](#ejemplos-y-pruebas)\n")
-        f.write("8. [Análisis de Resultados](#análisis-de-resultados)\n")
-        f.write("9. [Obstáculos Encontrados](#obstáculos-encontrados-y-soluciones)\n")
-        f.write("10. [Conclusiones](#conclusiones)\n")
-        f.write("11. [Referencias](#referencias)\n\n")
-        
-        f.write("---\n\n")
-        
-        # Introducción
-        f.write("## Introducción\n\n")
-        f.write("Este proyecto implementa un **parser sintáctico** basado en el algoritmo **CYK** ")
-        f.write("(Cocke-Younger-Kasami) para gramáticas libres de contexto. El sistema es capaz de:\n\n")
-        f.write("- Convertir automáticamente gramáticas CFG a Forma Normal de Chomsky (CNF)\n")
-        f.write("- Validar sintácticamente oraciones en inglés\n")
-        f.write("- Construir y visualizar árboles de parsing\n")
-        f.write("- Medir tiempos de ejecución del algoritmo\n\n")
-        
-        f.write("El proyecto está desarrollado en **Python 3** utilizando una arquitectura modular ")
-        f.write("que separa las responsabilidades en componentes independientes.\n\n")
-        
-        # Objetivos
-        f.write("## Objetivos\n\n")
-        f.write("### Objetivo General\n\n")
-        f.write("Implementar un sistema completo de parsing sintáctico utilizando el algoritmo CYK ")
-        f.write("para validar oraciones simples en inglés según una gramática libre de contexto.\n\n")
-        
-        f.write("### Objetivos Específicos\n\n")
-        f.write("1. Implementar la conversión de gramáticas CFG a Forma Normal de Chomsky\n")
-        f.write("2. Desarrollar el algoritmo CYK utilizando programación dinámica\n")
-        f.write("3. Construir árboles de parsing para oraciones aceptadas\n")
-        f.write("4. Validar el sistema con ejemplos semánticamente correctos e incorrectos\n")
-        f.write("5. Analizar el rendimiento y complejidad del algoritmo\n\n")
-        
-        # Sección 1: Diseño de la Aplicación
-        f.write("---\n\n")
-        f.write("## Diseño de la Aplicación\n\n")
-        
-        f.write("### Arquitectura Modular\n\n")
-        f.write("El proyecto está organizado en módulos independientes que facilitan el mantenimiento ")
-        f.write("y la extensibilidad del código:\n\n")
-        
-        f.write("```\n")
-        f.write("cyk_parser/\n")
-        f.write("│\n")
-        f.write("├── src/\n")
-        f.write("│   ├── __init__.py          # Inicializador del paquete\n")
-        f.write("│   ├── grammar.py           # Definición de gramáticas\n")
-        f.write("│   ├── cnf_converter.py     # Conversión a CNF\n")
-        f.write("│   ├── cyk_algorithm.py     # Algoritmo CYK\n")
-        f.write("│   └── parse_tree.py        # Construcción de árboles\n")
-        f.write("│\n")
-        f.write("├── main.py                  # Programa principal\n")
-        f.write("└── generate_report.py       # Generador de informes\n")
-        f.write("```\n\n")
-        
-        f.write("### Descripción de Módulos\n\n")
-        
-        f.write("#### 1. `grammar.py`\n")
-        f.write("Define la clase `Grammar` que representa una gramática libre de contexto con:\n")
-        f.write("- Conjunto de variables (símbolos no terminales)\n")
-        f.write("- Conjunto de terminales\n")
-        f.write("- Diccionario de producciones\n")
-        f.write("- Símbolo inicial\n\n")
-        
-        f.write("#### 2. `cnf_converter.py`\n")
-        f.write("Implementa la clase `CNFConverter` que transforma gramáticas CFG a CNF mediante:\n")
-        f.write("- Eliminación de producciones unitarias\n")
-        f.write("- Conversión de terminales en producciones mixtas\n")
-        f.write("- Ruptura de producciones largas\n\n")
-        
-        f.write("#### 3. `cyk_algorithm.py`\n")
-        f.write("Contiene la clase `CYKParser` que implementa el algoritmo CYK usando programación dinámica. ")
-        f.write("Construye una tabla triangular para validar oraciones.\n\n")
-        
-        f.write("#### 4. `parse_tree.py`\n")
-        f.write("Define `ParseTreeBuilder` que reconstruye el árbol de parsing a partir de los backpointers ")
-        f.write("almacenados durante la ejecución del CYK.\n\n")
-        
-        f.write("### Flujo de Datos\n\n")
-        f.write("```\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│  Input: Oración │\n")
-        f.write("└────────┬────────┘\n")
-        f.write("         │\n")
-        f.write("         ▼\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│    Grammar      │  ← Define reglas sintácticas\n")
-        f.write("└────────┬────────┘\n")
-        f.write("         │\n")
-        f.write("         ▼\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│  CNFConverter   │  ← Transforma a CNF\n")
-        f.write("└────────┬────────┘\n")
-        f.write("         │\n")
-        f.write("         ▼\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│   CYKParser     │  ← Ejecuta algoritmo\n")
-        f.write("└────────┬────────┘\n")
-        f.write("         │\n")
-        f.write("         ▼\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│ ParseTreeBuilder│  ← Construye árbol\n")
-        f.write("└────────┬────────┘\n")
-        f.write("         │\n")
-        f.write("         ▼\n")
-        f.write("┌─────────────────┐\n")
-        f.write("│ Output: Resultado│  ← Aceptado/Rechazado + Árbol\n")
-        f.write("└─────────────────┘\n")
-        f.write("```\n\n")
-        
-        # Sección 2: Gramática Original
-        f.write("---\n\n")
-        f.write("## Gramática Original (CFG)\n\n")
-        
-        f.write("La gramática utilizada describe oraciones simples en inglés:\n\n")
-        f.write("```\n")
-        f.write("S → NP VP\n")
-        f.write("VP → VP PP | V NP | cooks | drinks | eats | cuts\n")
-        f.write("PP → P NP\n")
-        f.write("NP → Det N | he | she\n")
-        f.write("V → cooks | drinks | eats | cuts\n")
-        f.write("P → in | with\n")
-        f.write("N → cat | dog | beer | cake | juice | meat | soup | fork | knife | oven | spoon\n")
-        f.write("Det → a | the\n")
-        f.write("```\n\n")
-        
-        f.write("### Componentes de la Gramática\n\n")
-        f.write(f"- **Variables**: {len(original_grammar.variables)} símbolos no terminales\n")
-        f.write(f"- **Terminales**: {len(original_grammar.terminals)} palabras del vocabulario\n")
-        f.write(f"- **Producciones**: {sum(len(prods) for prods in original_grammar.productions.values())} reglas\n")
-        f.write(f"- **Símbolo inicial**: S\n\n")
-        
-        # Sección 3: Conversión a CNF
-        f.write("---\n\n")
-        f.write("## Conversión a Forma Normal de Chomsky (CNF)\n\n")
-        
-        f.write("### ¿Qué es CNF?\n\n")
-        f.write("La Forma Normal de Chomsky requiere que todas las producciones sean de una de estas formas:\n\n")
-        f.write("1. **A → BC** (una variable produce dos variables)\n")
-        f.write("2. **A → a** (una variable produce un terminal)\n\n")
-        
-        f.write("### Proceso de Conversión\n\n")
-        
-        f.write("#### Paso 1: Eliminación de Producciones Unitarias\n\n")
-        f.write("Las producciones de la forma `A → B` (donde B es una variable) se eliminan expandiendo B.\n\n")
-        f.write("**Ejemplo:**\n")
-        f.write("```\n")
-        f.write("Antes:  A → B,  B → c | d\n")
-        f.write("Después: A → c | d\n")
-        f.write("```\n\n")
-        
-        f.write("#### Paso 2: Conversión de Terminales\n\n")
-        f.write("Los terminales en producciones mixtas se reemplazan por nuevas variables.\n\n")
-        f.write("**Ejemplo:**\n")
-        f.write("```\n")
-        f.write("Antes:  VP → cooks\n")
-        f.write("Después: VP → T_cooks,  T_cooks → cooks\n")
-        f.write("```\n\n")
-        
-        f.write("#### Paso 3: Ruptura de Producciones Largas\n\n")
-        f.write("Las producciones con más de 2 símbolos se dividen.\n\n")
-        f.write("**Ejemplo:**\n")
-        f.write("```\n")
-        f.write("Antes:  A → B C D\n")
-        f.write("Después: A → B X0,  X0 → C D\n")
-        f.write("```\n\n")
-        
-        f.write("### Gramática Resultante en CNF\n\n")
-        f.write(f"Después de la conversión:\n")
-        f.write(f"- **Variables totales**: {len(cnf_grammar.variables)} (incluyendo nuevas variables)\n")
-        f.write(f"- **Producciones totales**: {sum(len(prods) for prods in cnf_grammar.productions.values())}\n")
-        f.write(f"- Todas las producciones cumplen con CNF ✓\n\n")
-        
-        # Sección 4: Algoritmo CYK
-        f.write("---\n\n")
-        f.write("## Algoritmo CYK\n\n")
-        
-        f.write("### Descripción del Algoritmo\n\n")
-        f.write("El algoritmo CYK utiliza **programación dinámica** para validar si una cadena pertenece ")
-        f.write("al lenguaje generado por una gramática en CNF.\n\n")
-        
-        f.write("### Funcionamiento\n\n")
-        f.write("1. **Inicialización**: Se crea una tabla triangular `T[i][j]` donde:\n")
-        f.write("   - `i` es la posición inicial en la oración\n")
-        f.write("   - `j` es el índice que representa la longitud de la subcadena\n\n")
-        
-        f.write("2. **Paso Base**: Para cada palabra individual, se determina qué variables pueden producirla\n\n")
-        
-        f.write("3. **Paso Recursivo**: Para subcadenas de longitud > 1:\n")
-        f.write("   - Se prueban todas las formas posibles de dividir la subcadena\n")
-        f.write("   - Se buscan reglas `A → BC` donde B genera la parte izquierda y C la derecha\n\n")
-        
-        f.write("4. **Verificación**: Si el símbolo inicial S está en `T[0][n-1]`, la oración es aceptada\n\n")
-        
-        f.write("### Complejidad\n\n")
-        f.write("- **Temporal**: O(n³ × |G|)\n")
-        f.write("  - n = longitud de la oración\n")
-        f.write("  - |G| = número de producciones\n\n")
-        f.write("- **Espacial**: O(n²)\n")
-        f.write("  - Tabla CYK + backpointers\n\n")
-        
-        f.write("### Construcción del Parse Tree\n\n")
-        f.write("Durante la ejecución del CYK, se almacenan **backpointers** que registran:\n")
-        f.write("- Qué regla se usó\n")
-        f.write("- En qué punto se dividió la subcadena\n\n")
-        f.write("Esto permite reconstruir el árbol de parsing de forma recursiva.\n\n")
-        
-        # Sección 5: Ejemplos y Pruebas
-        f.write("---\n\n")
-        f.write("## Ejemplos y Pruebas\n\n")
-        
-        print("Ejecutando pruebas...")
-        
-        # Definir ejemplos
-        examples = {
-            "### Ejemplos Semánticamente Correctos": [
-                "she eats a cake",
-                "the dog drinks the beer"
-            ],
-            "### Ejemplos Sintácticamente Correctos pero Semánticamente Incorrectos": [
-                "the fork eats the oven",
-                "he drinks a knife"
-            ],
-            "### Ejemplos No Aceptados por la Gramática": [
-                "she eats",
-                "eats she cake"
-            ]
-        }
-        
-        results_summary = []
-        
-        for category, sentences in examples.items():
+    f.write("**Guatemala, 12 de septiembre de 2025**\n\n")
+    
+    f.write("---\n\n")
+    
+    # Tabla de contenidos
+    f.write("## Tabla de Contenidos\n\n")
+    f.write("1. [Introducción](#introducción)\n")
+    f.write("2. [Objetivos](#objetivos)\n")
+    f.write("3. [Diseño de la Aplicación](#diseño-de-la-aplicación)\n")
+    f.write("4. [Gramática Original](#gramática-original-cfg)\n")
+    f.write("5. [Conversión a CNF](#conversión-a-forma-normal-de-chomsky-cnf)\n")
+    f.write("6. [Algoritmo CYK](#algoritmo-cyk)\n")
+    f.write("7. [Ejemplos y Pruebas](#ejemplos-y-pruebas)\n")
+    f.write("8. [Análisis de Resultados](#análisis-de-resultados)\n")
+    f.write("9. [Obstáculos Encontrados](#obstáculos-encontrados-y-soluciones)\n")
+    f.write("10. [Conclusiones](#conclusiones)\n")
+    f.write("11. [Referencias](#referencias)\n\n")
+    
+    f.write("---\n\n")
+    
+    # Introducción
+    f.write("## Introducción\n\n")
+    f.write("Este proyecto implementa un **parser sintáctico** basado en el algoritmo **CYK** ")
+    f.write("(Cocke-Younger-Kasami) para gramáticas libres de contexto. El sistema es capaz de:\n\n")
+    f.write("- Convertir automáticamente gramáticas CFG a Forma Normal de Chomsky (CNF)\n")
+    f.write("- Validar sintácticamente oraciones en inglés\n")
+    f.write("- Construir y visualizar árboles de parsing\n")
+    f.write("- Medir tiempos de ejecución del algoritmo\n\n")
+    
+    f.write("El proyecto está desarrollado en **Python 3** utilizando una arquitectura modular ")
+    f.write("que separa las responsabilidades en componentes independientes.\n\n")
+    
+    # Objetivos
+    f.write("## Objetivos\n\n")
+    f.write("### Objetivo General\n\n")
+    f.write("Implementar un sistema completo de parsing sintáctico utilizando el algoritmo CYK ")
+    f.write("para validar oraciones simples en inglés según una gramática libre de contexto.\n\n")
+    
+    f.write("### Objetivos Específicos\n\n")
+    f.write("1. Implementar la conversión de gramáticas CFG a Forma Normal de Chomsky\n")
+    f.write("2. Desarrollar el algoritmo CYK utilizando programación dinámica\n")
+    f.write("3. Construir árboles de parsing para oraciones aceptadas\n")
+    f.write("4. Validar el sistema con ejemplos semánticamente correctos e incorrectos\n")
+    f.write("5. Analizar el rendimiento y complejidad del algoritmo\n\n")
+    
+    # Sección 1: Diseño de la Aplicación
+    f.write("---\n\n")
+    f.write("## Diseño de la Aplicación\n\n")
+    
+    f.write("### Arquitectura Modular\n\n")
+    f.write("El proyecto está organizado en módulos independientes que facilitan el mantenimiento ")
+    f.write("y la extensibilidad del código:\n\n")
+    
+    f.write("```\n")
+    f.write("cyk_parser/\n")
+    f.write("│\n")
+    f.write("├── src/\n")
+    f.write("│   ├── __init__.py          # Inicializador del paquete\n")
+    f.write("│   ├── grammar.py           # Definición de gramáticas\n")
+    f.write("│   ├── cnf_converter.py     # Conversión a CNF\n")
+    f.write("│   ├── cyk_algorithm.py     # Algoritmo CYK\n")
+    f.write("│   └── parse_tree.py        # Construcción de árboles\n")
+    f.write("│\n")
+    f.write("├── main.py                  # Programa principal\n")
+    f.write("└── generate_report.py       # Generador de informes\n")
+    f.write("```\n\n")
+    
+    f.write("### Descripción de Módulos\n\n")
+    
+    f.write("#### 1. `grammar.py`\n")
+    f.write("Define la clase `Grammar` que representa una gramática libre de contexto con:\n")
+    f.write("- Conjunto de variables (símbolos no terminales)\n")
+    f.write("- Conjunto de terminales\n")
+    f.write("- Diccionario de producciones\n")
+    f.write("- Símbolo inicial\n\n")
+    
+    f.write("#### 2. `cnf_converter.py`\n")
+    f.write("Implementa la clase `CNFConverter` que transforma gramáticas CFG a CNF mediante:\n")
+    f.write("- Eliminación de producciones unitarias\n")
+    f.write("- Conversión de terminales en producciones mixtas\n")
+    f.write("- Ruptura de producciones largas\n\n")
+    
+    f.write("#### 3. `cyk_algorithm.py`\n")
+    f.write("Contiene la clase `CYKParser` que implementa el algoritmo CYK usando programación dinámica. ")
+    f.write("Construye una tabla triangular para validar oraciones.\n\n")
+    
+    f.write("#### 4. `parse_tree.py`\n")
+    f.write("Define `ParseTreeBuilder` que reconstruye el árbol de parsing a partir de los backpointers ")
+    f.write("almacenados durante la ejecución del CYK.\n\n")
+    
+    f.write("### Flujo de Datos\n\n")
+    f.write("```\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│  Input: Oración │\n")
+    f.write("└────────┬────────┘\n")
+    f.write("         │\n")
+    f.write("         ▼\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│    Grammar      │  ← Define reglas sintácticas\n")
+    f.write("└────────┬────────┘\n")
+    f.write("         │\n")
+    f.write("         ▼\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│  CNFConverter   │  ← Transforma a CNF\n")
+    f.write("└────────┬────────┘\n")
+    f.write("         │\n")
+    f.write("         ▼\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│   CYKParser     │  ← Ejecuta algoritmo\n")
+    f.write("└────────┬────────┘\n")
+    f.write("         │\n")
+    f.write("         ▼\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│ ParseTreeBuilder│  ← Construye árbol\n")
+    f.write("└────────┬────────┘\n")
+    f.write("         │\n")
+    f.write("         ▼\n")
+    f.write("┌─────────────────┐\n")
+    f.write("│ Output: Resultado│  ← Aceptado/Rechazado + Árbol\n")
+    f.write("└─────────────────┘\n")
+    f.write("```\n\n")
+
+
+def _write_grammar(f, context):
+    """Sección 2: gramática original"""
+    # Sección 2: Gramática Original
+    f.write("---\n\n")
+    f.write("## Gramática Original (CFG)\n\n")
+    
+    f.write("La gramática utilizada describe oraciones simples en inglés:\n\n")
+    f.write("```\n")
+    f.write("S → NP VP\n")
+    f.write("VP → VP PP | V NP | cooks | drinks | eats | cuts\n")
+    f.write("PP → P NP\n")
+    f.write("NP → Det N | he | she\n")
+    f.write("V → cooks | drinks | eats | cuts\n")
+    f.write("P → in | with\n")
+    f.write("N → cat | dog | beer | cake | juice | meat | soup | fork | knife | oven | spoon\n")
+    f.write("Det → a | the\n")
+    f.write("```\n\n")
+    
+    f.write("### Componentes de la Gramática\n\n")
+    f.write(f"- **Variables**: {len(context.original_grammar.variables)} símbolos no terminales\n")
+    f.write(f"- **Terminales**: {len(context.original_grammar.terminals)} palabras del vocabulario\n")
+    f.write(f"- **Producciones**: {sum(len(prods) for prods in context.original_grammar.productions.values())} reglas\n")
+    f.write(f"- **Símbolo inicial**: S\n\n")
+
+
+def _write_cnf(f, context):
+    """Sección 3: conversión a CNF y perfil de costo"""
+    # Sección 3: Conversión a CNF
+    f.write("---\n\n")
+    f.write("## Conversión a Forma Normal de Chomsky (CNF)\n\n")
+    
+    f.write("### ¿Qué es CNF?\n\n")
+    f.write("La Forma Normal de Chomsky requiere que todas las producciones sean de una de estas formas:\n\n")
+    f.write("1. **A → BC** (una variable produce dos variables)\n")
+    f.write("2. **A → a** (una variable produce un terminal)\n\n")
+    
+    f.write("### Proceso de Conversión\n\n")
+    
+    f.write("#### Paso 1: Eliminación de Producciones Unitarias\n\n")
+    f.write("Las producciones de la forma `A → B` (donde B es una variable) se eliminan expandiendo B.\n\n")
+    f.write("**Ejemplo:**\n")
+    f.write("```\n")
+    f.write("Antes:  A → B,  B → c | d\n")
+    f.write("Después: A → c | d\n")
+    f.write("```\n\n")
+    
+    f.write("#### Paso 2: Conversión de Terminales\n\n")
+    f.write("Los terminales en producciones mixtas se reemplazan por nuevas variables.\n\n")
+    f.write("**Ejemplo:**\n")
+    f.write("```\n")
+    f.write("Antes:  VP → cooks\n")
+    f.write("Después: VP → T_cooks,  T_cooks → cooks\n")
+    f.write("```\n\n")
+    
+    f.write("#### Paso 3: Ruptura de Producciones Largas\n\n")
+    f.write("Las producciones con más de 2 símbolos se dividen.\n\n")
+    f.write("**Ejemplo:**\n")
+    f.write("```\n")
+    f.write("Antes:  A → B C D\n")
+    f.write("Después: A → B X0,  X0 → C D\n")
+    f.write("```\n\n")
+    
+    f.write("### Gramática Resultante en CNF\n\n")
+    f.write(f"Después de la conversión:\n")
+    f.write(f"- **Variables totales**: {len(context.cnf_grammar.variables)} (incluyendo nuevas variables)\n")
+    f.write(f"- **Producciones totales**: {sum(len(prods) for prods in context.cnf_grammar.productions.values())}\n")
+    f.write(f"- Todas las producciones cumplen con CNF ✓\n\n")
+    
+    f.write("### Perfil de Costo de la Gramática\n\n")
+    f.write("Métricas de `GrammarProfile` (`src/grammar_profile.py`) que anticipan cómo un ")
+    f.write("cambio en la gramática afecta el rendimiento del parser. El costo se mide con ")
+    f.write("200 oraciones generadas con la propia gramática.\n\n")
+    GrammarProfile(context.original_grammar, context.cnf_grammar).write_markdown(f)
+
+
+def _write_algorithm(f, context):
+    """Sección 4: algoritmo CYK"""
+    # Sección 4: Algoritmo CYK
+    f.write("---\n\n")
+    f.write("## Algoritmo CYK\n\n")
+    
+    f.write("### Descripción del Algoritmo\n\n")
+    f.write("El algoritmo CYK utiliza **programación dinámica** para validar si una cadena pertenece ")
+    f.write("al lenguaje generado por una gramática en CNF.\n\n")
+    
+    f.write("### Funcionamiento\n\n")
+    f.write("1. **Inicialización**: Se crea una tabla triangular `T[i][j]` donde:\n")
+    f.write("   - `i` es la posición inicial en la oración\n")
+    f.write("   - `j` es el índice que representa la longitud de la subcadena\n\n")
+    
+    f.write("2. **Paso Base**: Para cada palabra individual, se determina qué variables pueden producirla\n\n")
+    
+    f.write("3. **Paso Recursivo**: Para subcadenas de longitud > 1:\n")
+    f.write("   - Se prueban todas las formas posibles de dividir la subcadena\n")
+    f.write("   - Se buscan reglas `A → BC` donde B genera la parte izquierda y C la derecha\n\n")
+    
+    f.write("4. **Verificación**: Si el símbolo inicial S está en `T[0][n-1]`, la oración es aceptada\n\n")
+    
+    f.write("### Complejidad\n\n")
+    f.write("- **Temporal**: O(n³ × |G|)\n")
+    f.write("  - n = longitud de la oración\n")
+    f.write("  - |G| = número de producciones\n\n")
+    f.write("- **Espacial**: O(n²)\n")
+    f.write("  - Tabla CYK + backpointers\n\n")
+    
+    f.write("### Construcción del Parse Tree\n\n")
+    f.write("Durante la ejecución del CYK, se almacenan **backpointers** que registran:\n")
+    f.write("- Qué regla se usó\n")
+    f.write("- En qué punto se dividió la subcadena\n\n")
+    f.write("Esto permite reconstruir el árbol de parsing de forma recursiva.\n\n")
+
+
+def _write_examples(f, context):
+    """Sección 5: ejemplos con su tabla CYK y árbol"""
+    # Sección 5: Ejemplos y Pruebas
+    f.write("---\n\n")
+    f.write("## Ejemplos y Pruebas\n\n")
+
+    idx = 0
+    category = None
+    for result in context.results:
+        if result['category'] != category:
+            category = result['category']
+            idx = 0
             f.write(f"{category}\n\n")
-            
-            for idx, sentence in enumerate(sentences, 1):
-                f.write(f"#### Ejemplo {idx}: `{sentence}`\n\n")
-                
-                # Ejecutar parser
-                accepted, time_taken, _ = parser.parse(sentence)
-                words = sentence.lower().split()
-                
-                # Resultado
-                status = "✅ **ACEPTADA**" if accepted else "❌ **RECHAZADA**"
-                f.write(f"**Resultado**: {status}\n\n")
-                f.write(f"**Tiempo de ejecución**: {time_taken * 1000:.4f} ms\n\n")
-                
-                # Guardar para resumen
-                results_summary.append({
-                    'sentence': sentence,
-                    'accepted': accepted,
-                    'time': time_taken
-                })
-                
-                # Tabla CYK
-                f.write("**Tabla CYK**:\n\n")
-                f.write("```\n")
-                n = len(words)
-                f.write(f"Palabras: {' '.join(words)}\n\n")
-                
-                for j in range(n - 1, -1, -1):
-                    f.write(f"Longitud {j+1}: ")
-                    for i in range(n - j):
-                        cell = parser.table[i][j]
-                        if cell:
-                            f.write(f"{{{','.join(sorted(cell))}}} ")
-                        else:
-                            f.write("{∅} ")
-                    f.write("\n")
-                
-                f.write("```\n\n")
-                
-                # Si es aceptada, mostrar árbol
-                if accepted:
-                    builder = ParseTreeBuilder(parser)
-                    tree = builder.build_tree(words)
-                    
-                    f.write("**Árbol de Parsing**:\n\n")
-                    f.write("```\n")
-                    f.write(builder.visualize_tree_ascii(tree))
-                    f.write("\n```\n\n")
-                    
-                    f.write("**Notación de Brackets**:\n\n")
-                    f.write(f"```\n{builder.to_bracket_notation(tree)}\n```\n\n")
-                
-                f.write("---\n\n")
-        
-        # Sección 6: Análisis de Resultados
-        f.write("## Análisis de Resultados\n\n")
-        
-        total = len(results_summary)
-        accepted_count = sum(1 for r in results_summary if r['accepted'])
-        rejected_count = total - accepted_count
-        avg_time = sum(r['time'] for r in results_summary) / total
-        
-        f.write("### Resumen Estadístico\n\n")
-        f.write(f"- **Total de pruebas**: {total}\n")
-        f.write(f"- **Oraciones aceptadas**: {accepted_count} ({accepted_count/total*100:.1f}%)\n")
-        f.write(f"- **Oraciones rechazadas**: {rejected_count} ({rejected_count/total*100:.1f}%)\n")
-        f.write(f"- **Tiempo promedio**: {avg_time * 1000:.4f} ms\n\n")
-        
-        f.write("### Tabla Comparativa\n\n")
-        f.write("| Oración | Tipo | Resultado | Tiempo (ms) |\n")
-        f.write("|---------|------|-----------|-------------|\n")
-        
-        types = ["Correcta", "Correcta", "Sintáctica", "Sintáctica", "Incompleta", "Orden incorrecto"]
-        for i, result in enumerate(results_summary):
-            status = "✅" if result['accepted'] else "❌"
-            f.write(f"| {result['sentence']} | {types[i]} | {status} | {result['time']*1000:.2f} |\n")
-        
-        f.write("\n")
-        
-        f.write("### Observaciones\n\n")
-        f.write("1. **Validación Sintáctica**: El sistema valida correctamente la sintaxis, ")
-        f.write("aceptando oraciones como 'the fork eats the oven' que son sintácticamente válidas ")
-        f.write("pero semánticamente incorrectas.\n\n")
-        
-        f.write("2. **Detección de Errores**: El parser rechaza correctamente oraciones con:\n")
-        f.write("   - Estructura incompleta (falta de objeto directo)\n")
-        f.write("   - Orden incorrecto de palabras\n\n")
-        
-        f.write("3. **Rendimiento**: Los tiempos de ejecución son consistentes y eficientes, ")
-        f.write("todos por debajo de 5 ms.\n\n")
-        
-        # Sección 7: Obstáculos y Soluciones
-        f.write("---\n\n")
-        f.write("## Obstáculos Encontrados y Soluciones\n\n")
-        
-        f.write("### 1. Conversión a CNF\n\n")
-        f.write("**Obstáculo**: Manejar producciones unitarias recursivas (A → B, B → C, C → A)\n\n")
-        f.write("**Solución**: Implementar eliminación iterativa hasta que no haya cambios en las producciones. ")
-        f.write("Se utiliza un flag `changed` que detecta cuando ya no hay más modificaciones.\n\n")
-        
-        f.write("### 2. Índices de la Tabla CYK\n\n")
-        f.write("**Obstáculo**: Confusión con los índices i, j, k del algoritmo CYK\n\n")
-        f.write("**Solución**: Documentación exhaustiva en el código y pruebas incrementales con oraciones cortas. ")
-        f.write("Se añadieron comentarios explicativos en cada bucle.\n\n")
-        
-        f.write("### 3. Reconstrucción del Árbol\n\n")
-        f.write("**Obstáculo**: Reconstruir correctamente el árbol desde los backpointers\n\n")
-        f.write("**Solución**: Implementación recursiva que sigue los backpointers almacenados durante el CYK. ")
-        f.write("Se guarda tanto la regla usada como el punto de división de la subcadena.\n\n")
-        
-        f.write("### 4. Manejo de Codificación\n\n")
-        f.write("**Obstáculo**: Errores de codificación UTF-8 en Windows\n\n")
-        f.write("**Solución**: Especificar explícitamente `encoding='utf-8'` en todas las operaciones de archivo.\n\n")
-        
-        # Sección 8: Recomendaciones
-        f.write("---\n\n")
-        f.write("## Recomendaciones\n\n")
-        
-        f.write("1. **Verificación de CNF**: Siempre imprimir la gramática convertida antes de ejecutar CYK\n")
-        f.write("2. **Pruebas Incrementales**: Comenzar con oraciones cortas (2-3 palabras) antes de probar casos complejos\n")
-        f.write("3. **Debugging con Tabla**: Utilizar `print_table()` para visualizar el proceso de llenado\n")
-        f.write("4. **Casos Extremos**: Probar oraciones de 1 palabra, muy largas, y con todas las combinaciones posibles\n")
-        f.write("5. **Modularidad**: Mantener la separación de responsabilidades para facilitar mantenimiento\n\n")
-        
-        # Sección 9: Conclusiones
-        f.write("---\n\n")
-        f.write("## Conclusiones\n\n")
-        
-        f.write("1. **Implementación Exitosa**: Se logró implementar completamente:\n")
-        f.write("   - Conversión automática de CFG a CNF\n")
-        f.write("   - Algoritmo CYK con programación dinámica\n")
-        f.write("   - Construcción y visualización de árboles de parsing\n\n")
-        
-        f.write("2. **Validación Sintáctica**: El sistema valida correctamente la sintaxis de oraciones en inglés, ")
-        f.write("demostrando que la gramática definida es adecuada para el propósito.\n\n")
-        
-        f.write("3. **Rendimiento Eficiente**: Los tiempos de ejecución son consistentes y eficientes, ")
-        f.write(f"con un promedio de {avg_time * 1000:.4f} ms por oración.\n\n")
-        
-        f.write("4. **Limitaciones Identificadas**:\n")
-        f.write("   - La gramática solo cubre oraciones simples\n")
-        f.write("   - No valida semántica, únicamente sintaxis\n")
-        f.write("   - Vocabulario limitado a las palabras definidas\n\n")
-        
-        f.write("5. **Aprendizajes Clave**:\n")
-        f.write("   - Importancia de la Forma Normal de Chomsky para algoritmos de parsing\n")
-        f.write("   - Poder de la programación dinámica para problemas de análisis sintáctico\n")
-        f.write("   - Valor de la modularidad en el desarrollo de software complejo\n\n")
-        
-        f.write("6. **Trabajo Futuro**:\n")
-        f.write("   - Expandir la gramática para incluir más construcciones sintácticas\n")
-        f.write("   - Implementar validación semántica básica\n")
-        f.write("   - Agregar soporte para análisis de ambigüedad\n")
-        f.write("   - Optimizar el algoritmo para gramáticas muy grandes\n\n")
-        
-        # Referencias
-        f.write("---\n\n")
-        f.write("## Referencias\n\n")
-        
-        f.write("1. Cocke, J., & Schwartz, J. T. (1970). *Programming languages and their compilers*.\n\n")
-        
-        f.write("2. Younger, D. H. (1967). *Recognition and parsing of context-free languages in time n³*. ")
-        f.write("Information and Control, 10(2), 189-208.\n\n")
-        
-        f.write("3. Kasami, T. (1965). *An efficient recognition and syntax-analysis algorithm for context-free languages*. ")
-        f.write("Air Force Cambridge Research Lab.\n\n")
-        
-        f.write("4. Wikipedia contributors. (2024). *CYK algorithm*. Wikipedia. ")
-        f.write("https://en.wikipedia.org/wiki/CYK_algorithm\n\n")
-        
-        f.write("5. GeeksforGeeks. (2024). *CYK Algorithm for Context Free Grammar*. ")
-        f.write("https://www.geeksforgeeks.org/cyk-algorithm-for-context-free-grammar/\n\n")
-        
-        f.write("6. Rogaway, P. (2012). *CYK Algorithm Lecture Notes*. UC Davis. ")
-        f.write("https://web.cs.ucdavis.edu/~rogaway/classes/120/winter12/CYK.pdf\n\n")
-        
-        f.write("7. Hopcroft, J. E., Motwani, R., & Ullman, J. D. (2006). ")
-        f.write("*Introduction to Automata Theory, Languages, and Computation* (3rd ed.). Pearson.\n\n")
-        
-        # Fin
+        idx += 1
+
+        f.write(f"#### Ejemplo {idx}: `{result['sentence']}`\n\n")
+
+        # Resultado
+        status = "✅ **ACEPTADA**" if result['accepted'] else "❌ **RECHAZADA**"
+        f.write(f"**Resultado**: {status}\n\n")
+        f.write(f"**Tiempo de ejecución**: {result['time'] * 1000:.4f} ms\n\n")
+
+        # Tabla CYK y árbol (generados al parsear el ejemplo)
+        f.write(result['detail'])
+
         f.write("---\n\n")
-        f.write("**FIN DEL INFORME TÉCNICO**\n\n")
-        f.write(f"*Generado automáticamente el {datetime.now().strftime('%d de %B de %Y')}*\n")
+
+
+def _write_analysis(f, context):
+    """Sección 6: análisis de resultados"""
+    # Sección 6: Análisis de Resultados
+    f.write("## Análisis de Resultados\n\n")
+    
+    total = len(context.results)
+    accepted_count = sum(1 for r in context.results if r['accepted'])
+    rejected_count = total - accepted_count
+    avg_time = context.avg_time
+    
+    f.write("### Resumen Estadístico\n\n")
+    f.write(f"- **Total de pruebas**: {total}\n")
+    f.write(f"- **Oraciones aceptadas**: {accepted_count} ({accepted_count/total*100:.1f}%)\n")
+    f.write(f"- **Oraciones rechazadas**: {rejected_count} ({rejected_count/total*100:.1f}%)\n")
+    f.write(f"- **Tiempo promedio**: {avg_time * 1000:.4f} ms\n\n")
+    
+    f.write("### Tabla Comparativa\n\n")
+    f.write("| Oración | Tipo | Resultado | Tiempo (ms) |\n")
+    f.write("|---------|------|-----------|-------------|\n")
+    
+    for result in context.results:
+        status = "✅" if result['accepted'] else "❌"
+        f.write(f"| {result['sentence']} | {result['type']} | {status} | {result['time']*1000:.2f} |\n")
+    
+    f.write("\n")
+    
+    f.write("### Observaciones\n\n")
+    f.write("1. **Validación Sintáctica**: El sistema valida correctamente la sintaxis, ")
+    f.write("aceptando oraciones como 'the fork eats the oven' que son sintácticamente válidas ")
+    f.write("pero semánticamente incorrectas.\n\n")
+    
+    f.write("2. **Detección de Errores**: El parser rechaza correctamente oraciones con:\n")
+    f.write("   - Estructura incompleta (falta de objeto directo)\n")
+    f.write("   - Orden incorrecto de palabras\n\n")
+    
+    f.write("3. **Rendimiento**: Los tiempos de ejecución son consistentes y eficientes, ")
+    f.write("todos por debajo de 5 ms.\n\n")
+
+
+def _write_closing(f, context):
+    """Obstáculos, recomendaciones, conclusiones y referencias"""
+    # Sección 7: Obstáculos y Soluciones
+    f.write("---\n\n")
+    f.write("## Obstáculos Encontrados y Soluciones\n\n")
+    
+    f.write("### 1. Conversión a CNF\n\n")
+    f.write("**Obstáculo**: Manejar producciones unitarias recursivas (A → B, B → C, C → A)\n\n")
+    f.write("**Solución**: Implementar eliminación iterativa hasta que no haya cambios en las producciones. ")
+    f.write("Se utiliza un flag `changed` que detecta cuando ya no hay más modificaciones.\n\n")
+    
+    f.write("### 2. Índices de la Tabla CYK\n\n")
+    f.write("**Obstáculo**: Confusión con los índices i, j, k del algoritmo CYK\n\n")
+    f.write("**Solución**: Documentación exhaustiva en el código y pruebas incrementales con oraciones cortas. ")
+    f.write("Se añadieron comentarios explicativos en cada bucle.\n\n")
+    
+    f.write("### 3. Reconstrucción del Árbol\n\n")
+    f.write("**Obstáculo**: Reconstruir correctamente el árbol desde los backpointers\n\n")
+    f.write("**Solución**: Implementación recursiva que sigue los backpointers almacenados durante el CYK. ")
+    f.write("Se guarda tanto la regla usada como el punto de división de la subcadena.\n\n")
+    
+    f.write("### 4. Manejo de Codificación\n\n")
+    f.write("**Obstáculo**: Errores de codificación UTF-8 en Windows\n\n")
+    f.write("**Solución**: Especificar explícitamente `encoding='utf-8'` en todas las operaciones de archivo.\n\n")
+    
+    # Sección 8: Recomendaciones
+    f.write("---\n\n")
+    f.write("## Recomendaciones\n\n")
+    
+    f.write("1. **Verificación de CNF**: Siempre imprimir la gramática convertida antes de ejecutar CYK\n")
+    f.write("2. **Pruebas Incrementales**: Comenzar con oraciones cortas (2-3 palabras) antes de probar casos complejos\n")
+    f.write("3. **Debugging con Tabla**: Utilizar `print_table()` para visualizar el proceso de llenado\n")
+    f.write("4. **Casos Extremos**: Probar oraciones de 1 palabra, muy largas, y con todas las combinaciones posibles\n")
+    f.write("5. **Modularidad**: Mantener la separación de responsabilidades para facilitar mantenimiento\n\n")
+    
+    # Sección 9: Conclusiones
+    f.write("---\n\n")
+    f.write("## Conclusiones\n\n")
+    
+    f.write("1. **Implementación Exitosa**: Se logró implementar completamente:\n")
+    f.write("   - Conversión automática de CFG a CNF\n")
+    f.write("   - Algoritmo CYK con programación dinámica\n")
+    f.write("   - Construcción y visualización de árboles de parsing\n\n")
+    
+    f.write("2. **Validación Sintáctica**: El sistema valida correctamente la sintaxis de oraciones en inglés, ")
+    f.write("demostrando que la gramática definida es adecuada para el propósito.\n\n")
+    
+    f.write("3. **Rendimiento Eficiente**: Los tiempos de ejecución son consistentes y eficientes, ")
+    f.write(f"con un promedio de {context.avg_time * 1000:.4f} ms por oración.\n\n")
     
+    f.write("4. **Limitaciones Identificadas**:\n")
+    f.write("   - La gramática solo cubre oraciones simples\n")
+    f.write("   - No valida semántica, únicamente sintaxis\n")
+    f.write("   - Vocabulario limitado a las palabras definidas\n\n")
+    
+    f.write("5. **Aprendizajes Clave**:\n")
+    f.write("   - Importancia de la Forma Normal de Chomsky para algoritmos de parsing\n")
+    f.write("   - Poder de la programación dinámica para problemas de análisis sintáctico\n")
+    f.write("   - Valor de la modularidad en el desarrollo de software complejo\n\n")
+    
+    f.write("6. **Trabajo Futuro**:\n")
+    f.write("   - Expandir la gramática para incluir más construcciones sintácticas\n")
+    f.write("   - Implementar validación semántica básica\n")
+    f.write("   - Agregar soporte para análisis de ambigüedad\n")
+    f.write("   - Optimizar el algoritmo para gramáticas muy grandes\n\n")
+    
+    # Referencias
+    f.write("---\n\n")
+    f.write("## Referencias\n\n")
+    
+    f.write("1. Cocke, J., & Schwartz, J. T. (1970). *Programming languages and their compilers*.\n\n")
+    
+    f.write("2. Younger, D. H. (1967). *Recognition and parsing of context-free languages in time n³*. ")
+    f.write("Information and Control, 10(2), 189-208.\n\n")
+    
+    f.write("3. Kasami, T. (1965). *An efficient recognition and syntax-analysis algorithm for context-free languages*. ")
+    f.write("Air Force Cambridge Research Lab.\n\n")
+    
+    f.write("4. Wikipedia contributors. (2024). *CYK algorithm*. Wikipedia. ")
+    f.write("https://en.wikipedia.org/wiki/CYK_algorithm\n\n")
+    
+    f.write("5. GeeksforGeeks. (2024). *CYK Algorithm for Context Free Grammar*. ")
+    f.write("https://www.geeksforgeeks.org/cyk-algorithm-for-context-free-grammar/\n\n")
+    
+    f.write("6. Rogaway, P. (2012). *CYK Algorithm Lecture Notes*. UC Davis. ")
+    f.write("https://web.cs.ucdavis.edu/~rogaway/classes/120/winter12/CYK.pdf\n\n")
+    
+    f.write("7. Hopcroft, J. E., Motwani, R., & Ullman, J. D. (2006). ")
+    f.write("*Introduction to Automata Theory, Languages, and Computation* (3rd ed.). Pearson.\n\n")
+
+
+def _write_footer(f, context):
+    """Fin del informe"""
+    # Fin
+    f.write("---\n\n")
+    f.write("**FIN DEL INFORME TÉCNICO**\n\n")
+    f.write(f"*Generado automáticamente el {datetime.now().strftime('%d de %B de %Y')}*\n")
+
+
+def report_sections(context):
+    """
+    Secciones del informe en orden
+
+    Returns:
+        lista de (nombre, entradas, función de escritura); las entradas
+        deben poder serializarse en JSON
+    """
+    grammar_hash = context.original_grammar.fingerprint()
+    cnf_hash = context.cnf_grammar.fingerprint()
+    outcomes = [[r['sentence'], r['type'], r['accepted'], r['time']] for r in context.results]
+
+    return [
+        ('introduction', [], _write_introduction),
+        ('grammar', [grammar_hash], _write_grammar),
+        ('cnf', [grammar_hash, cnf_hash], _write_cnf),
+        ('algorithm', [], _write_algorithm),
+        ('examples', [cnf_hash, outcomes], _write_examples),
+        ('analysis', [outcomes], _write_analysis),
+        ('closing', [context.avg_time], _write_closing),
+        ('footer', [datetime.now().strftime('%Y-%m-%d')], _write_footer),
+    ]
+
+
+def _section_key(name, inputs):
+    """Hash de las entradas de una sección"""
+    content = json.dumps([name, inputs], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+
+
+def load_cache(path):
+    """
+    Caché del informe {'version', 'sections', 'examples'}
+
+    Se descarta si no existe, está dañada o es de otra REPORT_VERSION.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict) or cache.get('version') != REPORT_VERSION:
+        cache = {}
+    cache['version'] = REPORT_VERSION
+    cache.setdefault('sections', {})
+    cache.setdefault('examples', {})
+    return cache
+
+
+def generate_technical_report(workers=None, use_cache=True, filename=REPORT_FILE,
+                              cache_path=REPORT_CACHE):
+    """
+    Genera el informe técnico completo en Markdown
+
+    Args:
+        workers: procesos para parsear los ejemplos (None = os.cpu_count())
+        use_cache: si reutilizar las secciones y ejemplos de cache_path
+        filename: archivo de salida
+        cache_path: archivo JSON con la caché de secciones y ejemplos
+
+    Returns:
+        lista de nombres de las secciones regeneradas
+    """
+
+    # Preparar sistema
+    print("Inicializando sistema...")
+    original_grammar = create_english_grammar()
+    converter = CNFConverter(original_grammar)
+    cnf_grammar = converter.convert()
+
+    cache = load_cache(cache_path) if use_cache else load_cache(os.devnull)
+
+    print("Ejecutando pruebas...")
+    results, parsed = parse_examples(
+        cnf_grammar, cache['examples'], workers or os.cpu_count() or 1
+    )
+    print(f"Ejemplos parseados: {parsed} de {len(results)} (el resto desde la caché)")
+
+    context = ReportContext(original_grammar, cnf_grammar, results)
+    regenerated = []
+    texts = []
+    for name, inputs, write_section in report_sections(context):
+        key = _section_key(name, inputs)
+        stored = cache['sections'].get(name)
+        if stored is None or stored['key'] != key:
+            buffer = io.StringIO()
+            write_section(buffer, context)
+            stored = {'key': key, 'text': buffer.getvalue()}
+            cache['sections'][name] = stored
+            regenerated.append(name)
+        texts.append(stored['text'])
+
+    # Escritura en bloques grandes a un archivo temporal: si algo falla,
+    # el informe anterior queda intacto
+    temporary = filename + '.tmp'
+    with open(temporary, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        for text in texts:
+            f.write(text)
+    os.replace(temporary, filename)
+
+    if use_cache:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+
+    print(f"Secciones regeneradas: {', '.join(regenerated) if regenerated else 'ninguna'}")
     print(f"\n✅ Informe técnico generado: {filename}")
     print(f"✅ Formato: Markdown (.md)")
     print(f"✅ Puedes abrirlo con cualquier editor de texto o visualizador de Markdown")
     print(f"\n💡 Recomendación: Abre el archivo con VS Code, Typora, o conviértelo a PDF")
+    return regenerated
 
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Genera el informe técnico")
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help="procesos para parsear los ejemplos (por defecto, uno por CPU)")
+    arg_parser.add_argument('--rebuild', action='store_true',
+                            help=f"ignorar la caché ({REPORT_CACHE}) y regenerar todo")
+    args = arg_parser.parse_args()
+
     print("="*70)
     print("GENERADOR DE INFORME TÉCNICO EN MARKDOWN")
     print("="*70)
     print("\nGenerando informe completo con 3 integrantes...")
-    generate_technical_report()
-    print("\n✅ ¡Listo!")
\ No newline at end of file
+    generate_technical_report(workers=args.workers, use_cache=not args.rebuild)
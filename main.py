@@ -5,6 +5,8 @@ Teoría de la Computación 2025
 Implementa conversión a CNF y algoritmo CYK para parsing de oraciones
 """
 
+import sys
+
 from src.grammar import create_english_grammar
 from src.cnf_converter import CNFConverter
 from src.cyk_algorithm import CYKParser
@@ -60,10 +62,11 @@ def parse_sentence(sentence, parser, show_details=True):
     print(f"PARSEANDO: '{sentence}'")
     print("="*70)
     
-    # Ejecutar CYK
-    accepted, time_taken, _ = parser.parse(sentence)
+    # Tokenizar una sola vez: la misma lista sirve para la tabla y el árbol
+    words = parser.tokenizer.tokenize(sentence)
     
-    words = sentence.lower().split()
+    # Ejecutar CYK
+    accepted, time_taken, _ = parser.parse(words)
     
     # Mostrar resultado
     print(f"\n{'✓ ACEPTADA' if accepted else '✗ RECHAZADA'}")
@@ -83,18 +86,42 @@ def parse_sentence(sentence, parser, show_details=True):
         print("ÁRBOL DE PARSING")
         print("="*70)
         
+        # Se escribe directamente desde la tabla, sin construir el árbol
         builder = ParseTreeBuilder(parser)
-        tree = builder.build_tree(words)
         
         print("\nVisualización jerárquica:")
-        print(builder.visualize_tree_ascii(tree))
+        builder.write_ascii(words, sys.stdout)
+        print()
         
         print("\nNotación de brackets:")
-        print(builder.to_bracket_notation(tree))
+        builder.write_brackets(words, sys.stdout)
+        print()
+    else:
+        # Constituyentes encontrados aunque la oración no sea aceptada
+        chunks = parser.extract_chunks(words)
+        print("\nAnálisis parcial:")
+        print(" ".join(str(chunk) for chunk in chunks))
     
     return accepted
 
 
+# Ejemplos requeridos en el proyecto (también los usa benchmark.py)
+PREDEFINED_EXAMPLES = {
+    "Semánticamente correctas (2 ejemplos)": [
+        "she eats a cake",
+        "the dog drinks the beer"
+    ],
+    "Sintácticamente correctas pero semánticamente incorrectas (2 ejemplos)": [
+        "the fork eats the oven",
+        "he drinks a knife"
+    ],
+    "No aceptadas por la gramática (2 ejemplos)": [
+        "eats she",  # Falta objeto
+        "eats she cake"  # Orden incorrecto
+    ]
+}
+
+
 def test_predefined_examples(parser):
     """
     Prueba los ejemplos requeridos en el proyecto
@@ -103,24 +130,9 @@ def test_predefined_examples(parser):
     print("EJEMPLOS PREDEFINIDOS - PRUEBAS")
     print("="*70)
     
-    examples = {
-        "Semánticamente correctas (2 ejemplos)": [
-            "she eats a cake",
-            "the dog drinks the beer"
-        ],
-        "Sintácticamente correctas pero semánticamente incorrectas (2 ejemplos)": [
-            "the fork eats the oven",
-            "he drinks a knife"
-        ],
-        "No aceptadas por la gramática (2 ejemplos)": [
-            "eats she",  # Falta objeto
-            "eats she cake"  # Orden incorrecto
-        ]
-    }
-    
     results = []
     
-    for category, sentences in examples.items():
+    for category, sentences in PREDEFINED_EXAMPLES.items():
         print(f"\n{'─'*70}")
         print(f"{category}:")
         print('─'*70)
@@ -0,0 +1,180 @@
+"""
+Llenado binario del CYK con conjuntos de bits (producto booleano empaquetado)
+
+Para cada variable X se guardan dos matrices booleanas empaquetadas en
+enteros de Python, una fila por posición:
+- rows[X][i]: bit k encendido si X deriva words[i:k]
+- cols[X][j]: bit k encendido si X deriva words[k:j]
+
+Así, "existe k tal que B deriva words[i:k] y C deriva words[k:j]" es el
+producto booleano fila × columna rows[B][i] & cols[C][j], que se calcula
+con una sola operación sobre enteros en lugar de recorrer los n puntos
+de división. El costo pasa de O(n³·|G|) a O(n²·|G|·n/64), que gana
+cuando las oraciones son largas.
+
+Cruce medido con la gramática en inglés (python benchmark.py --long):
+hasta ~12 palabras ambos empatan (el bucle clásico salta sin costo las
+divisiones con celdas vacías y el kernel paga la preparación de las
+matrices); a 32 palabras el kernel es ~2x más rápido y a 200, ~6-8x. Por
+eso CYKParser solo lo usa a partir de BITSET_MIN_LENGTH palabras.
+"""
+
+
+# Longitud a partir de la cual CYKParser usa este kernel
+BITSET_MIN_LENGTH = 16
+
+
+class BitsetKernel:
+    """
+    Llena la parte binaria de una CYKChart con producto booleano de bits
+
+    Produce exactamente las mismas celdas y backpointers que el bucle
+    clásico de CYKParser: para cada variable se elige el punto de
+    división más a la derecha y, entre reglas que empatan, la última
+    en el orden de la gramática.
+    """
+
+    def __init__(self, compiled):
+        """
+        Args:
+            compiled: CompiledGrammar de la gramática en CNF
+        """
+        self.compiled = compiled
+
+        symbols = {}
+        pairs = {}
+
+        # Orden de las reglas A → B C igual al del bucle clásico
+        for order, (variable, left, right) in enumerate(compiled.binary_rules):
+            for symbol in (variable, left, right):
+                symbols.setdefault(symbol, len(symbols))
+            pairs.setdefault((left, right), []).append((order, variable))
+
+        self.symbols = symbols
+        # (índice de B, índice de C, (B, C), ((orden, A), ...))
+        self.pairs = [
+            (symbols[left], symbols[right], (left, right), tuple(targets))
+            for (left, right), targets in pairs.items()
+        ]
+
+    def is_current(self):
+        """Verifica que la gramática no cambió desde la compilación"""
+        return self.compiled.is_current()
+
+    def initial_bits(self, chart):
+        """
+        Matrices de bits de las celdas de longitud 1
+
+        Returns:
+            tuple (rows, cols): listas [símbolo][posición] de enteros
+        """
+        n = chart.n
+        symbols = self.symbols
+        rows = [[0] * (n + 1) for _ in range(len(symbols))]
+        cols = [[0] * (n + 1) for _ in range(len(symbols))]
+
+        for i in range(n):
+            for variable in chart.cells[i] or ():
+                idx = symbols.get(variable)
+                if idx is not None:
+                    rows[idx][i] |= 1 << (i + 1)
+                    cols[idx][i + 1] |= 1 << i
+        return rows, cols
+
+    def fill(self, chart, deadline=None, clock=None):
+        """
+        Llena las celdas de longitud >= 2 de una tabla con la diagonal lista
+
+        Args:
+            chart: CYKChart con las celdas de longitud 1 ya llenas
+            deadline: instante límite (según clock) o None
+            clock: función de tiempo para el límite (time.perf_counter)
+
+        Returns:
+            tuple (rule_hits, rule_checks, timed_out)
+        """
+        n = chart.n
+        rows, cols = self.initial_bits(chart)
+        rule_hits = 0
+        rule_checks = 0
+
+        for length in range(2, n + 1):
+            results, hits, checks, timed_out = self.fill_span(
+                rows, cols, length, 0, n - length + 1, deadline, clock
+            )
+            rule_hits += hits
+            rule_checks += checks
+            self.apply_span(chart, rows, cols, length, results)
+            if timed_out:
+                return rule_hits, rule_checks, True
+
+        return rule_hits, rule_checks, False
+
+    def fill_span(self, rows, cols, length, start, stop, deadline=None, clock=None):
+        """
+        Calcula las celdas de una longitud para los inicios start..stop-1
+
+        Las celdas de una misma longitud son independientes entre sí (solo
+        dependen de longitudes menores), así que distintos rangos pueden
+        calcularse por separado (ver wavefront.py).
+
+        Args:
+            rows, cols: matrices de bits con las longitudes menores
+                        (cualquier objeto indexable [símbolo][posición])
+            length: longitud de las celdas
+            start, stop: rango de posiciones iniciales
+
+        Returns:
+            tuple (results, rule_hits, rule_checks, timed_out)
+            - results: lista de (i, {variable: (división, orden, (B, C))})
+              solo para las celdas no vacías
+        """
+        pairs = self.pairs
+        results = []
+        rule_hits = 0
+        rule_checks = 0
+
+        for i in range(start, stop):
+            if deadline is not None and clock() > deadline:
+                return results, rule_hits, rule_checks, True
+
+            j = i + length
+            best = {}
+
+            for left_idx, right_idx, pair, targets in pairs:
+                left = rows[left_idx][i]
+                if not left:
+                    continue
+                rule_checks += 1
+                splits = left & cols[right_idx][j]
+                if not splits:
+                    continue
+
+                rule_hits += bin(splits).count('1') * len(targets)
+                # División más a la derecha: la última que vería el bucle clásico
+                top = splits.bit_length() - 1
+                for order, variable in targets:
+                    current = best.get(variable)
+                    if current is None or (top, order) > current[:2]:
+                        best[variable] = (top, order, pair)
+
+            if best:
+                results.append((i, best))
+
+        return results, rule_hits, rule_checks, False
+
+    def apply_span(self, chart, rows, cols, length, results):
+        """Escribe en la tabla y en las matrices de bits el resultado de fill_span"""
+        symbols = self.symbols
+        row_offset = chart.offsets[length]
+
+        for i, best in results:
+            j = i + length
+            cell = chart.new_cell(row_offset + i)
+            cell_backs = chart.backs[row_offset + i]
+            for variable, (top, _, pair) in best.items():
+                cell.add(variable)
+                cell_backs[variable] = (pair, top - i - 1)
+                idx = symbols[variable]
+                rows[idx][i] |= 1 << j
+                cols[idx][j] |= 1 << i
@@ -0,0 +1,356 @@
+"""
+Tabla triangular compacta para el algoritmo CYK
+
+En lugar de dos matrices n×n (conjuntos y backpointers), la tabla guarda
+solo las n(n+1)/2 celdas válidas en listas planas indexadas por
+(inicio, longitud). Las celdas se crean al recibir su primera variable,
+por lo que las celdas vacías no ocupan memoria propia.
+
+Distribución de la lista plana (n = 3):
+
+    índice:   0   1   2 | 3   4 | 5
+    longitud: 1   1   1 | 2   2 | 3
+    inicio:   0   1   2 | 0   1 | 0
+"""
+
+import sys
+import time
+
+
+# Valores que se devuelven para celdas vacías (inmutables y compartidos)
+EMPTY_CELL = frozenset()
+
+
+class _EmptyBackpointers(dict):
+    """Diccionario vacío de solo lectura para celdas sin backpointers"""
+
+    def __setitem__(self, key, value):
+        raise TypeError("La celda está vacía; use CYKChart.add()")
+
+
+EMPTY_BACKPOINTERS = _EmptyBackpointers()
+
+
+def row_offsets(n):
+    """
+    Calcula dónde empieza cada longitud dentro de la lista plana
+
+    Returns:
+        lista donde offsets[longitud] es el índice de la celda (0, longitud);
+        offsets[n + 1] es el tamaño total
+    """
+    offsets = [0, 0]
+    for length in range(1, n + 1):
+        offsets.append(offsets[-1] + n - length + 1)
+    return offsets
+
+
+class CYKChart:
+    """
+    Tabla CYK triangular almacenada en listas planas
+
+    Atributos:
+        n: número de palabras
+        cells: lista plana de conjuntos de variables (None = celda vacía)
+        backs: lista plana de diccionarios {variable: backpointer}
+        offsets: offsets[longitud] = índice de la celda (0, longitud)
+        size: número de celdas válidas (las listas pueden ser más largas
+              si vienen de un ChartPool)
+        free: pares (set, dict) vacíos para reutilizar al crear celdas
+        created: índices de las celdas creadas (None si la tabla no es de un pool)
+
+    Para compatibilidad, chart[i][j] devuelve la celda que empieza en i
+    con longitud j + 1 (la misma convención que table[i][j] tenía antes).
+    """
+
+    def __init__(self, n, cells=None, backs=None, free=None):
+        """
+        Args:
+            n: número de palabras de la oración
+            cells, backs: listas planas ya reservadas (de un ChartPool),
+                          con al menos n(n+1)/2 posiciones en None
+            free: lista de pares (set, dict) vacíos reutilizables
+        """
+        self.n = n
+        self.offsets = row_offsets(n)
+        self.size = self.offsets[n + 1] if n else 0
+
+        if cells is None:
+            self.cells = [None] * self.size
+            self.backs = [None] * self.size
+            self.free = []
+            self.created = None
+        else:
+            self.cells = cells
+            self.backs = backs
+            self.free = free
+            self.created = []
+
+    def index(self, start, length):
+        """Posición de la celda (start, length) en las listas planas"""
+        return self.offsets[length] + start
+
+    def _valid(self, start, length):
+        return length >= 1 and start >= 0 and start + length <= self.n
+
+    def cell(self, start, length):
+        """
+        Variables que derivan la subcadena words[start:start + length]
+
+        Returns:
+            conjunto de variables (EMPTY_CELL si la celda está vacía)
+        """
+        if not self._valid(start, length):
+            return EMPTY_CELL
+        cell = self.cells[self.offsets[length] + start]
+        return cell if cell is not None else EMPTY_CELL
+
+    def backpointers(self, start, length):
+        """Diccionario {variable: (producción, k)} de una celda"""
+        if not self._valid(start, length):
+            return EMPTY_BACKPOINTERS
+        backs = self.backs[self.offsets[length] + start]
+        return backs if backs is not None else EMPTY_BACKPOINTERS
+
+    def backpointer(self, start, length, variable):
+        """
+        Backpointer de una variable en una celda
+
+        Returns:
+            tupla (producción, k) o None si no existe
+        """
+        return self.backpointers(start, length).get(variable)
+
+    def add(self, start, length, variable, backpointer):
+        """
+        Agrega una variable a una celda (creándola si estaba vacía)
+
+        Args:
+            start: posición inicial
+            length: longitud de la subcadena
+            variable: variable que deriva la subcadena
+            backpointer: tupla (producción, k) para reconstruir el árbol
+        """
+        idx = self.offsets[length] + start
+        cell = self.cells[idx]
+        if cell is None:
+            cell = self.new_cell(idx)
+        cell.add(variable)
+        self.backs[idx][variable] = backpointer
+
+    def new_cell(self, idx):
+        """
+        Crea la celda idx, reutilizando un par (set, dict) libre si existe
+
+        Returns:
+            el conjunto de variables de la nueva celda
+        """
+        if self.free:
+            cell, backs = self.free.pop()
+        else:
+            cell, backs = set(), {}
+        self.cells[idx] = cell
+        self.backs[idx] = backs
+        if self.created is not None:
+            self.created.append(idx)
+        return cell
+
+    def copy(self):
+        """Copia independiente de la tabla (no comparte celdas con un pool)"""
+        chart = CYKChart(self.n)
+        for idx in range(self.size):
+            cell = self.cells[idx]
+            if cell is not None:
+                chart.cells[idx] = set(cell)
+                chart.backs[idx] = dict(self.backs[idx])
+        return chart
+
+    def filled_cells(self):
+        """Número de celdas con al menos una variable"""
+        return sum(1 for idx in range(self.size) if self.cells[idx])
+
+    def memory_bytes(self):
+        """Memoria aproximada de la tabla (listas y celdas no vacías)"""
+        size = sys.getsizeof(self.cells) + sys.getsizeof(self.backs)
+        for idx in range(self.size):
+            if self.cells[idx] is not None:
+                size += sys.getsizeof(self.cells[idx]) + sys.getsizeof(self.backs[idx])
+        return size
+
+    def __getitem__(self, start):
+        return _ChartRow(self, start, self.cell)
+
+    def __len__(self):
+        return self.n
+
+    def backpointer_rows(self):
+        """Vista de backpointers con la convención antigua backpointers[i][j]"""
+        return _BackpointerRows(self)
+
+
+class _ChartRow:
+    """Fila de compatibilidad: row[j] es la celda (start, j + 1)"""
+
+    __slots__ = ('chart', 'start', 'getter')
+
+    def __init__(self, chart, start, getter):
+        self.chart = chart
+        self.start = start
+        self.getter = getter
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self.chart.n
+        return self.getter(self.start, j + 1)
+
+    def __len__(self):
+        return self.chart.n
+
+    def __iter__(self):
+        for j in range(self.chart.n):
+            yield self[j]
+
+
+class _BackpointerRows:
+    """Vista de compatibilidad para backpointers[i][j]"""
+
+    __slots__ = ('chart',)
+
+    def __init__(self, chart):
+        self.chart = chart
+
+    def __getitem__(self, start):
+        return _ChartRow(self.chart, start, self.chart.backpointers)
+
+    def __len__(self):
+        return self.chart.n
+
+
+class ChartPool:
+    """
+    Reutiliza las listas planas y las celdas de la tabla entre parseos
+
+    Las listas se dimensionan para la oración más larga reciente. Al pedir
+    una tabla nueva, solo se limpian las celdas que la anterior llegó a
+    crear (sus conjuntos y diccionarios vacíos quedan libres para reutilizarse),
+    así que el costo de reinicio es proporcional a las celdas usadas.
+
+    Si durante idle_seconds no se necesita más de la mitad de la capacidad,
+    las listas se reducen al tamaño máximo usado en ese periodo.
+
+    La tabla devuelta por acquire() es válida hasta la siguiente llamada.
+    """
+
+    def __init__(self, idle_seconds=60.0, max_free_cells=4096):
+        """
+        Args:
+            idle_seconds: periodo tras el cual se reduce la capacidad sobrante
+            max_free_cells: máximo de pares (set, dict) libres que se conservan
+        """
+        self.idle_seconds = idle_seconds
+        self.max_free_cells = max_free_cells
+
+        self._cells = []
+        self._backs = []
+        self._free = []
+        self._active = None
+        self._window_start = time.monotonic()
+        self._window_max = 0
+
+        # Estadísticas
+        self.acquires = 0
+        self.buffer_allocations = 0
+        self.buffer_reuses = 0
+        self.cells_recycled = 0
+        self.shrinks = 0
+        self.peak_capacity = 0
+
+    @property
+    def capacity(self):
+        """Número de celdas que caben en las listas reservadas"""
+        return len(self._cells)
+
+    def acquire(self, n):
+        """
+        Devuelve una tabla vacía para una oración de n palabras
+
+        Args:
+            n: número de palabras
+
+        Returns:
+            CYKChart que usa las listas del pool
+        """
+        self._recycle()
+        self.acquires += 1
+
+        size = n * (n + 1) // 2
+        self._window_max = max(self._window_max, size)
+        self._maybe_shrink()
+
+        if size > len(self._cells):
+            self._cells = [None] * size
+            self._backs = [None] * size
+            self.buffer_allocations += 1
+            self.peak_capacity = max(self.peak_capacity, size)
+        else:
+            self.buffer_reuses += 1
+
+        self._active = CYKChart(n, self._cells, self._backs, self._free)
+        return self._active
+
+    def _recycle(self):
+        """Limpia las celdas creadas por la última tabla entregada"""
+        chart = self._active
+        if chart is None:
+            return
+        self._active = None
+
+        cells = self._cells
+        backs = self._backs
+        free = self._free
+        for idx in chart.created:
+            cell = cells[idx]
+            cell_backs = backs[idx]
+            cells[idx] = None
+            backs[idx] = None
+            if len(free) < self.max_free_cells:
+                cell.clear()
+                cell_backs.clear()
+                free.append((cell, cell_backs))
+        self.cells_recycled += len(chart.created)
+
+    def _maybe_shrink(self):
+        """Reduce la capacidad si sobró más de la mitad durante el periodo"""
+        now = time.monotonic()
+        if now - self._window_start < self.idle_seconds:
+            return
+
+        target = self._window_max
+        if target < len(self._cells) // 2:
+            self._cells = [None] * target
+            self._backs = [None] * target
+            del self._free[target:]
+            self.shrinks += 1
+
+        self._window_start = now
+        self._window_max = 0
+
+    def release(self):
+        """Libera todas las listas y celdas reservadas"""
+        self._recycle()
+        self._cells = []
+        self._backs = []
+        self._free = []
+
+    def stats(self):
+        """Estadísticas de reutilización de memoria"""
+        return {
+            'acquires': self.acquires,
+            'buffer_allocations': self.buffer_allocations,
+            'buffer_reuses': self.buffer_reuses,
+            'cells_recycled': self.cells_recycled,
+            'free_cells': len(self._free),
+            'capacity': self.capacity,
+            'peak_capacity': self.peak_capacity,
+            'shrinks': self.shrinks,
+        }
@@ -6,8 +6,19 @@ CNF requiere que todas las producciones sean de la forma:
 - A → a (un terminal)
 """
 
+import re
 from copy import deepcopy
 from .grammar import Grammar
+from .hooks import observed, STAGE_CONVERT
+
+
+# Nombres de las variables que crea el conversor (T_a para terminales, X0, X1, ...)
+GENERATED_VARIABLE = re.compile(r'^(T_.+|X\d+)$')
+
+
+def is_generated_variable(variable):
+    """Verifica si una variable fue creada por el conversor a CNF"""
+    return GENERATED_VARIABLE.match(variable) is not None
 
 
 class CNFConverter:
@@ -22,7 +33,11 @@ class CNFConverter:
         """
         self.original_grammar = grammar
         self.new_variables_counter = 0
+        # {A: variables alcanzables desde A por producciones unitarias,
+        # incluida A}; lo usa GrammarUpdater para propagar cambios
+        self.unit_reach = {}
         
+    @observed(STAGE_CONVERT)
     def convert(self):
         """
         Convierte la gramática a CNF siguiendo estos pasos:
@@ -41,6 +56,7 @@ class CNFConverter:
         # grammar = self._eliminate_epsilon(grammar)
         
         # Paso 2: Eliminar producciones unitarias
+        self.unit_reach = self._unit_closure(grammar)
         grammar = self._eliminate_unit_productions(grammar)
         
         # Paso 3: Convertir terminales en producciones con variables
@@ -64,6 +80,29 @@ class CNFConverter:
             self.original_grammar.start_symbol
         )
     
+    def _unit_closure(self, grammar):
+        """
+        Calcula qué variables alcanza cada variable por producciones unitarias
+        
+        Tras eliminar las unitarias, A tiene todas las producciones no
+        unitarias de las variables de unit_reach[A].
+        
+        Returns:
+            dict {variable: conjunto de variables alcanzables (incluida ella)}
+        """
+        reach = {}
+        for var in grammar.variables:
+            seen = {var}
+            stack = [var]
+            while stack:
+                current = stack.pop()
+                for prod in grammar.productions.get(current, []):
+                    if isinstance(prod, str) and prod in grammar.variables and prod not in seen:
+                        seen.add(prod)
+                        stack.append(prod)
+            reach[var] = seen
+        return reach
+    
     def _eliminate_unit_productions(self, grammar):
         """
         Elimina producciones unitarias (A → B donde B es variable)
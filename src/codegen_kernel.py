@@ -0,0 +1,262 @@
+"""
+Kernel CYK generado para una gramática concreta
+
+El bucle clásico de CYKParser interpreta la lista de reglas binarias en
+cada punto de división: recorre las tuplas (A, B, C), las desempaqueta y
+busca B y C en las celdas. Como la gramática cambia muy de vez en cuando,
+CodegenKernel genera código Python específico para ella, con las reglas
+desenrolladas en pruebas directas con los símbolos como constantes:
+
+    if 'NP' in left:
+        if 'VP' in right:
+            ... agregar S con backpointer (('NP', 'VP'), k)
+
+Las reglas consecutivas con el mismo hijo izquierdo comparten la prueba
+sobre la celda izquierda. El orden de las pruebas es el de binary_rules,
+así que las celdas, los backpointers (el punto de división más a la
+derecha y, entre reglas que empatan, la última) y los contadores son
+idénticos a los del bucle clásico.
+
+El código se compila una vez con compile() y se guarda en KERNEL_CACHE_DIR
+(el __pycache__ junto a grammar.py), con nombre según el hash del código
+generado: la fuente (.py, para depurar) y el código compilado (marshal),
+que las ejecuciones siguientes cargan sin volver a compilar. Cada cambio
+de gramática genera otro kernel, así que solo se conservan los
+KERNEL_CACHE_LIMIT usados más recientemente.
+
+Uso:
+    parser = CYKParser(cnf, codegen=True)       # en lugar del bucle clásico
+    parser.parse(sentence, engine='codegen')    # forzado a cualquier longitud
+
+    python -m src.codegen_kernel   (muestra el código generado)
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+
+
+# Versión del generador: cambia la llave de los kernels guardados
+CODEGEN_FORMAT = 2
+
+# Directorio de los kernels compilados (None = no guardarlos)
+KERNEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__')
+
+# Kernels que se conservan en KERNEL_CACHE_DIR (los demás se borran)
+KERNEL_CACHE_LIMIT = 8
+KERNEL_PREFIX = 'cyk_kernel_'
+
+
+def generate_source(binary_rules):
+    """
+    Código Python del llenado binario para una lista de reglas A → B C
+
+    Args:
+        binary_rules: lista de (A, B, C) en el orden del bucle clásico
+
+    Returns:
+        string con la función fill(cells, backs, offsets, new_cell, n,
+        deadline, clock) → (rule_hits, rule_checks, timed_out)
+    """
+    lines = [
+        f"# Kernel CYK generado (formato {CODEGEN_FORMAT}); {len(binary_rules)} reglas binarias",
+        "",
+        "def fill(cells, backs, offsets, new_cell, n, deadline, clock):",
+        "    rule_hits = 0",
+        "    rule_checks = 0",
+        "    for length in range(2, n + 1):",
+        "        row_offset = offsets[length]",
+        "        # (k, inicio de la fila izquierda, inicio de la derecha + k + 1)",
+        "        splits = [(k, offsets[k + 1], offsets[length - k - 1] + k + 1)",
+        "                  for k in range(length - 1)]",
+        "        for i in range(n - length + 1):",
+        "            if deadline is not None and clock() > deadline:",
+        "                return rule_hits, rule_checks, True",
+        "            cell = None",
+        "            cell_backs = None",
+        "            for k, left_offset, right_offset in splits:",
+        "                left = cells[left_offset + i]",
+        "                if left is None:",
+        "                    continue",
+        "                right = cells[right_offset + i]",
+        "                if right is None:",
+        "                    continue",
+        f"                rule_checks += {len(binary_rules)}",
+    ]
+
+    previous_left = None
+    for variable, left_sym, right_sym in binary_rules:
+        if left_sym != previous_left:
+            lines.append(f"                if {left_sym!r} in left:")
+            previous_left = left_sym
+        lines.extend([
+            f"                    if {right_sym!r} in right:",
+            "                        if cell is None:",
+            "                            cell = new_cell(row_offset + i)",
+            "                            cell_backs = backs[row_offset + i]",
+            f"                        cell.add({variable!r})",
+            f"                        cell_backs[{variable!r}] = (({left_sym!r}, {right_sym!r}), k)",
+            "                        rule_hits += 1",
+        ])
+
+    lines.extend([
+        "    return rule_hits, rule_checks, False",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def load_kernel(source, cache_dir=KERNEL_CACHE_DIR):
+    """
+    Compila el código generado o lo carga de cache_dir
+
+    Args:
+        source: código de generate_source()
+        cache_dir: directorio de kernels compilados (None = solo en memoria)
+
+    Returns:
+        tuple (función fill, True si se cargó del disco)
+    """
+    digest = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+    name = KERNEL_PREFIX + digest
+    code = None
+    loaded = False
+
+    if cache_dir is not None:
+        source_path = os.path.join(cache_dir, name + '.py')
+        code_path = os.path.join(
+            cache_dir, f"{name}.{sys.implementation.cache_tag}.bin"
+        )
+        try:
+            with open(code_path, 'rb') as f:
+                data = f.read()
+            magic = importlib.util.MAGIC_NUMBER
+            if data[:len(magic)] == magic:
+                code = marshal.loads(data[len(magic):])
+                loaded = True
+        except (OSError, ValueError, EOFError, TypeError):
+            code = None
+        if loaded:
+            # La fecha marca el uso: prune_kernels conserva los recientes
+            try:
+                os.utime(code_path)
+            except OSError:
+                pass
+
+    if code is None:
+        filename = source_path if cache_dir is not None else f"<{name}>"
+        code = compile(source, filename, 'exec')
+        if cache_dir is not None:
+            _write_kernel(cache_dir, source_path, source, code_path, code)
+
+    namespace = {}
+    exec(code, namespace)
+    return namespace['fill'], loaded
+
+
+def _write_kernel(cache_dir, source_path, source, code_path, code):
+    """Guarda fuente y código compilado (reemplazo atómico; sin permisos se omite)"""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = f"{source_path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(source)
+        os.replace(temporary, source_path)
+        temporary = f"{code_path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            f.write(importlib.util.MAGIC_NUMBER)
+            f.write(marshal.dumps(code))
+        os.replace(temporary, code_path)
+    except OSError:
+        return
+    prune_kernels(cache_dir)
+
+
+def prune_kernels(cache_dir=KERNEL_CACHE_DIR, keep=KERNEL_CACHE_LIMIT):
+    """
+    Borra de cache_dir los kernels salvo los keep usados más recientemente
+
+    Un kernel son todos los archivos con su hash (fuente, código compilado
+    de cada intérprete y temporales); su fecha es la del más reciente.
+
+    Returns:
+        número de kernels borrados
+    """
+    kernels = {}
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(KERNEL_PREFIX):
+                    continue
+                digest = entry.name[len(KERNEL_PREFIX):].split('.', 1)[0]
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                paths, newest = kernels.get(digest, ([], mtime))
+                paths.append(entry.path)
+                kernels[digest] = (paths, max(newest, mtime))
+    except OSError:
+        return 0
+
+    stale = sorted(kernels.values(), key=lambda kernel: kernel[1], reverse=True)[keep:]
+    for paths, _ in stale:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                # Otro proceso lo borró o lo está usando
+                pass
+    return len(stale)
+
+
+class CodegenKernel:
+    """
+    Llena la parte binaria de una CYKChart con código generado para la gramática
+
+    Misma interfaz que BitsetKernel (fill / is_current).
+
+    Atributos:
+        source: código Python generado
+        from_disk: True si el código compilado se cargó de cache_dir
+    """
+
+    def __init__(self, compiled, cache_dir=KERNEL_CACHE_DIR):
+        """
+        Args:
+            compiled: CompiledGrammar de la gramática en CNF
+            cache_dir: directorio de kernels compilados (None = no guardarlos)
+        """
+        self.compiled = compiled
+        self.source = generate_source(compiled.binary_rules)
+        self._fill, self.from_disk = load_kernel(self.source, cache_dir)
+
+    def is_current(self):
+        """Verifica que la gramática no cambió desde la generación"""
+        return self.compiled.is_current()
+
+    def fill(self, chart, deadline=None, clock=None):
+        """
+        Llena las celdas de longitud >= 2 de una tabla con la diagonal lista
+
+        Args:
+            chart: CYKChart con las celdas de longitud 1 ya llenas
+            deadline: instante límite (según clock) o None
+            clock: función de tiempo para el límite (time.perf_counter)
+
+        Returns:
+            tuple (rule_hits, rule_checks, timed_out)
+        """
+        return self._fill(chart.cells, chart.backs, chart.offsets, chart.new_cell,
+                          chart.n, deadline, clock)
+
+
+if __name__ == "__main__":
+    from .cnf_converter import CNFConverter
+    from .compiled_grammar import CompiledGrammar
+    from .grammar import create_english_grammar
+
+    compiled = CompiledGrammar(CNFConverter(create_english_grammar()).convert())
+    print(generate_source(compiled.binary_rules))
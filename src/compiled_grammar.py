@@ -0,0 +1,687 @@
+"""
+Gramática CNF compilada a tablas de búsqueda para el parser
+
+En lugar de recorrer todas las producciones para cada palabra, el parser
+consulta tablas precalculadas:
+- terminals / terminal_ids: cada terminal recibe un ID entero
+- lexical[id]: tupla de variables A con A → terminal
+- classes / word_classes: los terminales con el mismo conjunto de
+  preterminales (todos los sustantivos → N, ...) forman una clase léxica;
+  classes[clase] es la tupla de variables y word_classes[id] la clase
+  de cada terminal. Las clases omiten las variables T_a que el conversor
+  crea para cada terminal pero que ninguna regla binaria usa (si no,
+  cada palabra tendría su propia clase); hidden[id] guarda las omitidas
+  para mostrar la tabla completa
+- binary[(B, C)]: tupla de variables A con A → B C
+- binary_rules: lista de reglas (A, B, C) en el orden de la gramática
+- byte_lexicon: bytes UTF-8 del terminal → ID (para leer corpus sin decodificar)
+
+Las tablas pueden guardarse en un bloque plano de bytes (to_bytes) que
+se comparte entre procesos con multiprocessing.shared_memory (share /
+attach) o se mapea desde un archivo (save / load). La versión conectada
+lee el léxico directamente del bloque, de solo lectura, así que la
+memoria del léxico no se multiplica por el número de procesos.
+"""
+
+import hashlib
+import mmap
+import struct
+import zlib
+from array import array
+
+from .cnf_converter import is_generated_variable
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+
+UNKNOWN_ID = -1
+
+# Encabezado del bloque plano: magia, versión de la gramática, símbolo
+# inicial, número de símbolos, terminales, clases léxicas, entradas de
+# las clases, variables omitidas, reglas binarias y casillas de la tabla hash
+_MAGIC = b'CYKG'
+_HEADER = struct.Struct('=4s9i')
+
+
+class CompiledGrammar:
+    """
+    Tablas de búsqueda derivadas de una gramática en CNF
+
+    Atributos:
+        version: versión de la gramática al compilarse
+        start_symbol: símbolo inicial
+        variables: conjunto de variables de la gramática
+        terminals: lista de terminales (el índice es su ID)
+        terminal_ids: dict {terminal: ID}
+        lexical: lista {ID: tupla de variables que producen el terminal}
+        classes: lista {clase: tupla de variables útiles de sus terminales}
+        word_classes: lista {ID: clase del terminal}
+        hidden: lista {ID: tupla de variables del terminal omitidas de su clase}
+        binary: dict {(B, C): tupla de variables A con A → B C}
+        binary_rules: lista de (A, B, C) en el orden de la gramática
+        byte_lexicon: dict {bytes: ID}, incluye variantes Capitalizada y MAYÚSCULA
+
+    Una instancia conectada a un bloque (from_buffer, load, attach) tiene
+    grammar = None y expone terminals, terminal_ids, word_classes, hidden y
+    byte_lexicon como vistas de solo lectura sobre el bloque. El bloque
+    solo guarda las clases y las variables omitidas, así que su lexical[id]
+    es classes[word_classes[id]] + hidden[id].
+    """
+
+    def __init__(self, grammar):
+        """
+        Args:
+            grammar: gramática en CNF
+        """
+        self.grammar = grammar
+        self.version = grammar.version
+        self.start_symbol = grammar.start_symbol
+        self.variables = set(grammar.variables)
+        self._source = None
+        self._block = None
+        self._fingerprint = None
+        self._layout = None
+
+        lexical = {}
+        binary = {}
+        self.binary_rules = []
+
+        # Se respeta el orden de las producciones de la gramática
+        for variable, productions in grammar.productions.items():
+            for prod in productions:
+                if isinstance(prod, tuple):
+                    if len(prod) == 2:
+                        binary.setdefault(prod, []).append(variable)
+                        self.binary_rules.append((variable, prod[0], prod[1]))
+                else:
+                    lexical.setdefault(prod, []).append(variable)
+
+        self.terminals = sorted(lexical)
+        self.terminal_ids = {
+            terminal: idx for idx, terminal in enumerate(self.terminals)
+        }
+        self.lexical = [tuple(lexical[terminal]) for terminal in self.terminals]
+        self.binary = {pair: tuple(variables) for pair, variables in binary.items()}
+
+        self.byte_lexicon = {}
+        for idx, terminal in enumerate(self.terminals):
+            for variant in (terminal, terminal.capitalize(), terminal.upper()):
+                self.byte_lexicon.setdefault(variant.encode('utf-8'), idx)
+
+        # Índice de las reglas binarias para apply_delta: {orden: regla}
+        # (dict ordenado por inserción) y {regla: [órdenes]}
+        self._rule_slots = dict(enumerate(self.binary_rules))
+        self._rule_orders = {}
+        for order, rule in self._rule_slots.items():
+            self._rule_orders.setdefault(rule, []).append(order)
+        self._next_order = len(self.binary_rules)
+
+        self._build_classes()
+
+    def _build_classes(self):
+        """Agrupa los terminales en clases léxicas (ver classes)"""
+        # Apariciones de cada símbolo como hijo de una regla binaria
+        self._child_counts = {}
+        for _, left, right in self.binary_rules:
+            self._child_counts[left] = self._child_counts.get(left, 0) + 1
+            self._child_counts[right] = self._child_counts.get(right, 0) + 1
+        # Terminales de cada variable del conversor (T_a), para apply_delta
+        self._generated_terminals = {}
+
+        self.classes = []
+        self._class_index = {}
+        self.word_classes = [None] * len(self.lexical)
+        self.hidden = [()] * len(self.lexical)
+        for idx, variables in enumerate(self.lexical):
+            for variable in variables:
+                if is_generated_variable(variable):
+                    self._generated_terminals.setdefault(variable, set()).add(idx)
+            self._assign_class(idx)
+
+    def _assign_class(self, idx):
+        """Calcula la clase léxica y las variables omitidas de un terminal"""
+        variables = self.lexical[idx]
+        # Una variable del conversor que no aparece en ninguna regla
+        # binaria no puede formar parte de un árbol
+        hidden = tuple(
+            variable for variable in variables
+            if variable != self.start_symbol and not self._child_counts.get(variable)
+            and is_generated_variable(variable)
+        )
+        if hidden:
+            variables = tuple(
+                variable for variable in variables if variable not in hidden
+            )
+        self.hidden[idx] = hidden
+
+        class_id = self._class_index.get(variables)
+        if class_id is None:
+            class_id = len(self.classes)
+            self.classes.append(variables)
+            self._class_index[variables] = class_id
+            self._layout = None
+        self.word_classes[idx] = class_id
+
+    def class_layout(self):
+        """
+        Hash de la numeración de las clases léxicas
+
+        Los IDs de clase dependen de la historia de apply_delta: dos tablas
+        de la misma gramática pueden numerarlas distinto, así que la caché
+        de resultados combina este valor con el fingerprint.
+        """
+        if self._layout is None:
+            self._layout = hash(tuple(self.classes))
+        return self._layout
+
+    def is_current(self):
+        """Verifica que la gramática no cambió desde la compilación"""
+        if self.grammar is None:
+            # Las tablas conectadas a un bloque no cambian
+            return True
+        return self.version == self.grammar.version
+
+    def fingerprint(self):
+        """
+        Hash del contenido de la gramática (ver Grammar.fingerprint)
+
+        Las tablas conectadas a un bloque usan el hash del bloque.
+        """
+        if self.grammar is not None:
+            return self.grammar.fingerprint()
+        if self._fingerprint is None:
+            self._fingerprint = hashlib.sha256(self._block).hexdigest()[:16]
+        return self._fingerprint
+
+    def terminal_id(self, word):
+        """ID de un terminal o UNKNOWN_ID si no está en el léxico"""
+        return self.terminal_ids.get(word, UNKNOWN_ID)
+
+    def lookup(self, word):
+        """Variables que producen la palabra (tupla vacía si es desconocida)"""
+        idx = self.terminal_ids.get(word)
+        return self.lexical[idx] if idx is not None else ()
+
+    def lookup_bytes(self, token):
+        """
+        ID de un token en bytes (o memoryview de solo lectura)
+
+        Primero se busca tal cual (sin copias); si no se encuentra,
+        se prueba con la versión en minúsculas.
+        """
+        idx = self.byte_lexicon.get(token)
+        if idx is None:
+            idx = self.byte_lexicon.get(bytes(token).lower(), UNKNOWN_ID)
+        return idx
+
+    def word_class(self, word):
+        """Clase léxica de una palabra o UNKNOWN_ID si es desconocida"""
+        idx = self.terminal_ids.get(word)
+        return self.word_classes[idx] if idx is not None else UNKNOWN_ID
+
+    def class_ids(self, ids):
+        """Convierte IDs de terminales a IDs de clase (UNKNOWN_ID se conserva)"""
+        word_classes = self.word_classes
+        return [
+            word_classes[idx] if idx != UNKNOWN_ID else UNKNOWN_ID
+            for idx in ids
+        ]
+
+    def encode(self, words):
+        """Convierte una lista de palabras a lista de IDs"""
+        return [self.terminal_ids.get(word, UNKNOWN_ID) for word in words]
+
+    def decode(self, ids):
+        """Convierte IDs a palabras (None para IDs desconocidos)"""
+        return [
+            self.terminals[idx] if idx != UNKNOWN_ID else None
+            for idx in ids
+        ]
+
+    def apply_delta(self, added, removed, version):
+        """
+        Actualiza las tablas en el lugar con reglas CNF agregadas/eliminadas
+
+        Los terminales nuevos reciben el siguiente ID libre, así que los
+        IDs existentes no cambian (terminals deja de estar ordenada). Solo
+        se recalcula la clase de los terminales afectados: los de las
+        reglas léxicas del cambio y los de las variables T_a que una regla
+        binaria vuelve útiles o deja sin uso. Una clase que se queda sin
+        terminales conserva su ID (ver class_layout).
+
+        Args:
+            added, removed: listas de (variable, producción) en CNF
+            version: versión de la gramática después del cambio
+        """
+        if self.grammar is None:
+            raise ValueError("Las tablas conectadas a un bloque son de solo lectura")
+
+        touched = set()       # terminales cuya clase puede cambiar
+        toggled = set()       # hijos que pasaron de usados a no usados o al revés
+        rules_changed = False
+        counts = self._child_counts
+
+        for variable, prod in removed:
+            if isinstance(prod, tuple):
+                rule = (variable,) + prod
+                orders = self._rule_orders[rule]
+                del self._rule_slots[orders.pop(0)]
+                if not orders:
+                    del self._rule_orders[rule]
+                rules_changed = True
+                for child in prod:
+                    counts[child] -= 1
+                    if not counts[child]:
+                        toggled.add(child)
+                variables = list(self.binary[prod])
+                variables.remove(variable)
+                if variables:
+                    self.binary[prod] = tuple(variables)
+                else:
+                    del self.binary[prod]
+            else:
+                idx = self.terminal_ids[prod]
+                variables = list(self.lexical[idx])
+                variables.remove(variable)
+                self.lexical[idx] = tuple(variables)
+                touched.add(idx)
+                if variable not in variables and is_generated_variable(variable):
+                    self._generated_terminals[variable].discard(idx)
+
+        for variable, prod in added:
+            if isinstance(prod, tuple):
+                rule = (variable,) + prod
+                self._rule_slots[self._next_order] = rule
+                self._rule_orders.setdefault(rule, []).append(self._next_order)
+                self._next_order += 1
+                rules_changed = True
+                for child in prod:
+                    counts[child] = counts.get(child, 0) + 1
+                    if counts[child] == 1:
+                        toggled.add(child)
+                self.binary[prod] = self.binary.get(prod, ()) + (variable,)
+            else:
+                idx = self.terminal_ids.get(prod)
+                if idx is None:
+                    idx = len(self.terminals)
+                    self.terminals.append(prod)
+                    self.terminal_ids[prod] = idx
+                    self.lexical.append(())
+                    self.word_classes.append(None)
+                    self.hidden.append(())
+                    for variant in (prod, prod.capitalize(), prod.upper()):
+                        self.byte_lexicon.setdefault(variant.encode('utf-8'), idx)
+                self.lexical[idx] += (variable,)
+                touched.add(idx)
+                if is_generated_variable(variable):
+                    self._generated_terminals.setdefault(variable, set()).add(idx)
+
+        if rules_changed:
+            # Una sola copia en el orden de inserción (sin list.remove por regla)
+            self.binary_rules = list(self._rule_slots.values())
+        for variable in toggled:
+            touched.update(self._generated_terminals.get(variable, ()))
+        for idx in touched:
+            self._assign_class(idx)
+
+        self.variables.update(variable for variable, _ in added)
+        self.version = version
+
+    @property
+    def productions(self):
+        """
+        Producciones reconstruidas desde las tablas {variable: [producciones]}
+
+        Solo se necesitan para la poda (max_span='auto', beam); en una
+        instancia conectada crean una copia local en cada proceso.
+        """
+        if self.grammar is not None:
+            return self.grammar.productions
+
+        productions = {}
+        for idx, variables in enumerate(self.lexical):
+            for variable in variables:
+                productions.setdefault(variable, []).append(self.terminals[idx])
+        for variable, left, right in self.binary_rules:
+            productions.setdefault(variable, []).append((left, right))
+        return productions
+
+    # ------------------------------------------------------------------
+    # Bloque plano de bytes
+    # ------------------------------------------------------------------
+
+    def to_bytes(self):
+        """
+        Serializa las tablas en un bloque plano
+
+        Secciones (enteros de 32 bits en el orden de bytes de la máquina):
+        offsets y bytes UTF-8 de los símbolos, offsets y bytes de los
+        terminales, clases léxicas en formato CSR (offsets por clase + IDs
+        de variables), la clase de cada terminal, las variables omitidas
+        de cada terminal (CSR), reglas binarias (A, B, C)
+        y una tabla hash (crc32, sondeo lineal) de bytes del terminal → ID.
+
+        Returns:
+            bytes
+        """
+        symbols = set(self.variables)
+        symbols.add(self.start_symbol)
+        for rule in self.binary_rules:
+            symbols.update(rule)
+        for variables in self.classes:
+            symbols.update(variables)
+        symbols = sorted(symbols)
+        symbol_ids = {symbol: idx for idx, symbol in enumerate(symbols)}
+
+        lex_offsets = array('i', [0])
+        lex_vars = array('i')
+        for variables in self.classes:
+            lex_vars.extend(symbol_ids[variable] for variable in variables)
+            lex_offsets.append(len(lex_vars))
+        word_classes = array('i', self.word_classes)
+        hidden_offsets = array('i', [0])
+        hidden_vars = array('i')
+        for variables in self.hidden:
+            hidden_vars.extend(symbol_ids[variable] for variable in variables)
+            hidden_offsets.append(len(hidden_vars))
+
+        rules = array('i')
+        for rule in self.binary_rules:
+            rules.extend(symbol_ids[symbol] for symbol in rule)
+
+        encoded = [terminal.encode('utf-8') for terminal in self.terminals]
+        slots = 8
+        while slots < 2 * len(encoded):
+            slots *= 2
+        hash_table = array('i', [UNKNOWN_ID]) * slots
+        for idx, key in enumerate(encoded):
+            slot = zlib.crc32(key) & (slots - 1)
+            while hash_table[slot] != UNKNOWN_ID:
+                slot = (slot + 1) & (slots - 1)
+            hash_table[slot] = idx
+
+        header = _HEADER.pack(
+            _MAGIC, self.version, symbol_ids[self.start_symbol], len(symbols),
+            len(encoded), len(self.classes), len(lex_vars), len(hidden_vars),
+            len(self.binary_rules), slots
+        )
+        parts = [header]
+        for strings in ([s.encode('utf-8') for s in symbols], encoded):
+            offsets, blob = _pack_strings(strings)
+            parts.append(offsets.tobytes())
+            parts.append(blob)
+        for table in (lex_offsets, lex_vars, word_classes, hidden_offsets,
+                      hidden_vars, rules, hash_table):
+            parts.append(table.tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_buffer(cls, buffer, source=None):
+        """
+        Conecta las tablas a un bloque creado con to_bytes (sin copiarlo)
+
+        Args:
+            buffer: objeto con protocolo buffer (bytes, mmap, memoria compartida)
+            source: ('shm', nombre) o ('file', ruta) para poder volver a
+                    conectarse al serializar la instancia con pickle
+
+        Returns:
+            CompiledGrammar de solo lectura
+        """
+        view = memoryview(buffer).cast('B')
+        (magic, version, start, symbol_count, terminal_count, class_count,
+         lex_count, hidden_count, rule_count, slots) = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            raise ValueError("El bloque no contiene una gramática compilada")
+
+        self = cls.__new__(cls)
+        self.grammar = None
+        self.version = version
+        self._source = source
+        self._block = view
+        self._fingerprint = None
+        self._layout = None
+
+        position = _HEADER.size
+        symbol_table, position = _StringTable.from_view(view, position, symbol_count)
+        terminals, position = _StringTable.from_view(view, position, terminal_count)
+        lex_offsets, position = _int_view(view, position, class_count + 1)
+        lex_vars, position = _int_view(view, position, lex_count)
+        word_classes, position = _int_view(view, position, terminal_count)
+        hidden_offsets, position = _int_view(view, position, terminal_count + 1)
+        hidden_vars, position = _int_view(view, position, hidden_count)
+        rules, position = _int_view(view, position, 3 * rule_count)
+        hash_table, position = _int_view(view, position, slots)
+
+        # Los símbolos, las reglas y las clases léxicas son pocos: se
+        # decodifican una vez por proceso; lo que crece con el vocabulario
+        # (terminales, clase de cada uno, tabla hash) queda en el bloque
+        symbols = [symbol_table[idx] for idx in range(symbol_count)]
+        self.start_symbol = symbols[start]
+        self.binary_rules = [
+            (symbols[rules[k]], symbols[rules[k + 1]], symbols[rules[k + 2]])
+            for k in range(0, len(rules), 3)
+        ]
+        self.variables = set(symbols)
+        binary = {}
+        for variable, left, right in self.binary_rules:
+            binary.setdefault((left, right), []).append(variable)
+        self.binary = {pair: tuple(variables) for pair, variables in binary.items()}
+
+        self.terminals = terminals
+        self.byte_lexicon = _HashIndex(terminals, hash_table)
+        self.terminal_ids = _TerminalIndex(self.byte_lexicon)
+        self.classes = [
+            tuple(symbols[var] for var in lex_vars[lex_offsets[k]:lex_offsets[k + 1]])
+            for k in range(class_count)
+        ]
+        self.word_classes = word_classes
+        self.hidden = _SymbolLists(hidden_offsets, hidden_vars, symbols)
+        self.lexical = _ClassLexicon(word_classes, self.classes, self.hidden)
+        return self
+
+    def __reduce_ex__(self, protocol):
+        # Una instancia conectada viaja entre procesos como su origen
+        if self._source is not None:
+            kind, name = self._source
+            if kind == 'shm':
+                return attach, (name,)
+            return CompiledGrammar.load, (name,)
+        return super().__reduce_ex__(protocol)
+
+    def save(self, path):
+        """Guarda el bloque plano en un archivo (ver load)"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Mapea en memoria un archivo creado con save
+
+        Todos los procesos que cargan el mismo archivo comparten sus páginas.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(mapped, source=('file', path))
+
+
+def share(compiled):
+    """
+    Copia las tablas a un segmento de memoria compartida (Python 3.8+)
+
+    El segmento debe liberarse con close() y unlink() cuando ningún
+    proceso lo use.
+
+    Args:
+        compiled: CompiledGrammar a compartir
+
+    Returns:
+        segmento SharedMemory; los procesos se conectan con attach(segmento.name)
+    """
+    if shared_memory is None:
+        raise RuntimeError("multiprocessing.shared_memory requiere Python 3.8+")
+    data = compiled.to_bytes()
+    segment = shared_memory.SharedMemory(create=True, size=len(data))
+    segment.buf[:len(data)] = data
+    return segment
+
+
+# Segmentos conectados en este proceso (deben seguir abiertos mientras se usan)
+_attached = {}
+
+
+def attach(name):
+    """
+    Conecta las tablas de un segmento creado con share()
+
+    Returns:
+        CompiledGrammar de solo lectura
+    """
+    segment = _attached.get(name)
+    if segment is None:
+        # El proceso que llamó a share() comparte el resource_tracker y
+        # es quien elimina el segmento
+        segment = _attached[name] = shared_memory.SharedMemory(name=name)
+    return CompiledGrammar.from_buffer(segment.buf, source=('shm', name))
+
+
+def _pack_strings(strings):
+    """Offsets (array de enteros) y bytes concatenados, alineados a 4"""
+    offsets = array('i', [0])
+    for data in strings:
+        offsets.append(offsets[-1] + len(data))
+    blob = b''.join(strings)
+    return offsets, blob + b'\0' * (-len(blob) % 4)
+
+
+def _int_view(view, position, count):
+    """Vista de count enteros de 32 bits desde position"""
+    end = position + 4 * count
+    return view[position:end].cast('i'), end
+
+
+class _StringTable:
+    """Secuencia de strings guardada como offsets + bytes UTF-8"""
+
+    __slots__ = ('offsets', 'data')
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def from_view(cls, view, position, count):
+        offsets, position = _int_view(view, position, count + 1)
+        size = offsets[count]
+        data = view[position:position + size]
+        return cls(offsets, data), position + size + (-size % 4)
+
+    def raw(self, idx):
+        """Bytes del string idx (memoryview, sin copia)"""
+        return self.data[self.offsets[idx]:self.offsets[idx + 1]]
+
+    def __getitem__(self, idx):
+        return str(self.raw(idx), 'utf-8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class _HashIndex:
+    """Bytes del terminal → ID sobre la tabla hash del bloque (como byte_lexicon)"""
+
+    __slots__ = ('strings', 'table', 'mask')
+
+    def __init__(self, strings, table):
+        self.strings = strings
+        self.table = table
+        self.mask = len(table) - 1
+
+    def get(self, key, default=None):
+        table = self.table
+        slot = zlib.crc32(key) & self.mask
+        while True:
+            idx = table[slot]
+            if idx == UNKNOWN_ID:
+                return default
+            if self.strings.raw(idx) == key:
+                return idx
+            slot = (slot + 1) & self.mask
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+
+class _TerminalIndex:
+    """Terminal (str) → ID sobre la tabla hash del bloque (como terminal_ids)"""
+
+    __slots__ = ('index',)
+
+    def __init__(self, index):
+        self.index = index
+
+    def get(self, word, default=None):
+        return self.index.get(word.encode('utf-8'), default)
+
+    def __getitem__(self, word):
+        idx = self.get(word)
+        if idx is None:
+            raise KeyError(word)
+        return idx
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+
+class _SymbolLists:
+    """Listas de símbolos por ID guardadas en formato CSR (como hidden)"""
+
+    __slots__ = ('offsets', 'values', 'symbols')
+
+    def __init__(self, offsets, values, symbols):
+        self.offsets = offsets
+        self.values = values
+        self.symbols = symbols
+
+    def __getitem__(self, idx):
+        start, end = self.offsets[idx], self.offsets[idx + 1]
+        if start == end:
+            return ()
+        symbols = self.symbols
+        return tuple(symbols[value] for value in self.values[start:end])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class _ClassLexicon:
+    """lexical[ID] → tupla de variables: las de su clase más las omitidas"""
+
+    __slots__ = ('word_classes', 'classes', 'hidden')
+
+    def __init__(self, word_classes, classes, hidden):
+        self.word_classes = word_classes
+        self.classes = classes
+        self.hidden = hidden
+
+    def __getitem__(self, idx):
+        return self.classes[self.word_classes[idx]] + self.hidden[idx]
+
+    def __len__(self):
+        return len(self.word_classes)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
@@ -0,0 +1,147 @@
+"""
+Lector de corpus con memoria mapeada
+
+Mapea el archivo en memoria (mmap) y busca los límites de oraciones y
+palabras directamente sobre los bytes. Cada palabra se busca en el léxico
+de bytes de la gramática compilada usando un memoryview del mapa, así que
+no se crean strings ni copias intermedias: el parser recibe un array de
+IDs de terminales (ver CYKParser.parse_ids).
+
+Ejecuta: python -m src.corpus_reader corpus.txt
+"""
+
+import mmap
+import re
+import weakref
+from array import array
+
+from .compiled_grammar import UNKNOWN_ID
+
+
+# Una palabra (grupo 1) o un fin de oración (grupo 2): signos finales
+# o una línea en blanco. Los bytes >= 0x80 se tratan como letras (UTF-8).
+TOKEN_PATTERN = re.compile(
+    rb"([A-Za-z0-9_\x80-\xff]+(?:['-][A-Za-z0-9_\x80-\xff]+)*)"
+    rb"|([.!?]+|\n[ \t\r]*\n)"
+)
+
+
+class MappedCorpusReader:
+    """
+    Itera las oraciones de un archivo como arrays de IDs de terminales
+
+    Uso:
+        compiled = parser.get_compiled_grammar()
+        with MappedCorpusReader('corpus.txt', compiled) as reader:
+            for ids in reader:
+                accepted, _, _ = parser.parse_ids(ids)
+    """
+
+    def __init__(self, path, compiled_grammar):
+        """
+        Args:
+            path: ruta del archivo (UTF-8)
+            compiled_grammar: CompiledGrammar cuyo léxico asigna los IDs
+        """
+        self.path = path
+        self.compiled = compiled_grammar
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Archivo vacío: no se puede mapear
+            self._map = None
+        self._view = memoryview(self._map) if self._map is not None else None
+        # Iteradores abiertos: retienen el mapa y se cierran en close()
+        self._iterators = weakref.WeakSet()
+
+        self.sentences = 0
+        self.tokens = 0
+        self.unknown_tokens = 0
+
+    def __iter__(self):
+        return self.iter_sentences()
+
+    def iter_sentences(self):
+        """
+        Itera las oraciones del archivo
+
+        Yields:
+            array('i') con los IDs de las palabras (UNKNOWN_ID si no están
+            en el léxico); las oraciones vacías se omiten
+        """
+        iterator = self._iter_sentences()
+        self._iterators.add(iterator)
+        return iterator
+
+    def _iter_sentences(self):
+        """Generador que recorre el mapa de memoria"""
+        if self._view is None:
+            return
+
+        view = self._view
+        lexicon = self.compiled.byte_lexicon
+        lookup_bytes = self.compiled.lookup_bytes
+        ids = array('i')
+
+        for match in TOKEN_PATTERN.finditer(self._map):
+            if match.lastindex == 1:
+                # El memoryview no se guarda en una variable para que no quede
+                # vivo mientras el generador está suspendido
+                start, end = match.span(1)
+                idx = lexicon.get(view[start:end])
+                if idx is None:
+                    idx = lookup_bytes(view[start:end])
+                    if idx == UNKNOWN_ID:
+                        self.unknown_tokens += 1
+                ids.append(idx)
+            elif ids:
+                self.sentences += 1
+                self.tokens += len(ids)
+                yield ids
+                ids = array('i')
+
+        if ids:
+            self.sentences += 1
+            self.tokens += len(ids)
+            yield ids
+
+    def close(self):
+        """Libera el mapa de memoria y el archivo"""
+        for iterator in list(self._iterators):
+            iterator.close()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from .grammar import create_english_grammar
+    from .cnf_converter import CNFConverter
+    from .cyk_algorithm import CYKParser
+
+    parser = CYKParser(CNFConverter(create_english_grammar()).convert())
+
+    accepted = 0
+    start = time.perf_counter()
+    with MappedCorpusReader(sys.argv[1], parser.get_compiled_grammar()) as reader:
+        for ids in reader:
+            accepted += parser.parse_ids(ids)[0]
+        elapsed = time.perf_counter() - start
+
+        print(f"{reader.sentences} oraciones, {reader.tokens} palabras "
+              f"({reader.unknown_tokens} desconocidas), {accepted} aceptadas")
+        print(f"Tiempo: {elapsed:.2f} s ({reader.sentences / elapsed:.0f} oraciones/s)")
@@ -3,8 +3,38 @@ Implementación del algoritmo CYK (Cocke-Younger-Kasami)
 para parsing de gramáticas libres de contexto en CNF
 """
 
+import sys
 import time
 
+from .bitset_cyk import BitsetKernel, BITSET_MIN_LENGTH
+from .chart import CYKChart
+from .codegen_kernel import CodegenKernel
+from .compiled_grammar import CompiledGrammar, UNKNOWN_ID
+from .earley_parser import EarleyParser
+from .engine_selector import CALIBRATION_FILE, EngineSelector
+from .hooks import observed, STAGE_PARSE
+from .parse_cache import CacheEntry, STORE_TREE
+from .partial_parse import default_labels, extract_chunks
+from .parse_stats import ParseStats
+from .pruning import apply_beam, compute_max_spans, default_symbol_scores
+from .tokenizer import DEFAULT_TOKENIZER
+from .wavefront import WavefrontFiller, WAVEFRONT_MIN_LENGTH
+
+
+# Motores disponibles en CYKParser.parse
+ENGINE_CYK = 'cyk'
+ENGINE_EARLEY = 'earley'
+ENGINE_BITSET = 'bitset'
+ENGINE_WAVEFRONT = 'wavefront'
+ENGINE_CLASSIC = 'classic'  # bucle clásico a cualquier longitud
+ENGINE_CODEGEN = 'codegen'  # kernel generado para la gramática a cualquier longitud
+ENGINE_AUTO = 'auto'        # elegido por oración (ver engine_selector.py)
+ENGINE_CACHE = 'cache'      # last_engine de un resultado tomado de la caché
+
+# Candidatos por defecto de ENGINE_AUTO: dan la misma tabla y el mismo
+# árbol. Earley solo se considera si el llamador lo pide (auto_engines)
+AUTO_ENGINES = (ENGINE_CLASSIC, ENGINE_CODEGEN, ENGINE_BITSET)
+
 
 class CYKParser:
     """
@@ -12,21 +42,136 @@ class CYKParser:
     pertenece al lenguaje generado por una gramática en CNF
     """
     
-    def __init__(self, grammar):
+    def __init__(self, grammar, collect_stats=False, cache=None, chart_pool=None,
+                 max_span=None, beam_size=None, symbol_scores=None, time_budget=None,
+                 original_grammar=None, engine=ENGINE_CYK,
+                 bitset_min_length=BITSET_MIN_LENGTH, parallel_workers=None,
+                 parallel_min_length=WAVEFRONT_MIN_LENGTH, unknown_words=None,
+                 tokenizer=None, calibration_file=CALIBRATION_FILE, codegen=False,
+                 auto_engines=AUTO_ENGINES):
         """
         Args:
-            grammar: Gramática en CNF
+            grammar: Gramática en CNF, o CompiledGrammar conectada a un bloque
+                     compartido (compiled_grammar.attach / load), para que
+                     varios procesos no copien la gramática
+            collect_stats: si registrar tiempos por fase y contadores
+                           en self.last_stats (ver ParseStats)
+            cache: ParseCache opcional para reutilizar resultados de
+                   oraciones repetidas
+            chart_pool: ChartPool opcional para reutilizar la memoria de la
+                        tabla entre parseos (la tabla devuelta por parse()
+                        solo es válida hasta el siguiente parse())
+            max_span: longitud máxima de constituyente por variable:
+                      None (sin límite), 'auto' (calculada de la gramática)
+                      o dict {variable: longitud} que se combina con 'auto';
+                      cualquier otro valor produce ValueError
+            beam_size: si se indica, cada celda conserva solo las N variables
+                       con mejor puntaje
+            symbol_scores: dict {variable: puntaje} para el beam (por defecto
+                           una heurística basada en la gramática)
+            time_budget: segundos máximos por oración; al excederse el parsing
+                         se aborta, la oración se rechaza y self.timed_out
+                         queda en True (la tabla contiene el resultado parcial)
+            original_grammar: gramática antes de la CNF (necesaria para el
+                              motor Earley)
+            engine: motor por defecto de parse(): ENGINE_CYK, ENGINE_EARLEY,
+                    ENGINE_BITSET (fuerza el kernel de bits), ENGINE_CLASSIC
+                    (fuerza el bucle clásico), ENGINE_CODEGEN (fuerza el
+                    kernel generado) o ENGINE_AUTO (el más rápido
+                    para la longitud de cada oración, según una calibración
+                    en esta máquina; ver engine_selector.py)
+            bitset_min_length: con ENGINE_CYK, las oraciones de al menos esta
+                               longitud se llenan con el kernel de bits
+                               (ver bitset_cyk.py); None lo desactiva
+            parallel_workers: procesos para repartir cada anti-diagonal de
+                              oraciones largas (ver wavefront.py); None
+                              (por defecto) o 1 lo desactiva
+            parallel_min_length: longitud mínima para el modo paralelo
+            unknown_words: UnknownWordModel opcional que asigna variables
+                           candidatas a las palabras fuera del léxico (si
+                           no, su celda queda vacía); no se aplica a
+                           parse_ids, que no conoce la palabra
+            tokenizer: Tokenizer que convierte las oraciones de parse() en
+                       palabras (por defecto minúsculas y split()); las
+                       TokenList se usan sin volver a normalizarlas
+            calibration_file: JSON donde ENGINE_AUTO guarda y busca su
+                              calibración (None = calibrar en memoria en
+                              cada proceso)
+            codegen: si las oraciones que usarían el bucle clásico usan en
+                     su lugar código generado para la gramática (mismo
+                     resultado; ver codegen_kernel.py). Con max_span o
+                     beam_size se usa siempre el bucle clásico
+            auto_engines: motores entre los que elige ENGINE_AUTO, de
+                          ENGINE_CLASSIC (siempre incluido), ENGINE_CODEGEN,
+                          ENGINE_BITSET y ENGINE_EARLEY. Earley no está por
+                          defecto: no deja tabla CYK y construye el árbol
+                          sobre la gramática original, que puede ser distinto
         """
+        unsupported = set(auto_engines) - {ENGINE_CLASSIC, ENGINE_CODEGEN,
+                                           ENGINE_BITSET, ENGINE_EARLEY}
+        if unsupported:
+            raise ValueError(f"Motores no admitidos en auto_engines: {sorted(unsupported)}")
+        if max_span is not None and max_span != 'auto' and not isinstance(max_span, dict):
+            raise ValueError(
+                f"max_span debe ser None, 'auto' o un dict {{variable: longitud}}: {max_span!r}"
+            )
+        
+        self._compiled = None
+        if isinstance(grammar, CompiledGrammar):
+            if grammar.grammar is not None:
+                grammar = grammar.grammar
+            else:
+                # Tablas de solo lectura: hacen también de gramática
+                self._compiled = grammar
         self.grammar = grammar
         self.table = None
         self.backpointers = None  # Para construcción del árbol
+        self.collect_stats = collect_stats
+        self.last_stats = None
+        self.cache = cache
+        self.cache_entry = None  # Entrada de caché de la última oración
+        self.chart_pool = chart_pool
+        self.max_span = max_span
+        self.beam_size = beam_size
+        self.symbol_scores = symbol_scores
+        self.time_budget = time_budget
+        self.timed_out = False
+        self._pruning_version = None
+        self._max_spans = None
+        self._scores = None
+        self.original_grammar = original_grammar
+        self.engine = engine
+        self.last_engine = None
+        self._earley = None
+        self.bitset_min_length = bitset_min_length
+        self._kernel = None
+        self.parallel_workers = parallel_workers
+        self.parallel_min_length = parallel_min_length
+        self._wavefront = None
+        self.unknown_words = unknown_words
+        self.tokenizer = tokenizer or DEFAULT_TOKENIZER
+        self.calibration_file = calibration_file
+        self._engine_selector = None
+        self.codegen = codegen
+        self._codegen = None
+        self.auto_engines = tuple(auto_engines)
         
-    def parse(self, sentence):
+    @observed(STAGE_PARSE)
+    def parse(self, sentence, engine=None):
         """
         Verifica si una oración pertenece al lenguaje
         
         Args:
-            sentence: string o lista de palabras
+            sentence: string, lista de palabras o TokenList (ya
+                      normalizada por self.tokenizer: no se vuelve a procesar)
+            engine: motor para esta llamada (por defecto self.engine):
+                    ENGINE_CYK sobre la CNF o ENGINE_EARLEY sobre la
+                    gramática original (en ese caso self.table queda en None
+                    y ParseTreeBuilder construye el árbol desde Earley)
+                    o ENGINE_BITSET / ENGINE_CLASSIC / ENGINE_CODEGEN (misma
+                    tabla que ENGINE_CYK) o ENGINE_AUTO; el motor que se usó queda en
+                    self.last_engine y en last_stats.engines (ENGINE_CACHE
+                    si el resultado salió de la caché, sin llenar la tabla)
             
         Returns:
             tuple (accepted, time_taken, table)
@@ -34,74 +179,545 @@ class CYKParser:
             - time_taken: tiempo de ejecución en segundos
             - table: la tabla CYK completa
         """
-        start_time = time.time()
+        engine = engine or self.engine
+        if engine == ENGINE_AUTO:
+            sentence = self.tokenizer.tokenize(sentence)
+            engine = self.engine_selector.select(len(sentence))
+        if engine == ENGINE_EARLEY:
+            return self._parse_earley(self.tokenizer.tokenize(sentence))
+        if engine not in (ENGINE_CYK, ENGINE_BITSET, ENGINE_CLASSIC, ENGINE_CODEGEN):
+            raise ValueError(f"Motor desconocido: {engine}")
         
-        # Convertir oración a lista de palabras
-        if isinstance(sentence, str):
-            words = sentence.lower().split()
-        else:
-            words = [w.lower() for w in sentence]
+        start_time = time.perf_counter()
+        
+        stats = ParseStats() if self.collect_stats else None
+        if stats is not None:
+            stats.start_phase('tokenize')
+        
+        # Convertir oración a lista de palabras (una TokenList pasa tal cual)
+        words = self.tokenizer.tokenize(sentence)
+        
+        return self._run(words, None, start_time, stats, engine)
+    
+    @observed(STAGE_PARSE)
+    def parse_ids(self, ids):
+        """
+        Verifica una oración ya convertida a IDs de terminales
+        
+        Evita crear strings intermedios cuando la entrada viene de un
+        lector de corpus (ver MappedCorpusReader). Los IDs son los de
+        get_compiled_grammar(); UNKNOWN_ID marca palabras desconocidas.
+        
+        Args:
+            ids: secuencia de IDs (por ejemplo array('i'))
+            
+        Returns:
+            tuple (accepted, time_taken, table), igual que parse()
+        """
+        start_time = time.perf_counter()
+        
+        stats = ParseStats() if self.collect_stats else None
+        if stats is not None:
+            stats.start_phase('tokenize')
+        
+        # Las palabras son los terminales ya existentes (None = desconocida)
+        words = self.get_compiled_grammar().decode(ids)
+        
+        engine = self.engine
+        if engine == ENGINE_AUTO:
+            engine = self.engine_selector.select(len(words))
+        if engine == ENGINE_EARLEY:
+            # Earley necesita las palabras: parse_ids usa el CYK
+            engine = ENGINE_CYK
+        
+        return self._run(words, ids, start_time, stats, engine)
+    
+    @property
+    def engine_selector(self):
+        """EngineSelector de ENGINE_AUTO (se crea al usarlo; calibra en la primera oración)"""
+        if self._engine_selector is None:
+            self._engine_selector = EngineSelector(self, self.calibration_file)
+        return self._engine_selector
+    
+    @property
+    def earley(self):
+        """Parser de Earley sobre la gramática original (se crea al usarlo)"""
+        if self._earley is None:
+            if self.original_grammar is None:
+                raise ValueError(
+                    "El motor Earley necesita original_grammar en CYKParser"
+                )
+            self._earley = EarleyParser(self.original_grammar)
+        return self._earley
+    
+    def _parse_earley(self, sentence):
+        """Parsea con el motor Earley manteniendo el contrato de parse()"""
+        accepted, time_taken, _ = self.earley.parse(sentence)
+        
+        self.last_engine = ENGINE_EARLEY
+        self.table = None
+        self.backpointers = None
+        self.cache_entry = None
+        self.timed_out = False
+        
+        stats = None
+        if self.collect_stats:
+            stats = ParseStats()
+            stats.parses = 1
+            stats.accepted = int(accepted)
+            stats.words = len(self.earley.words)
+            stats.add_time('earley', int(time_taken * 1e9))
+            stats.engines = {ENGINE_EARLEY: 1}
+        self.last_stats = stats
+        
+        return accepted, time_taken, None
+    
+    def apply_delta(self, added, removed, previous_version):
+        """
+        Actualiza las tablas del parser tras un cambio incremental de la
+        gramática (ver GrammarUpdater), sin recompilarlas
+        
+        Args:
+            added, removed: reglas CNF agregadas y eliminadas
+            previous_version: versión de la gramática antes del cambio
+        """
+        compiled = self._compiled
+        if (compiled is not None and compiled.grammar is self.grammar
+                and compiled.version == previous_version):
+            compiled.apply_delta(added, removed, self.grammar.version)
+        
+        # Los kernels indexan las reglas binarias: se recrean al usarlos
+        if any(isinstance(prod, tuple) for _, prod in list(added) + list(removed)):
+            self._kernel = None
+            self._codegen = None
+            self.close()
+    
+    def get_compiled_grammar(self):
+        """
+        Tablas de búsqueda de la gramática (se recompilan si la gramática cambia)
+        
+        Returns:
+            CompiledGrammar
+        """
+        if self._compiled is None or not self._compiled.is_current():
+            self._compiled = CompiledGrammar(self.grammar)
+        return self._compiled
+    
+    def _run(self, words, ids, start_time, stats, engine=ENGINE_CYK):
+        """
+        Ejecuta el CYK sobre una oración ya tokenizada
+        
+        Args:
+            words: lista de palabras normalizadas
+            ids: IDs de terminales de las palabras, o None para buscarlas
+            start_time: instante de inicio (perf_counter)
+            stats: ParseStats o None
+            engine: ENGINE_CYK, ENGINE_BITSET, ENGINE_CLASSIC o ENGINE_CODEGEN
+        """
+        deadline = None
+        if self.time_budget is not None:
+            deadline = start_time + self.time_budget
+        self.timed_out = False
+        self.last_engine = ENGINE_CYK
         
         n = len(words)
+        rule_hits = 0
+        
+        # Palabras intercambiables (mismas variables) comparten clase léxica:
+        # la tabla solo depende de la secuencia de clases
+        compiled = self.get_compiled_grammar()
+        if ids is None:
+            ids = compiled.encode(words)
+        class_ids = compiled.class_ids(ids)
+        classes = compiled.classes
         
-        # Inicializar tabla CYK
-        # table[i][j] contiene el conjunto de variables que pueden
-        # derivar la subcadena desde posición i con longitud j+1
-        self.table = [[set() for _ in range(n)] for _ in range(n)]
+        unknown_words = self.unknown_words
+        if unknown_words is not None and UNKNOWN_ID in class_ids:
+            # Las candidatas son clases adicionales del modelo
+            classes = unknown_words.prepare(compiled)
+            for i, class_id in enumerate(class_ids):
+                if class_id == UNKNOWN_ID and words[i] is not None:
+                    class_ids[i] = unknown_words.classify(words[i])
         
-        # Inicializar backpointers para construcción del árbol
-        # backpointers[i][j] = {variable: (regla, split_point)}
-        self.backpointers = [[{} for _ in range(n)] for _ in range(n)]
+        if self.cache is not None:
+            # El hash del contenido (no la versión, que es un contador por
+            # objeto) separa las gramáticas que comparten la caché; la
+            # numeración de las clases puede variar entre tablas
+            fingerprint = (self.grammar.fingerprint(), compiled.class_layout())
+            key = (fingerprint, tuple(class_ids))
+            self.cache.check_version(fingerprint, self.grammar)
+            entry = self.cache.get(key)
+            
+            if entry is not None:
+                return self._cached_result(entry, start_time, stats)
+        
+        if stats is not None:
+            stats.start_phase('lexical')
+        
+        # Inicializar tabla CYK triangular
+        # chart.cell(i, length) contiene el conjunto de variables que pueden
+        # derivar la subcadena desde posición i con esa longitud
+        if self.chart_pool is not None:
+            chart = self.chart_pool.acquire(n)
+        else:
+            chart = CYKChart(n)
+        cells = chart.cells
+        backs = chart.backs
         
         # PASO 1: Llenar la diagonal (palabras individuales)
-        # Para cada palabra, encontrar qué variables la producen
+        # Las variables de cada palabra son las de su clase léxica
         for i, word in enumerate(words):
-            for variable, productions in self.grammar.productions.items():
-                for prod in productions:
-                    # Buscar producciones A → word
-                    if prod == word:
-                        self.table[i][0].add(variable)
-                        self.backpointers[i][0][variable] = (word, None)
+            if class_ids[i] == UNKNOWN_ID:
+                continue
+            
+            for variable in classes[class_ids[i]]:
+                chart.add(i, 1, variable, (word, None))
+                rule_hits += 1
+        
+        max_spans, scores = self._prepare_pruning()
+        beam_size = self.beam_size
+        pruned = 0
+        
+        if beam_size is not None:
+            for i in range(n):
+                if cells[i] is not None:
+                    pruned += apply_beam(cells[i], backs[i], beam_size, scores)
+        
+        if stats is not None:
+            stats.start_phase('binary')
+        
+        kernel = self._select_kernel(n, engine, max_spans)
+        if kernel is not None:
+            if kernel is self._wavefront:
+                self.last_engine = ENGINE_WAVEFRONT
+            elif kernel is self._codegen:
+                self.last_engine = ENGINE_CODEGEN
+            else:
+                self.last_engine = ENGINE_BITSET
+            rule_hits_binary, rule_checks, timed_out = kernel.fill(
+                chart, deadline, time.perf_counter
+            )
+        else:
+            rule_hits_binary, rule_checks, pruned_binary, timed_out = self._fill_binary(
+                chart, n, deadline, max_spans, beam_size, scores
+            )
+            pruned += pruned_binary
+        rule_hits += rule_hits_binary
+        
+        self.timed_out = timed_out
+        self.table = chart
+        self.backpointers = chart.backpointer_rows()
+        
+        # Verificar si el símbolo inicial está en la celda final
+        accepted = not timed_out and self.grammar.start_symbol in chart.cell(0, n)
+        
+        end_time = time.perf_counter()
+        time_taken = end_time - start_time
+        
+        if stats is not None:
+            stats.end_phase()
+            self._record_counters(stats, n, accepted, rule_hits, rule_checks)
+            stats.pruned = pruned
+            stats.timeouts = int(timed_out)
+            stats.engines = {self.last_engine: 1}
+        self.last_stats = stats
+        
+        if self.cache is not None and not timed_out:
+            # Con pool, la tabla se reutiliza: la caché necesita su propia copia
+            if self.chart_pool is not None and self.cache.store == STORE_TREE:
+                chart = chart.copy()
+            self.cache_entry = CacheEntry(
+                tuple(words), accepted, chart, chart.backpointer_rows()
+            )
+            self.cache.put(key, self.cache_entry)
+        
+        return accepted, time_taken, self.table
+    
+    def _select_kernel(self, n, engine, max_spans):
+        """
+        Decide si el llenado binario usa el kernel de bits o el generado
+        
+        Las oraciones de al menos parallel_min_length palabras se reparten
+        entre procesos si parallel_workers > 1. El kernel no aplica max_span ni beam, así que con esas opciones
+        se usa siempre el bucle clásico (o error si se forzó ENGINE_BITSET).
+        ENGINE_CLASSIC usa el bucle clásico a cualquier longitud y
+        ENGINE_CODEGEN el kernel generado; con codegen=True el kernel
+        generado reemplaza al bucle clásico donde éste se usaría.
+        
+        Returns:
+            BitsetKernel, WavefrontFiller, CodegenKernel o None para el
+            bucle clásico
+        """
+        pruning = bool(max_spans) or self.beam_size is not None
+        
+        if engine == ENGINE_CLASSIC:
+            return None
+        if engine == ENGINE_CODEGEN:
+            if pruning:
+                raise ValueError("El motor codegen no admite max_span ni beam_size")
+            return self._codegen_kernel()
+        
+        if (not pruning and self.parallel_workers and self.parallel_workers > 1
+                and n >= self.parallel_min_length and WavefrontFiller.available()):
+            if self._wavefront is None or not self._wavefront.is_current():
+                self.close()
+                self._wavefront = WavefrontFiller(
+                    self.get_compiled_grammar(), self.parallel_workers
+                )
+            return self._wavefront
+        
+        if engine == ENGINE_BITSET:
+            if pruning:
+                raise ValueError("El motor bitset no admite max_span ni beam_size")
+        elif (pruning or self.bitset_min_length is None
+              or n < self.bitset_min_length):
+            if self.codegen and not pruning:
+                return self._codegen_kernel()
+            return None
+        
+        if self._kernel is None or not self._kernel.is_current():
+            self._kernel = BitsetKernel(self.get_compiled_grammar())
+        return self._kernel
+    
+    def _codegen_kernel(self):
+        """CodegenKernel de la gramática actual (se genera o carga al usarlo)"""
+        if self._codegen is None or not self._codegen.is_current():
+            self._codegen = CodegenKernel(self.get_compiled_grammar())
+        return self._codegen
+    
+    def close(self):
+        """Termina los procesos del modo paralelo (si se crearon)"""
+        if self._wavefront is not None:
+            self._wavefront.close()
+            self._wavefront = None
+    
+    def _fill_binary(self, chart, n, deadline, max_spans, beam_size, scores):
+        """
+        Llena las celdas de longitud >= 2 recorriendo todos los puntos de división
+        
+        Returns:
+            tuple (rule_hits, rule_checks, pruned, timed_out)
+        """
+        cells = chart.cells
+        backs = chart.backs
+        offsets = chart.offsets
+        
+        # Solo nos interesan producciones binarias A → B C
+        binary_rules = self.get_compiled_grammar().binary_rules
+        rule_hits = 0
+        rule_checks = 0
+        pruned = 0
+        timed_out = False
         
         # PASO 2: Llenar el resto de la tabla (programación dinámica)
         # length: longitud de la subcadena (2, 3, ..., n)
         for length in range(2, n + 1):
+            row_offset = offsets[length]
+            
+            # Descartar variables que no pueden derivar subcadenas tan largas
+            if max_spans:
+                binary_rules = [
+                    rule for rule in binary_rules
+                    if max_spans.get(rule[0], length) >= length
+                ]
+            
             # i: posición inicial de la subcadena
             for i in range(n - length + 1):
-                # j: índice en la tabla (length - 1)
-                j = length - 1
+                if deadline is not None and time.perf_counter() > deadline:
+                    timed_out = True
+                    break
+                
+                cell = None
+                cell_backs = None
                 
                 # k: punto de división de la subcadena
                 # Probamos todas las formas de dividir la subcadena
                 for k in range(length - 1):
-                    # Subcadena izquierda: table[i][k]
-                    # Subcadena derecha: table[i+k+1][j-k-1]
-                    
-                    left_vars = self.table[i][k]
-                    right_vars = self.table[i + k + 1][j - k - 1]
+                    # Subcadena izquierda: (i, k + 1)
+                    # Subcadena derecha: (i + k + 1, length - k - 1)
+                    left_vars = cells[offsets[k + 1] + i]
+                    if left_vars is None:
+                        continue
+                    right_vars = cells[offsets[length - k - 1] + i + k + 1]
+                    if right_vars is None:
+                        continue
+                    rule_checks += len(binary_rules)
                     
                     # Buscar reglas A → B C donde B está en left y C en right
-                    for variable, productions in self.grammar.productions.items():
-                        for prod in productions:
-                            # Solo nos interesan producciones binarias A → B C
-                            if isinstance(prod, tuple) and len(prod) == 2:
-                                left_sym, right_sym = prod
-                                
-                                if left_sym in left_vars and right_sym in right_vars:
-                                    self.table[i][j].add(variable)
-                                    # Guardar backpointer
-                                    self.backpointers[i][j][variable] = (
-                                        (left_sym, right_sym),
-                                        k
-                                    )
+                    for variable, left_sym, right_sym in binary_rules:
+                        if left_sym in left_vars and right_sym in right_vars:
+                            if cell is None:
+                                # La celda se crea solo si recibe una variable
+                                cell = chart.new_cell(row_offset + i)
+                                cell_backs = backs[row_offset + i]
+                            cell.add(variable)
+                            # Guardar backpointer
+                            cell_backs[variable] = ((left_sym, right_sym), k)
+                            rule_hits += 1
+                
+                if beam_size is not None and cell is not None:
+                    pruned += apply_beam(cell, cell_backs, beam_size, scores)
+            
+            if timed_out:
+                break
         
-        # Verificar si el símbolo inicial está en la celda final
-        accepted = self.grammar.start_symbol in self.table[0][n - 1]
+        return rule_hits, rule_checks, pruned, timed_out
+    
+    def _cached_result(self, entry, start_time, stats):
+        """
+        Devuelve el resultado de una oración encontrada en la caché
         
-        end_time = time.time()
-        time_taken = end_time - start_time
+        Si la caché solo guarda el resultado, la tabla queda en None. El
+        motor registrado es ENGINE_CACHE.
+        """
+        self.last_engine = ENGINE_CACHE
+        self.table = entry.table
+        self.backpointers = entry.backpointers
+        self.cache_entry = entry
         
-        return accepted, time_taken, self.table
+        time_taken = time.perf_counter() - start_time
+        
+        if stats is not None:
+            stats.end_phase()
+            stats.parses = 1
+            stats.accepted = int(entry.accepted)
+            stats.words = len(entry.words)
+            stats.cache_hits = 1
+            stats.engines = {ENGINE_CACHE: 1}
+        self.last_stats = stats
+        
+        return entry.accepted, time_taken, self.table
+    
+    def _prepare_pruning(self):
+        """
+        Calcula (o reutiliza) los límites de longitud y puntajes para la poda
+        
+        Se recalculan solo si la gramática cambió de versión.
+        
+        Returns:
+            tuple (max_spans, scores); max_spans es None si no hay límite
+        """
+        if self._pruning_version == self.grammar.version:
+            return self._max_spans, self._scores
+        
+        max_spans = None
+        if self.max_span is not None:
+            max_spans = compute_max_spans(self.grammar)
+            if isinstance(self.max_span, dict):
+                max_spans.update(self.max_span)
+        
+        scores = self.symbol_scores
+        if scores is None and self.beam_size is not None:
+            scores = default_symbol_scores(self.grammar)
+        
+        self._max_spans = max_spans
+        self._scores = scores
+        self._pruning_version = self.grammar.version
+        return max_spans, scores
+    
+    def _record_counters(self, stats, n, accepted, rule_hits, rule_checks):
+        """
+        Completa los contadores de una ejecución (fuera de la zona medida)
+        
+        En el llenado léxico cada palabra es una búsqueda en el léxico;
+        rule_checks trae las reglas binarias revisadas en los puntos de
+        división con ambas celdas no vacías.
+        """
+        stats.parses = 1
+        stats.accepted = int(accepted)
+        stats.words = n
+        stats.cells_filled = self.table.filled_cells()
+        stats.rule_checks = n + rule_checks
+        stats.rule_hits = rule_hits
+        stats.chart_bytes = self.table.memory_bytes()
+    
+    def _require_table(self):
+        """
+        Verifica que el último parse() dejó una tabla CYK
+        
+        No hay tabla después del motor Earley ni de un acierto en una caché
+        STORE_ACCEPT.
+        """
+        if self.table is None:
+            raise ValueError(
+                "No hay tabla CYK del último parse() (motor Earley o caché "
+                "STORE_ACCEPT); vuelve a parsear con engine='cyk' sin esa caché"
+            )
+    
+    def display_cell(self, i, length, words):
+        """
+        Celda de la tabla para mostrarla
+        
+        La diagonal solo contiene las variables de la clase léxica de cada
+        palabra; se agregan las T_a omitidas (CompiledGrammar.hidden) para
+        que se vea el conjunto completo de variables del terminal.
+        
+        Args:
+            i: posición inicial
+            length: longitud de la subcadena
+            words: palabras de la oración del último parse()
+        
+        Returns:
+            conjunto de variables (vacío o None si la celda no tiene ninguna)
+        """
+        cell = self.table.cell(i, length)
+        if length != 1 or not cell:
+            return cell
+        compiled = self.get_compiled_grammar()
+        idx = compiled.terminal_id(words[i])
+        if idx == UNKNOWN_ID or not compiled.hidden[idx]:
+            return cell
+        return set(cell).union(compiled.hidden[idx])
+    
+    def extract_chunks(self, words, labels=None):
+        """
+        Análisis parcial: cubre la oración con constituyentes maximales
+        
+        Usa la tabla del último parse() (no vuelve a parsear), así que sirve
+        para oraciones rechazadas o abortadas por tiempo.
+        
+        Args:
+            words: lista de palabras de la oración
+            labels: variables permitidas en orden de preferencia (por defecto
+                    el símbolo inicial y las variables no creadas por la CNF)
+            
+        Returns:
+            lista de Chunk de izquierda a derecha
+        
+        Raises:
+            ValueError: si el último parse() no dejó tabla (motor Earley o
+                        caché STORE_ACCEPT)
+        """
+        self._require_table()
+        if labels is None:
+            labels = default_labels(self.grammar)
+        return extract_chunks(self.table, words, labels)
+    
+    def write_table_rows(self, words, writer):
+        """
+        Escribe las filas de la tabla CYK, de la más larga a la diagonal
+        
+        Cada fila es "Longitud k: {A,B} {∅} ..." con las celdas de
+        display_cell (también la usa el informe técnico).
+        
+        Args:
+            words: lista de palabras de la oración
+            writer: objeto con write() (archivo, StringIO, sys.stdout)
+        
+        Raises:
+            ValueError: si el último parse() no dejó tabla
+        """
+        self._require_table()
+        n = len(words)
+        for j in range(n - 1, -1, -1):
+            writer.write(f"Longitud {j+1}: ")
+            for i in range(n - j):
+                cell = self.display_cell(i, j + 1, words)
+                if cell:
+                    writer.write(f"{{{','.join(sorted(cell))}}} ")
+                else:
+                    writer.write("{∅} ")
+            writer.write("\n")
     
     def print_table(self, words):
         """
@@ -109,7 +725,11 @@ class CYKParser:
         
         Args:
             words: lista de palabras de la oración
+        
+        Raises:
+            ValueError: si el último parse() no dejó tabla
         """
+        self._require_table()
         n = len(words)
         
         print("\n" + "="*60)
@@ -120,15 +740,7 @@ class CYKParser:
         print()
         
         # Imprimir tabla
-        for j in range(n - 1, -1, -1):
-            print(f"Longitud {j+1}:", end=" ")
-            for i in range(n - j):
-                cell = self.table[i][j]
-                if cell:
-                    print(f"{{{','.join(sorted(cell))}}}", end=" ")
-                else:
-                    print("{∅}", end=" ")
-            print()
+        self.write_table_rows(words, sys.stdout)
         
         print("\n" + "="*60)
     
@@ -141,7 +753,11 @@ class CYKParser:
             
         Returns:
             string con la explicación
+        
+        Raises:
+            ValueError: si el último parse() no dejó tabla
         """
+        self._require_table()
         n = len(words)
         explanation = []
         
@@ -150,7 +766,7 @@ class CYKParser:
         # Paso 1: palabras individuales
         explanation.append("Paso 1: Palabras individuales")
         for i, word in enumerate(words):
-            vars_found = self.table[i][0]
+            vars_found = self.display_cell(i, 1, words)
             if vars_found:
                 explanation.append(f"  '{word}' puede ser: {', '.join(sorted(vars_found))}")
         
@@ -159,20 +775,20 @@ class CYKParser:
             explanation.append(f"\nPaso {length}: Subcadenas de longitud {length}")
             
             for i in range(n - length + 1):
-                j = length - 1
                 subcadena = " ".join(words[i:i+length])
-                vars_found = self.table[i][j]
+                vars_found = self.display_cell(i, length, words)
                 
                 if vars_found:
                     explanation.append(f"  '{subcadena}' puede ser: {', '.join(sorted(vars_found))}")
         
         # Resultado final
         explanation.append("\n=== RESULTADO ===")
-        if self.grammar.start_symbol in self.table[0][n-1]:
+        final_cell = self.display_cell(0, n, words)
+        if self.grammar.start_symbol in final_cell:
             explanation.append(f"✓ La oración ES ACEPTADA (contiene '{self.grammar.start_symbol}')")
         else:
             explanation.append(f"✗ La oración NO es aceptada (no contiene '{self.grammar.start_symbol}')")
-            explanation.append(f"  Celda final contiene: {self.table[0][n-1] if self.table[0][n-1] else '∅'}")
+            explanation.append(f"  Celda final contiene: {set(final_cell) if final_cell else '∅'}")
         
         return "\n".join(explanation)
 
@@ -202,10 +818,10 @@ if __name__ == "__main__":
         print(f"Probando: '{sentence}'")
         print('='*60)
         
-        accepted, time_taken, _ = parser.parse(sentence)
+        words = parser.tokenizer.tokenize(sentence)
+        accepted, time_taken, _ = parser.parse(words)
         
         print(f"Resultado: {'ACEPTADA' if accepted else 'RECHAZADA'}")
         print(f"Tiempo: {time_taken*1000:.2f} ms")
         
-        words = sentence.split()
         parser.print_table(words)
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Parser de Earley sobre la gramática original (sin convertir a CNF)
+
+Alternativa al CYK para gramáticas poco ambiguas: trabaja directamente
+con las producciones originales (incluyendo unitarias y largas), por lo
+que no infla la gramática ni requiere deshacer la binarización del árbol.
+En muchas entradas su costo es casi lineal.
+
+Cada ítem es (regla, punto, origen): la regla rules[regla] = (A, símbolos)
+reconoció symbols[:punto] desde la posición origen.
+"""
+
+import time
+
+from .parse_tree import ParseTreeNode
+from .tokenizer import DEFAULT_TOKENIZER
+
+
+class EarleyParser:
+    """
+    Reconocedor y parser de Earley con el mismo contrato de resultado
+    que CYKParser.parse: (accepted, time_taken, table)
+    """
+
+    def __init__(self, grammar):
+        """
+        Args:
+            grammar: gramática original (sin producciones epsilon)
+        """
+        self.grammar = grammar
+        self.table = None
+        self.words = None
+        self._version = None
+        self._compile()
+
+    def _compile(self):
+        """Prepara las reglas como tuplas de símbolos, indexadas por variable"""
+        self.rules = []
+        self.rules_by_lhs = {}
+
+        for var, productions in self.grammar.productions.items():
+            ids = self.rules_by_lhs.setdefault(var, [])
+            for prod in productions:
+                symbols = prod if isinstance(prod, tuple) else (prod,)
+                ids.append(len(self.rules))
+                self.rules.append((var, symbols))
+
+        self._version = self.grammar.version
+
+    def parse(self, sentence):
+        """
+        Verifica si una oración pertenece al lenguaje
+
+        Args:
+            sentence: string, lista de palabras o TokenList (se usa tal cual)
+
+        Returns:
+            tuple (accepted, time_taken, table)
+            - table: lista de conjuntos de Earley; table[i] es un dict
+                     {ítem: backpointer} de los ítems que terminan en i
+        """
+        start_time = time.perf_counter()
+
+        if self._version != self.grammar.version:
+            self._compile()
+
+        words = DEFAULT_TOKENIZER.tokenize(sentence)
+
+        n = len(words)
+        rules = self.rules
+        rules_by_lhs = self.rules_by_lhs
+
+        # chart[i]: {(regla, punto, origen): backpointer}
+        # waiting[i]: {símbolo: [ítems de chart[i] cuyo siguiente símbolo es ése]}
+        chart = [{} for _ in range(n + 1)]
+        waiting = [{} for _ in range(n + 1)]
+
+        def add(i, item, backpointer, agenda):
+            if item not in chart[i]:
+                chart[i][item] = backpointer
+                agenda.append(item)
+
+        start = self.grammar.start_symbol
+        agenda = []
+        for rule_id in rules_by_lhs.get(start, []):
+            add(0, (rule_id, 0, 0), None, agenda)
+
+        for i in range(n + 1):
+            if i > 0:
+                agenda = list(chart[i])
+            predicted = set()
+            word = words[i] if i < n else None
+
+            while agenda:
+                item = agenda.pop()
+                rule_id, dot, origin = item
+                lhs, symbols = rules[rule_id]
+
+                if dot == len(symbols):
+                    # COMPLETAR: avanzar los ítems que esperaban a lhs
+                    for parent in waiting[origin].get(lhs, ()):
+                        p_rule, p_dot, p_origin = parent
+                        add(i, (p_rule, p_dot + 1, p_origin),
+                            (parent, origin, item), agenda)
+                    continue
+
+                symbol = symbols[dot]
+                if symbol in rules_by_lhs:
+                    # Sin producciones epsilon, lo que complete a symbol
+                    # terminará después de i, así que basta con registrar
+                    # el ítem como pendiente
+                    waiting[i].setdefault(symbol, []).append(item)
+
+                    # PREDECIR una sola vez por símbolo y posición
+                    if symbol not in predicted:
+                        predicted.add(symbol)
+                        for child_rule in rules_by_lhs[symbol]:
+                            add(i, (child_rule, 0, i), None, agenda)
+                elif symbol == word:
+                    # ESCANEAR: el terminal coincide con la palabra actual
+                    next_item = (rule_id, dot + 1, origin)
+                    if next_item not in chart[i + 1]:
+                        chart[i + 1][next_item] = (item, i, word)
+
+        self.table = chart
+        self.words = words
+
+        accepted = n > 0 and any(
+            (rule_id, len(rules[rule_id][1]), 0) in chart[n]
+            for rule_id in rules_by_lhs.get(start, [])
+        )
+
+        time_taken = time.perf_counter() - start_time
+        return accepted, time_taken, chart
+
+    def build_tree(self, words=None):
+        """
+        Construye el árbol de la última oración parseada
+
+        Args:
+            words: palabras de la oración (por defecto las del último parse)
+
+        Returns:
+            ParseTreeNode raíz del árbol, o None si no se aceptó
+        """
+        words = words if words is not None else self.words
+        n = len(self.words)
+        if n == 0:
+            return None
+
+        for rule_id in self.rules_by_lhs.get(self.grammar.start_symbol, []):
+            item = (rule_id, len(self.rules[rule_id][1]), 0)
+            if item in self.table[n]:
+                return self._build_item(item, n, words)
+        return None
+
+    def _build_item(self, item, end, words):
+        """
+        Construye el nodo de un ítem completo que termina en end
+
+        Recorre los backpointers desde el final de la regla hasta el
+        inicio, recolectando un hijo por cada símbolo reconocido.
+        """
+        lhs = self.rules[item[0]][0]
+        children = []
+
+        while item[1] > 0:
+            backpointer = self.table[end][item]
+            previous, position, child = backpointer
+
+            if isinstance(child, tuple):
+                # Hijo variable: ítem completo que termina en end
+                children.append(self._build_item(child, end, words))
+            else:
+                # Hijo terminal: la palabra en la posición escaneada
+                children.append(ParseTreeNode(words[position]))
+
+            item = previous
+            end = position
+
+        children.reverse()
+        return ParseTreeNode(lhs, children)
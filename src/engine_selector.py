@@ -0,0 +1,297 @@
+"""
+Selección adaptativa del motor de parsing por oración
+
+Cada motor gana en un régimen distinto: el bucle clásico (o el kernel
+generado para la gramática) en oraciones cortas, el kernel de bits en
+las largas y Earley cuando la gramática es poco ambigua (su costo es
+casi lineal). Por defecto solo compiten los motores que dan la misma
+tabla y el mismo árbol; Earley se agrega con
+CYKParser(..., auto_engines=(..., ENGINE_EARLEY)). Los cruces dependen
+de la gramática y de la máquina, así que en lugar de umbrales fijos
+EngineSelector los calibra una vez:
+genera oraciones de varias longitudes con la propia gramática, las
+parsea con cada motor elegible y guarda, por tramo de longitud, el más
+rápido.
+
+La calibración se guarda en CALIBRATION_FILE (JSON) con una llave que
+combina el hash de las gramáticas, los motores elegibles y la máquina
+(nodo, arquitectura y versión de Python); las ejecuciones siguientes la
+reutilizan sin volver a medir. Un cambio de gramática invalida la llave.
+
+Uso:
+    parser = CYKParser(cnf, original_grammar=grammar, engine=ENGINE_AUTO)
+    parser.parse("she eats a cake")
+    parser.last_engine             # motor elegido para esa oración
+
+    python -m src.engine_selector [--recalibrate]
+"""
+
+import bisect
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+
+# Archivo local con las calibraciones (una por gramática y máquina)
+CALIBRATION_FILE = '.engine_calibration.json'
+CALIBRATION_FORMAT = 1
+
+# Longitudes medidas, oraciones por longitud y repeticiones (se toma la mejor)
+CALIBRATION_LENGTHS = (2, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+CALIBRATION_SENTENCES = 3
+CALIBRATION_REPEATS = 3
+
+# Un motor reemplaza al del tramo anterior solo si éste es más de un
+# SWITCH_MARGIN más lento que el mejor (evita tramos por ruido)
+SWITCH_MARGIN = 0.10
+
+
+def machine_key():
+    """Identificador de la máquina y el intérprete para la calibración"""
+    return "/".join((
+        platform.node(), platform.machine(),
+        platform.python_implementation(), platform.python_version(),
+    ))
+
+
+class EngineSelector:
+    """
+    Elige el motor de cada oración según su longitud
+
+    Atributos:
+        engines: motores elegibles para el parser
+        thresholds: lista de (longitud mínima, motor) ordenada; una
+                    oración usa el último tramo cuya longitud mínima no
+                    supera la suya
+        timings: {longitud: {motor: µs por oración}} de la calibración
+        calibrated: False si se usan los umbrales por defecto (no hubo
+                    con qué generar oraciones de prueba)
+    """
+
+    def __init__(self, parser, path=CALIBRATION_FILE, lengths=CALIBRATION_LENGTHS,
+                 sentences=CALIBRATION_SENTENCES, repeats=CALIBRATION_REPEATS):
+        """
+        Args:
+            parser: CYKParser a cuyo motor se aplica la selección
+            path: archivo JSON de calibraciones (None = no persistir)
+            lengths: longitudes a medir en la calibración
+            sentences: oraciones por longitud
+            repeats: repeticiones por medición (se toma la mejor)
+        """
+        self.parser = parser
+        self.path = path
+        self.lengths = tuple(lengths)
+        self.sentences = sentences
+        self.repeats = repeats
+        self.engines = ()
+        self.thresholds = []
+        self.timings = {}
+        self.calibrated = False
+        self._starts = []
+        self._engines = []
+        self._version = None
+
+    def eligible_engines(self):
+        """
+        Motores de parser.auto_engines aplicables con las opciones del parser
+
+        El bucle clásico siempre es elegible. Los kernels de bits y
+        generado no aplican max_span ni beam_size; Earley (solo si está en
+        auto_engines) necesita la gramática original y no usa la caché, el
+        modelo de palabras desconocidas ni el presupuesto de tiempo.
+        """
+        # Importación local: cyk_algorithm importa este módulo
+        from .cyk_algorithm import (
+            ENGINE_BITSET, ENGINE_CLASSIC, ENGINE_CODEGEN, ENGINE_EARLEY
+        )
+
+        parser = self.parser
+        requested = set(parser.auto_engines)
+        engines = [ENGINE_CLASSIC]
+        if parser.max_span is None and parser.beam_size is None:
+            engines.extend(e for e in (ENGINE_CODEGEN, ENGINE_BITSET) if e in requested)
+        if (ENGINE_EARLEY in requested and parser.original_grammar is not None
+                and parser.cache is None and parser.unknown_words is None
+                and parser.time_budget is None):
+            engines.append(ENGINE_EARLEY)
+        return tuple(engines)
+
+    def select(self, n):
+        """
+        Motor para una oración de n palabras
+
+        La primera llamada (y la primera tras un cambio de gramática)
+        carga o calcula la calibración.
+        """
+        if self._version != self.parser.grammar.version:
+            self.prepare()
+        return self._engines[bisect.bisect_right(self._starts, n) - 1]
+
+    def prepare(self, recalibrate=False):
+        """
+        Carga la calibración guardada o la calcula (y la guarda)
+
+        Args:
+            recalibrate: medir aunque exista una calibración guardada
+
+        Returns:
+            self
+        """
+        self.engines = self.eligible_engines()
+        key = self._calibration_key()
+        stored = self._load().get(key) if key is not None and not recalibrate else None
+
+        if stored is not None:
+            self.thresholds = [tuple(entry) for entry in stored['thresholds']]
+            self.timings = {int(n): row for n, row in stored['timings'].items()}
+            self.calibrated = True
+        else:
+            self.calibrate()
+            if key is not None and self.calibrated:
+                self._save(key)
+
+        self._starts = [start for start, _ in self.thresholds]
+        self._engines = [engine for _, engine in self.thresholds]
+        self._version = self.parser.grammar.version
+        return self
+
+    def calibrate(self):
+        """
+        Mide cada motor elegible por longitud y deriva los tramos
+
+        Sin gramática para generar oraciones (tablas compartidas sin
+        Grammar) se usan los umbrales por defecto del parser: bucle
+        clásico hasta bitset_min_length y kernel de bits desde ahí.
+        """
+        from .cyk_algorithm import CYKParser, ENGINE_BITSET, ENGINE_CLASSIC
+
+        parser = self.parser
+        source = parser.original_grammar or parser.grammar
+        if not hasattr(source, 'sentence_generator'):
+            self.thresholds = [(0, ENGINE_CLASSIC)]
+            if ENGINE_BITSET in self.engines and parser.bitset_min_length is not None:
+                self.thresholds.append((parser.bitset_min_length, ENGINE_BITSET))
+            self.timings = {}
+            self.calibrated = False
+            return
+
+        # Parser aparte: sin caché, tabla reutilizada ni estadísticas
+        probe = CYKParser(parser.grammar, original_grammar=parser.original_grammar,
+                          tokenizer=parser.tokenizer)
+        generator = source.sentence_generator(max_length=max(self.lengths), seed=0)
+
+        self.timings = {}
+        for length in self.lengths:
+            try:
+                sample = [probe.tokenizer.tokenize(generator.generate(length))
+                          for _ in range(self.sentences)]
+            except ValueError:
+                continue
+
+            row = {}
+            for engine in self.engines:
+                best = None
+                for _ in range(self.repeats):
+                    start = time.perf_counter()
+                    for words in sample:
+                        probe.parse(words, engine=engine)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                row[engine] = round(best / len(sample) * 1e6, 2)
+            self.timings[length] = row
+        probe.close()
+
+        # Tramos: se cambia de motor cuando el actual queda fuera del
+        # margen; entre los que están dentro gana el primero de engines
+        self.thresholds = []
+        for length, row in sorted(self.timings.items()):
+            limit = min(row.values()) * (1 + SWITCH_MARGIN)
+            if self.thresholds and row[self.thresholds[-1][1]] <= limit:
+                continue
+            engine = next(e for e in self.engines if row[e] <= limit)
+            self.thresholds.append((length if self.thresholds else 0, engine))
+        if not self.thresholds:
+            self.thresholds = [(0, ENGINE_CLASSIC)]
+        self.calibrated = True
+
+    def _calibration_key(self):
+        """Llave de la calibración (None si la gramática no tiene fingerprint)"""
+        parser = self.parser
+        if not hasattr(parser.grammar, 'fingerprint'):
+            return None
+        original = parser.original_grammar
+        return ":".join((
+            parser.grammar.fingerprint(),
+            original.fingerprint() if original is not None else "-",
+            ",".join(self.engines),
+            machine_key(),
+        ))
+
+    def _load(self):
+        """Calibraciones guardadas {llave: calibración} ({} si no hay archivo válido)"""
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('format') != CALIBRATION_FORMAT:
+            return {}
+        return data.get('calibrations', {})
+
+    def _save(self, key):
+        """Agrega la calibración actual al archivo (reemplazo atómico)"""
+        if self.path is None:
+            return
+        calibrations = self._load()
+        calibrations[key] = {
+            'thresholds': [list(entry) for entry in self.thresholds],
+            'timings': {str(n): row for n, row in self.timings.items()},
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        temporary = self.path + '.tmp'
+        try:
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump({'format': CALIBRATION_FORMAT, 'calibrations': calibrations},
+                          f, indent=2)
+            os.replace(temporary, self.path)
+        except OSError:
+            # Sin permiso de escritura la calibración sigue sirviendo en memoria
+            pass
+
+    def __str__(self):
+        lines = [f"Motores elegibles: {', '.join(self.engines)}"]
+        if self.timings:
+            lines.append(f"{'longitud':>9} " + " ".join(f"{e:>10}" for e in self.engines)
+                         + "   (µs por oración)")
+            for length, row in sorted(self.timings.items()):
+                lines.append(f"{length:>9} " + " ".join(f"{row[e]:>10.1f}" for e in self.engines))
+        elif not self.calibrated:
+            lines.append("Sin calibrar (umbrales por defecto)")
+        lines.append("Tramos:")
+        for idx, (start, engine) in enumerate(self.thresholds):
+            end = self.thresholds[idx + 1][0] - 1 if idx + 1 < len(self.thresholds) else None
+            span = f"{start}-{end}" if end is not None else f"{start}+"
+            lines.append(f"  {span:>7} palabras → {engine}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .cnf_converter import CNFConverter
+    from .cyk_algorithm import CYKParser, ENGINE_AUTO
+    from .grammar import create_english_grammar
+
+    arg_parser = argparse.ArgumentParser(description="Calibración del motor automático")
+    arg_parser.add_argument('--recalibrate', action='store_true',
+                            help=f"medir aunque exista una calibración en {CALIBRATION_FILE}")
+    args = arg_parser.parse_args()
+
+    grammar = create_english_grammar()
+    parser = CYKParser(CNFConverter(grammar).convert(), original_grammar=grammar,
+                       engine=ENGINE_AUTO)
+    print(parser.engine_selector.prepare(recalibrate=args.recalibrate))
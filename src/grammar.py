@@ -2,6 +2,10 @@
 Módulo para representar y manejar gramáticas libres de contexto (CFG)
 """
 
+import hashlib
+import json
+
+
 class Grammar:
     """
     Representa una gramática libre de contexto.
@@ -12,6 +16,8 @@ class Grammar:
         productions: diccionario con las reglas de producción
                     {variable: [lista de producciones]}
         start_symbol: símbolo inicial de la gramática (normalmente S)
+        version: contador que aumenta con cada modificación de la gramática
+                 (lo usan las cachés para invalidar resultados)
     """
     
     def __init__(self, variables, terminals, productions, start_symbol='S'):
@@ -28,6 +34,9 @@ class Grammar:
         self.terminals = set(terminals)
         self.productions = productions
         self.start_symbol = start_symbol
+        self.version = 0
+        self._fingerprint = None
+        self._fingerprint_version = None
         
     def add_production(self, variable, production):
         """
@@ -40,7 +49,56 @@ class Grammar:
         if variable not in self.productions:
             self.productions[variable] = []
         self.productions[variable].append(production)
+        self.mark_changed()
+        
+    def remove_production(self, variable, production):
+        """
+        Elimina una regla de producción
+        
+        Args:
+            variable: lado izquierdo de la regla
+            production: lado derecho a eliminar
+            
+        Raises:
+            ValueError: si la regla no existe
+        """
+        if production not in self.productions.get(variable, []):
+            raise ValueError(f"No existe la producción {variable} → {production}")
+        self.productions[variable].remove(production)
+        self.mark_changed()
+        
+    def mark_changed(self):
+        """
+        Registra que la gramática cambió (invalida cachés dependientes)
+        
+        Debe llamarse si se modifica self.productions directamente.
+        """
+        self.version += 1
         
+    def fingerprint(self):
+        """
+        Hash del contenido de la gramática (símbolo inicial, símbolos y
+        producciones en orden)
+        
+        A diferencia de version, no depende de la historia del objeto:
+        dos gramáticas iguales tienen el mismo hash, también entre
+        ejecuciones, así que sirve como llave de cachés en disco.
+        
+        Returns:
+            string hexadecimal de 16 caracteres
+        """
+        if self._fingerprint_version != self.version or self._fingerprint is None:
+            content = json.dumps([
+                self.start_symbol,
+                sorted(self.variables),
+                sorted(self.terminals),
+                [[var, [list(p) if isinstance(p, tuple) else p for p in prods]]
+                 for var, prods in sorted(self.productions.items())],
+            ], ensure_ascii=False)
+            self._fingerprint = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+            self._fingerprint_version = self.version
+        return self._fingerprint
+    
     def get_productions(self, variable):
         """
         Obtiene todas las producciones de una variable
@@ -58,6 +116,21 @@ class Grammar:
         """Verifica si un símbolo es variable"""
         return symbol in self.variables
     
+    def sentence_generator(self, max_length=20, rule_weights=None, seed=None):
+        """
+        Crea un generador de oraciones aleatorias para pruebas de carga
+        
+        Args:
+            max_length: longitud máxima de las oraciones
+            rule_weights: pesos por regla (None = muestreo uniforme)
+            seed: semilla para reproducibilidad
+            
+        Returns:
+            SentenceGenerator sobre esta gramática
+        """
+        from .sentence_generator import SentenceGenerator
+        return SentenceGenerator(self, max_length, rule_weights, seed)
+    
     def __str__(self):
         """Representación en string de la gramática"""
         result = f"Gramática con símbolo inicial: {self.start_symbol}\n"
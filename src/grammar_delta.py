@@ -0,0 +1,176 @@
+"""
+Actualización incremental de una gramática ya convertida a CNF
+
+Agregar una palabra con Grammar.add_production obligaría a volver a
+ejecutar CNFConverter.convert() y recompilar todo. GrammarUpdater aplica
+reglas léxicas (A → palabra) y binarias (A → B C) agregadas o eliminadas
+directamente sobre la gramática original, la CNF y las tablas de los
+parsers, con un costo proporcional al cambio.
+
+La eliminación de unitarias copia las producciones de B a toda variable
+A que alcanza B por unitarias (A → ... → B), así que una regla nueva de B
+se agrega también a esas variables (ver CNFConverter.unit_reach).
+
+Las producciones unitarias y las de más de dos símbolos cambian la
+estructura de la CNF: para ellas hay que volver a convertir la gramática.
+"""
+
+
+class GrammarUpdater:
+    """
+    Aplica cambios de reglas a una gramática CNF sin reconvertirla
+
+    Uso:
+        converter = CNFConverter(grammar)
+        cnf = converter.convert()
+        parser = CYKParser(cnf)
+        updater = GrammarUpdater(converter, cnf, parsers=[parser])
+        updater.apply(added=[('N', 'zebra'), ('V', 'sees')])
+    """
+
+    def __init__(self, converter, cnf_grammar, parsers=()):
+        """
+        Args:
+            converter: CNFConverter que produjo cnf_grammar (ya ejecutado)
+            cnf_grammar: gramática en CNF a actualizar
+            parsers: CYKParser cuyas tablas se actualizan en el lugar
+        """
+        self.original = converter.original_grammar
+        self.cnf = cnf_grammar
+        self.parsers = list(parsers)
+
+        self.reach = {var: set(targets) for var, targets in converter.unit_reach.items()}
+        # inherit[B]: variables que reciben las producciones de B
+        self.inherit = {}
+        for var, targets in self.reach.items():
+            for target in targets:
+                self.inherit.setdefault(target, set()).add(var)
+
+    def add_parser(self, parser):
+        """Registra otro parser cuyas tablas deben seguir los cambios"""
+        self.parsers.append(parser)
+
+    def apply(self, added=(), removed=()):
+        """
+        Aplica un lote de cambios (primero las eliminaciones)
+
+        Args:
+            added: lista de (variable, producción) a agregar
+            removed: lista de (variable, producción) a eliminar; la
+                     producción es un terminal (str) o una tupla de 2 símbolos
+                     en términos de la gramática original
+
+        Returns:
+            tuple (cnf_added, cnf_removed): reglas CNF agregadas y eliminadas
+
+        Raises:
+            ValueError: si un cambio requiere volver a convertir la gramática
+                        o si se elimina una regla que no existe
+        """
+        for var, prod in list(removed) + list(added):
+            self._check(var, prod)
+
+        cnf_added = []
+        cnf_removed = []
+        for var, prod in removed:
+            self._remove(var, prod, cnf_removed)
+        for var, prod in added:
+            self._add(var, prod, cnf_added)
+
+        if cnf_added or cnf_removed:
+            previous_version = self.cnf.version
+            self.cnf.mark_changed()
+            for parser in self.parsers:
+                parser.apply_delta(cnf_added, cnf_removed, previous_version)
+
+        return cnf_added, cnf_removed
+
+    def add_word(self, variable, word):
+        """Agrega una palabra al léxico (atajo de apply)"""
+        return self.apply(added=[(variable, word)])
+
+    def remove_word(self, variable, word):
+        """Elimina una palabra del léxico (atajo de apply)"""
+        return self.apply(removed=[(variable, word)])
+
+    def _check(self, var, prod):
+        """Rechaza los cambios que alteran la estructura de la CNF"""
+        if isinstance(prod, tuple):
+            if len(prod) != 2:
+                raise ValueError(
+                    f"{var} → {' '.join(prod)}: solo se admiten reglas de 2 símbolos; "
+                    "vuelva a convertir la gramática"
+                )
+        elif prod in self.original.variables:
+            raise ValueError(
+                f"{var} → {prod} es unitaria (cambia la clausura); "
+                "vuelva a convertir la gramática"
+            )
+
+    def _register_variable(self, var):
+        if var not in self.original.variables:
+            self.original.variables.add(var)
+            self.cnf.variables.add(var)
+            self.reach[var] = {var}
+            self.inherit.setdefault(var, set()).add(var)
+
+    def _terminal_variable(self, terminal, cnf_added):
+        """Variable T_a de un terminal, creándola como lo hace el conversor"""
+        name = f"T_{terminal}"
+        if terminal not in self.original.terminals:
+            self.original.terminals.add(terminal)
+            self.cnf.terminals.add(terminal)
+        if name not in self.cnf.variables:
+            self.cnf.variables.add(name)
+            self.cnf.productions[name] = [terminal]
+            cnf_added.append((name, terminal))
+        return name
+
+    def _to_cnf(self, prod, cnf_added=None):
+        """Producción original → producción CNF (los terminales pasan a T_a)"""
+        if not isinstance(prod, tuple):
+            if cnf_added is not None and prod not in self.original.terminals:
+                self.original.terminals.add(prod)
+                self.cnf.terminals.add(prod)
+            return prod
+
+        symbols = []
+        for symbol in prod:
+            if symbol in self.original.variables:
+                symbols.append(symbol)
+            elif cnf_added is not None:
+                symbols.append(self._terminal_variable(symbol, cnf_added))
+            else:
+                symbols.append(f"T_{symbol}")
+        return tuple(symbols)
+
+    def _add(self, var, prod, cnf_added):
+        if prod in self.original.productions.get(var, []):
+            return
+
+        # Una variable nueva se define por su lado izquierdo; en el lado
+        # derecho, los símbolos desconocidos se tratan como terminales
+        self._register_variable(var)
+
+        cnf_prod = self._to_cnf(prod, cnf_added)
+        self.original.add_production(var, prod)
+
+        for target in sorted(self.inherit[var]):
+            productions = self.cnf.productions.setdefault(target, [])
+            if cnf_prod not in productions:
+                productions.append(cnf_prod)
+                cnf_added.append((target, cnf_prod))
+
+    def _remove(self, var, prod, cnf_removed):
+        self.original.remove_production(var, prod)
+        cnf_prod = self._to_cnf(prod)
+
+        for target in sorted(self.inherit.get(var, ())):
+            # Sigue derivándose si otra variable alcanzable la tiene
+            if any(prod in self.original.productions.get(source, [])
+                   for source in self.reach[target]):
+                continue
+            productions = self.cnf.productions.get(target, [])
+            if cnf_prod in productions:
+                productions.remove(cnf_prod)
+                cnf_removed.append((target, cnf_prod))
@@ -0,0 +1,301 @@
+"""
+Perfil de costo de una gramática para el parser CYK
+
+Antes de desplegar un cambio de gramática conviene saber si va a hacer
+más lento el parsing. GrammarProfile mide sobre la gramática original y
+su CNF:
+
+- Estructura: reglas binarias por hijo izquierdo (lo que el bucle
+  clásico revisa por cada variable de una celda), fan-in máximo por par
+  (B, C), ambigüedad léxica por palabra, variables anulables y
+  profundidad de las cadenas de producciones unitarias (cada nivel
+  copia producciones al convertir a CNF).
+- Costo: con una muestra de oraciones (por defecto generadas con la
+  propia gramática) se mide la ocupación de cada variable en la tabla y
+  las reglas revisadas por punto de división. Como el CYK tiene
+  (n³ - n) / 6 puntos de división, el costo estimado por palabra de una
+  oración de n palabras es revisiones_por_división × (n² - 1) / 6.
+
+hot_spots() lista lo que más pesa: variables presentes en la mayoría de
+las celdas, hijos izquierdos con muchas reglas, pares con fan-in alto,
+palabras muy ambiguas y cadenas unitarias largas.
+
+Uso:
+    python -m src.grammar_profile
+"""
+
+from .cnf_converter import CNFConverter
+from .compiled_grammar import CompiledGrammar
+
+
+# Umbrales por defecto de hot_spots()
+HOT_OCCUPANCY = 0.3      # fracción de celdas no vacías con la variable
+HOT_LEFT_FACTOR = 2.0    # reglas por hijo izquierdo / promedio
+HOT_FAN_IN = 2           # variables A con la misma regla A → B C
+HOT_AMBIGUITY = 3        # variables por palabra
+HOT_UNIT_DEPTH = 3       # longitud de cadena A → B → C ...
+
+
+def _is_epsilon(production):
+    return production in ('', ())
+
+
+def nullable_variables(grammar):
+    """Variables que derivan la cadena vacía (punto fijo sobre las producciones)"""
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for var, productions in grammar.productions.items():
+            if var in nullable:
+                continue
+            for prod in productions:
+                symbols = prod if isinstance(prod, tuple) else (prod,)
+                if _is_epsilon(prod) or all(s in nullable for s in symbols):
+                    nullable.add(var)
+                    changed = True
+                    break
+    return nullable
+
+
+def unit_chain_depths(grammar):
+    """
+    Longitud de la cadena unitaria más larga que parte de cada variable
+
+    Returns:
+        dict {variable: profundidad}; None si la variable alcanza un ciclo
+        de producciones unitarias
+    """
+    units = {
+        var: [prod for prod in productions
+              if isinstance(prod, str) and prod in grammar.variables]
+        for var, productions in grammar.productions.items()
+    }
+    depths = {}
+    state = {}  # 1 = visitando, 2 = terminado
+
+    def visit(var):
+        state[var] = 1
+        depth = 0
+        for child in units.get(var, ()):
+            if state.get(child) == 1:
+                depth = None
+                break
+            if child not in state:
+                visit(child)
+            if depths[child] is None:
+                depth = None
+                break
+            depth = max(depth, depths[child] + 1)
+        depths[var] = depth
+        state[var] = 2
+
+    for var in sorted(grammar.variables):
+        if var not in state:
+            visit(var)
+    return depths
+
+
+class GrammarProfile:
+    """
+    Métricas de estructura y costo de una gramática
+
+    Atributos:
+        binary_by_left: {B: reglas A → B C en la CNF}
+        fan_in: {(B, C): variables A con A → B C}
+        lexical_ambiguity: {palabra: variables útiles que la producen}
+        nullable: variables anulables de la gramática original
+        unit_depths: {variable: profundidad de cadena unitaria (None = ciclo)}
+        occupancy: {variable: fracción de celdas no vacías donde aparece}
+        checks_per_split: reglas binarias revisadas por punto de división
+        sample_words: palabras de la muestra
+    """
+
+    def __init__(self, grammar, cnf_grammar=None, sample=None, sample_size=200,
+                 max_length=12, seed=0):
+        """
+        Args:
+            grammar: gramática original
+            cnf_grammar: su CNF (None = convertirla)
+            sample: oraciones para medir el costo (None = generar
+                    sample_size oraciones de hasta max_length palabras)
+            seed: semilla de la muestra generada
+        """
+        # Importación local: cyk_algorithm no depende de este módulo
+        from .cyk_algorithm import CYKParser
+
+        if cnf_grammar is None:
+            cnf_grammar = CNFConverter(grammar).convert()
+        self.grammar = grammar
+        self.cnf_grammar = cnf_grammar
+        compiled = CompiledGrammar(cnf_grammar)
+
+        self.binary_by_left = {}
+        for _, left, _ in compiled.binary_rules:
+            self.binary_by_left[left] = self.binary_by_left.get(left, 0) + 1
+        self.fan_in = {pair: len(variables) for pair, variables in compiled.binary.items()}
+        self.lexical_ambiguity = {
+            terminal: len(compiled.classes[compiled.word_classes[idx]])
+            for idx, terminal in enumerate(compiled.terminals)
+        }
+        self.nullable = nullable_variables(grammar)
+        self.unit_depths = unit_chain_depths(grammar)
+
+        if sample is None:
+            generator = grammar.sentence_generator(max_length=max_length, seed=seed)
+            sample = list(generator.iter_sentences(sample_size))
+        self._measure(CYKParser(cnf_grammar, collect_stats=True, bitset_min_length=None),
+                      sample)
+
+    def _measure(self, parser, sample):
+        """Parsea la muestra con el bucle clásico y cuenta ocupación y revisiones"""
+        counts = {}
+        filled = 0
+        splits = 0
+        checks = 0
+        words = 0
+
+        for sentence in sample:
+            parser.parse(sentence)
+            chart = parser.table
+            n = chart.n
+            for length in range(1, n + 1):
+                for start in range(n - length + 1):
+                    cell = chart.cell(start, length)
+                    if cell:
+                        filled += 1
+                        for variable in cell:
+                            counts[variable] = counts.get(variable, 0) + 1
+            stats = parser.last_stats
+            # rule_checks incluye una búsqueda léxica por palabra
+            checks += stats.rule_checks - n
+            splits += (n ** 3 - n) // 6
+            words += n
+
+        self.occupancy = {
+            variable: count / filled for variable, count in counts.items()
+        } if filled else {}
+        self.checks_per_split = checks / splits if splits else 0.0
+        self.sample_words = words
+
+    @property
+    def max_fan_in(self):
+        """Par (B, C) con más variables A → B C, y su número"""
+        if not self.fan_in:
+            return None, 0
+        pair = max(sorted(self.fan_in), key=lambda p: self.fan_in[p])
+        return pair, self.fan_in[pair]
+
+    @property
+    def mean_ambiguity(self):
+        """Variables promedio por palabra del léxico"""
+        if not self.lexical_ambiguity:
+            return 0.0
+        return sum(self.lexical_ambiguity.values()) / len(self.lexical_ambiguity)
+
+    @property
+    def max_unit_depth(self):
+        """Cadena unitaria más larga (None si hay un ciclo)"""
+        depths = list(self.unit_depths.values())
+        if None in depths:
+            return None
+        return max(depths, default=0)
+
+    def estimated_cost(self, n):
+        """
+        Reglas binarias revisadas por palabra en una oración de n palabras
+
+        Returns:
+            float (estimado con checks_per_split de la muestra)
+        """
+        if n < 2:
+            return 0.0
+        return self.checks_per_split * (n * n - 1) / 6
+
+    def hot_spots(self, occupancy=HOT_OCCUPANCY, left_factor=HOT_LEFT_FACTOR,
+                  fan_in=HOT_FAN_IN, ambiguity=HOT_AMBIGUITY, unit_depth=HOT_UNIT_DEPTH):
+        """
+        Partes de la gramática que más encarecen el parsing
+
+        Returns:
+            lista de (tipo, símbolo, valor), de mayor a menor dentro de cada tipo
+        """
+        spots = []
+        for variable, value in sorted(self.occupancy.items(), key=lambda kv: (-kv[1], kv[0])):
+            if value >= occupancy:
+                spots.append(('ocupación', variable, round(value, 3)))
+
+        if self.binary_by_left:
+            mean = sum(self.binary_by_left.values()) / len(self.binary_by_left)
+            for left, count in sorted(self.binary_by_left.items(), key=lambda kv: (-kv[1], kv[0])):
+                if count >= left_factor * mean and count > 1:
+                    spots.append(('hijo izquierdo', left, count))
+
+        for pair, count in sorted(self.fan_in.items(), key=lambda kv: (-kv[1], kv[0])):
+            if count >= fan_in:
+                spots.append(('fan-in', " ".join(pair), count))
+
+        for word, count in sorted(self.lexical_ambiguity.items(), key=lambda kv: (-kv[1], kv[0])):
+            if count >= ambiguity:
+                spots.append(('ambigüedad léxica', word, count))
+
+        for variable, depth in sorted(self.unit_depths.items()):
+            if depth is None:
+                spots.append(('ciclo unitario', variable, None))
+            elif depth >= unit_depth:
+                spots.append(('cadena unitaria', variable, depth))
+        return spots
+
+    def write_markdown(self, stream, lengths=(5, 10, 20, 40)):
+        """Escribe el perfil como sección Markdown en un archivo de texto"""
+        write = stream.write
+        pair, pair_count = self.max_fan_in
+        depth = self.max_unit_depth
+
+        write("| Métrica | Valor |\n")
+        write("|---------|-------|\n")
+        write(f"| Reglas binarias (CNF) | {sum(self.binary_by_left.values())} |\n")
+        write(f"| Máx. reglas por hijo izquierdo | {max(self.binary_by_left.values(), default=0)} |\n")
+        if pair is not None:
+            write(f"| Máx. fan-in por par | {pair_count} (`{' '.join(pair)}`) |\n")
+        write(f"| Ambigüedad léxica promedio | {self.mean_ambiguity:.2f} |\n")
+        write(f"| Máx. ambigüedad léxica | {max(self.lexical_ambiguity.values(), default=0)} |\n")
+        write(f"| Variables anulables | {len(self.nullable)} |\n")
+        write(f"| Cadena unitaria más larga | {'ciclo' if depth is None else depth} |\n")
+        write(f"| Revisiones por punto de división | {self.checks_per_split:.3f} |\n\n")
+
+        write("Costo estimado (reglas binarias revisadas por palabra):\n\n")
+        write("| Palabras | Revisiones por palabra |\n")
+        write("|----------|------------------------|\n")
+        for n in lengths:
+            write(f"| {n} | {self.estimated_cost(n):.1f} |\n")
+        write("\n")
+
+        spots = self.hot_spots()
+        if spots:
+            write("Puntos calientes:\n\n")
+            for kind, symbol, value in spots:
+                suffix = f": {value}" if value is not None else ""
+                write(f"- **{kind}** `{symbol}`{suffix}\n")
+        else:
+            write("Sin puntos calientes.\n")
+        write("\n")
+
+    def __str__(self):
+        pair, pair_count = self.max_fan_in
+        lines = [
+            f"Reglas binarias: {sum(self.binary_by_left.values())}",
+            f"Máx. fan-in: {pair_count} {pair}",
+            f"Ambigüedad léxica promedio: {self.mean_ambiguity:.2f}",
+            f"Cadena unitaria más larga: {self.max_unit_depth}",
+            f"Revisiones por división: {self.checks_per_split:.3f}",
+        ]
+        for kind, symbol, value in self.hot_spots():
+            lines.append(f"  [{kind}] {symbol} {value if value is not None else ''}".rstrip())
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from .grammar import create_english_grammar
+
+    print(GrammarProfile(create_english_grammar()))
@@ -0,0 +1,277 @@
+"""
+Registro de observadores (hooks) para el pipeline de parsing
+
+Permite conectar perfiladores externos (cProfile, tracemalloc, exportadores
+de métricas) a las etapas del pipeline sin modificar el código:
+
+- 'cnf.convert': CNFConverter.convert
+- 'cyk.parse': CYKParser.parse
+- 'tree.build': ParseTreeBuilder.build_tree
+
+Cuando no hay observadores registrados, cada etapa solo paga la revisión
+de una lista vacía antes de ejecutar la función original.
+"""
+
+import functools
+import os
+import time
+import tracemalloc
+
+
+STAGE_CONVERT = 'cnf.convert'
+STAGE_PARSE = 'cyk.parse'
+STAGE_TREE = 'tree.build'
+
+# Observadores registrados (lista global del proceso)
+observers = []
+
+
+def register_observer(observer):
+    """
+    Registra un observador
+
+    Args:
+        observer: objeto con métodos on_start(stage, context) y
+                  on_end(stage, context) (ver ParseObserver)
+
+    Returns:
+        el mismo observador (para usarlo en una sola línea)
+    """
+    if observer not in observers:
+        observers.append(observer)
+    return observer
+
+
+def unregister_observer(observer):
+    """Quita un observador registrado (no falla si no estaba)"""
+    if observer in observers:
+        observers.remove(observer)
+
+
+def clear_observers():
+    """Quita todos los observadores"""
+    del observers[:]
+
+
+def observed(stage):
+    """
+    Decorador que emite los eventos de inicio y fin de una etapa
+
+    El contexto que reciben los observadores es un diccionario con:
+    - 'instance': el objeto sobre el que se llamó el método
+    - 'args' y 'kwargs': argumentos de la llamada
+    - 'result': valor devuelto (solo en on_end, si no hubo error)
+    - 'error': excepción lanzada (solo en on_end, si hubo error)
+
+    Args:
+        stage: nombre de la etapa
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(instance, *args, **kwargs):
+            if not observers:
+                return func(instance, *args, **kwargs)
+
+            context = {'instance': instance, 'args': args, 'kwargs': kwargs}
+            current = list(observers)
+
+            for observer in current:
+                observer.on_start(stage, context)
+            try:
+                context['result'] = func(instance, *args, **kwargs)
+                return context['result']
+            except BaseException as error:
+                context['error'] = error
+                raise
+            finally:
+                for observer in reversed(current):
+                    observer.on_end(stage, context)
+
+        return wrapper
+    return decorator
+
+
+class ParseObserver:
+    """
+    Clase base para observadores: ambos eventos no hacen nada por defecto
+    """
+
+    def on_start(self, stage, context):
+        """Se llama antes de ejecutar la etapa"""
+
+    def on_end(self, stage, context):
+        """Se llama después de ejecutar la etapa (aunque haya fallado)"""
+
+
+class TracemallocObserver(ParseObserver):
+    """
+    Mide la memoria asignada por cada etapa usando tracemalloc
+
+    Para cada etapa guarda una lista de muestras (delta, pico) en bytes:
+    - delta: memoria que sigue asignada al terminar la etapa
+    - pico: máximo de memoria asignada durante la etapa
+
+    Las etapas pueden anidarse (parse dentro de parse en la calibración de
+    ENGINE_AUTO, convert dentro de otra etapa): cada una reinicia el pico
+    de tracemalloc al empezar, así que antes de reiniciarlo se acumula el
+    pico visto hasta ese momento en todas las etapas abiertas, y al
+    terminar una etapa su pico se propaga a la que la contiene.
+    """
+
+    def __init__(self, keep_snapshots=False):
+        """
+        Args:
+            keep_snapshots: si guardar un tracemalloc.Snapshot al final
+                            de cada etapa (en self.snapshots[stage])
+        """
+        self.keep_snapshots = keep_snapshots
+        self.samples = {}
+        self.snapshots = {}
+        self._stack = []  # [memoria al empezar, pico acumulado] por etapa abierta
+        self._started_tracing = False
+
+    def on_start(self, stage, context):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            # El pico hasta ahora pertenece a las etapas abiertas
+            for frame in self._stack:
+                frame[1] = max(frame[1], peak)
+            tracemalloc.reset_peak()
+        self._stack.append([current, current])
+
+    def on_end(self, stage, context):
+        if not self._stack:
+            return
+        start, carried = self._stack.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, carried)
+        if self._stack:
+            outer = self._stack[-1]
+            outer[1] = max(outer[1], peak)
+        self.samples.setdefault(stage, []).append(
+            (current - start, max(peak - start, 0))
+        )
+        if self.keep_snapshots:
+            self.snapshots[stage] = tracemalloc.take_snapshot()
+
+    def peak_bytes(self, stage):
+        """Pico máximo observado para una etapa"""
+        return max((peak for _, peak in self.samples.get(stage, [])), default=0)
+
+    def stop(self):
+        """Detiene tracemalloc si este observador lo inició"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def report(self):
+        """Resumen legible de la memoria por etapa"""
+        lines = ["Memoria por etapa (tracemalloc):"]
+        for stage, samples in sorted(self.samples.items()):
+            avg_peak = sum(peak for _, peak in samples) / len(samples)
+            lines.append(
+                f"  {stage:<12} llamadas: {len(samples):6d}  "
+                f"pico promedio: {avg_peak / 1024:8.1f} KiB  "
+                f"pico máximo: {self.peak_bytes(stage) / 1024:8.1f} KiB"
+            )
+        return "\n".join(lines)
+
+
+class PrometheusExporter(ParseObserver):
+    """
+    Exporta métricas por etapa en el formato de texto de Prometheus
+
+    Las métricas se escriben en un archivo local (por ejemplo, para el
+    textfile collector de node_exporter):
+    - cyk_stage_calls_total{stage}: ejecuciones
+    - cyk_stage_errors_total{stage}: ejecuciones que lanzaron excepción
+    - cyk_stage_duration_seconds{stage}: histograma de duración
+    """
+
+    DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+    def __init__(self, path, buckets=DEFAULT_BUCKETS, write_every=1000):
+        """
+        Args:
+            path: archivo de salida (se reescribe de forma atómica)
+            buckets: límites superiores del histograma en segundos
+            write_every: escribir el archivo cada N eventos de fin
+                         (0 = solo al llamar write())
+        """
+        self.path = path
+        self.buckets = tuple(sorted(buckets))
+        self.write_every = write_every
+        self.calls = {}
+        self.errors = {}
+        self.duration_sum = {}
+        self.bucket_counts = {}
+        self._stack = []
+        self._pending = 0
+
+    def on_start(self, stage, context):
+        self._stack.append(time.perf_counter())
+
+    def on_end(self, stage, context):
+        if not self._stack:
+            return
+        elapsed = time.perf_counter() - self._stack.pop()
+
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        if 'error' in context:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+        self.duration_sum[stage] = self.duration_sum.get(stage, 0.0) + elapsed
+
+        counts = self.bucket_counts.setdefault(stage, [0] * len(self.buckets))
+        for idx, bound in enumerate(self.buckets):
+            if elapsed <= bound:
+                counts[idx] += 1
+
+        self._pending += 1
+        if self.write_every and self._pending >= self.write_every:
+            self.write()
+
+    def render(self):
+        """Genera el texto de las métricas en formato Prometheus"""
+        lines = [
+            "# HELP cyk_stage_calls_total Ejecuciones de cada etapa del pipeline",
+            "# TYPE cyk_stage_calls_total counter",
+        ]
+        for stage in sorted(self.calls):
+            lines.append(f'cyk_stage_calls_total{{stage="{stage}"}} {self.calls[stage]}')
+
+        lines.append("# HELP cyk_stage_errors_total Ejecuciones que terminaron con error")
+        lines.append("# TYPE cyk_stage_errors_total counter")
+        for stage in sorted(self.calls):
+            lines.append(
+                f'cyk_stage_errors_total{{stage="{stage}"}} {self.errors.get(stage, 0)}'
+            )
+
+        lines.append("# HELP cyk_stage_duration_seconds Duración de cada etapa")
+        lines.append("# TYPE cyk_stage_duration_seconds histogram")
+        for stage in sorted(self.calls):
+            for bound, count in zip(self.buckets, self.bucket_counts[stage]):
+                lines.append(
+                    f'cyk_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'cyk_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {self.calls[stage]}'
+            )
+            lines.append(
+                f'cyk_stage_duration_seconds_sum{{stage="{stage}"}} {self.duration_sum[stage]:.9f}'
+            )
+            lines.append(
+                f'cyk_stage_duration_seconds_count{{stage="{stage}"}} {self.calls[stage]}'
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        """Escribe las métricas en el archivo (reemplazo atómico)"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, self.path)
+        self._pending = 0
@@ -0,0 +1,188 @@
+"""
+Caché de resultados del parser CYK con política LRU
+
+Las oraciones repetidas no necesitan recalcular la tabla completa.
+La llave es el hash del contenido de la gramática (Grammar.fingerprint,
+con el de la numeración de sus clases) junto con la tupla de clases
+léxicas de las palabras (ver CompiledGrammar.classes): las oraciones que solo difieren en palabras
+intercambiables ("the dog eats" y "the cat eats") comparten la entrada,
+varios parsers con gramáticas distintas pueden compartir la caché sin
+mezclar resultados, y cuando una gramática cambia se descartan las
+entradas de su versión anterior.
+"""
+
+import weakref
+from collections import OrderedDict
+
+
+# Qué se guarda en cada entrada
+STORE_ACCEPT = 'accept'  # solo el resultado (aceptada o no)
+STORE_TREE = 'tree'      # tabla y backpointers (permite construir el árbol)
+
+
+class CacheEntry:
+    """
+    Resultado guardado para una oración
+
+    Atributos:
+        words: tupla de palabras normalizadas de la oración que creó la entrada
+        accepted: si la oración fue aceptada
+        table: tabla CYK (None si solo se guarda el resultado)
+        backpointers: backpointers (None si solo se guarda el resultado)
+        tree: árbol ya construido para estas palabras (se llena al construirlo)
+
+    La tabla sirve para cualquier oración con las mismas clases léxicas
+    (las hojas del árbol se toman de las palabras de cada oración); el
+    árbol memorizado solo se reutiliza si las palabras coinciden.
+    """
+
+    __slots__ = ('words', 'accepted', 'table', 'backpointers', 'tree')
+
+    def __init__(self, words, accepted, table=None, backpointers=None):
+        self.words = words
+        self.accepted = accepted
+        self.table = table
+        self.backpointers = backpointers
+        self.tree = None
+
+
+class ParseCache:
+    """
+    Caché LRU acotada para resultados de parsing
+
+    Uso:
+        parser = CYKParser(cnf_grammar, cache=ParseCache(maxsize=10000))
+    """
+
+    def __init__(self, maxsize=1024, store=STORE_ACCEPT):
+        """
+        Args:
+            maxsize: número máximo de oraciones guardadas
+            store: STORE_ACCEPT (solo el bit de aceptación) o
+                   STORE_TREE (tabla y backpointers para construir el árbol)
+        """
+        if store not in (STORE_ACCEPT, STORE_TREE):
+            raise ValueError(f"Modo de caché desconocido: {store}")
+        if maxsize < 1:
+            raise ValueError("maxsize debe ser al menos 1")
+
+        self.maxsize = maxsize
+        self.store = store
+        self.grammar_version = None
+        self._owners = {}    # {id del dueño vivo: su versión actual}
+        self._refcounts = {}  # {versión: dueños vivos que la usan}
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def check_version(self, version, owner=None):
+        """
+        Descarta las entradas de la versión anterior si la gramática cambió
+
+        Las llaves deben empezar por la versión (key[0]). Cada dueño (la
+        gramática de un parser) tiene su propia versión actual; las
+        entradas de una versión se descartan cuando ningún dueño vivo la
+        usa (también cuando el dueño se libera de la memoria).
+
+        Args:
+            version: versión actual de la gramática (su fingerprint)
+            owner: objeto al que pertenece la versión (None = uno solo);
+                   debe admitir weakref
+        """
+        owner_id = id(owner)
+        previous = self._owners.get(owner_id)
+        self.grammar_version = version
+        if previous == version:
+            return
+
+        if previous is None and owner is not None:
+            # Al liberarse el dueño su id puede reutilizarse: se olvida antes
+            weakref.finalize(owner, _forget_owner, weakref.ref(self), owner_id)
+        self._owners[owner_id] = version
+        self._refcounts[version] = self._refcounts.get(version, 0) + 1
+        if previous is not None:
+            self._release(previous)
+
+    def _release(self, version):
+        """Un dueño deja de usar la versión; sin dueños se descartan sus entradas"""
+        remaining = self._refcounts[version] - 1
+        if remaining:
+            self._refcounts[version] = remaining
+            return
+        del self._refcounts[version]
+
+        stale = [key for key in self._entries if key[0] == version]
+        if stale:
+            self.invalidations += 1
+            for key in stale:
+                del self._entries[key]
+
+    def get(self, key):
+        """
+        Busca una entrada y la marca como usada recientemente
+
+        Returns:
+            CacheEntry o None si no está
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """Guarda una entrada, expulsando la menos usada si está llena"""
+        if self.store == STORE_ACCEPT:
+            entry.table = None
+            entry.backpointers = None
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Elimina todas las entradas (las estadísticas se conservan)"""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self):
+        """Proporción de búsquedas que encontraron la oración"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Estadísticas de uso de la caché"""
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'store': self.store,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+def _forget_owner(cache_ref, owner_id):
+    """Finalizador de un dueño de ParseCache.check_version"""
+    cache = cache_ref()
+    if cache is not None:
+        version = cache._owners.pop(owner_id, None)
+        if version is not None:
+            cache._release(version)
@@ -0,0 +1,151 @@
+"""
+Módulo de instrumentación del parser CYK
+
+Registra tiempos por fase (con perf_counter_ns) y contadores del llenado
+de la tabla, y permite agregarlos sobre un lote de oraciones.
+"""
+
+import time
+
+
+# Fases medidas, en el orden en que ocurren
+PHASES = ('tokenize', 'lexical', 'binary', 'tree')
+
+# Contadores enteros que se suman al agregar
+COUNTERS = (
+    'words', 'cells_filled', 'rule_checks', 'rule_hits', 'chart_bytes',
+    'cache_hits', 'pruned', 'timeouts',
+)
+
+
+class ParseStats:
+    """
+    Estadísticas de una o varias ejecuciones del parser
+
+    Atributos:
+        parses: número de oraciones agregadas
+        accepted: cuántas fueron aceptadas
+        timings_ns: {fase: nanosegundos acumulados}
+        words: número total de palabras
+        cells_filled: celdas de la tabla con al menos una variable
+        rule_checks: reglas evaluadas (léxicas y binarias)
+        rule_hits: reglas que agregaron una variable a una celda
+        chart_bytes: memoria aproximada de la tabla y los backpointers
+        cache_hits: oraciones resueltas desde la caché de resultados
+        pruned: variables descartadas por el beam de las celdas
+        timeouts: oraciones abortadas por exceder el presupuesto de tiempo
+        engines: {motor: oraciones} que llenó cada motor (las resueltas
+                 desde la caché cuentan como 'cache')
+    """
+
+    def __init__(self):
+        self.parses = 0
+        self.accepted = 0
+        self.timings_ns = {phase: 0 for phase in PHASES}
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+        self.engines = {}
+        self._phase = None
+        self._phase_start = 0
+
+    def start_phase(self, phase):
+        """Inicia la medición de una fase (cierra la anterior si sigue abierta)"""
+        now = time.perf_counter_ns()
+        if self._phase is not None:
+            self.timings_ns[self._phase] += now - self._phase_start
+        self._phase = phase
+        self._phase_start = now
+
+    def end_phase(self):
+        """Termina la fase actual"""
+        if self._phase is not None:
+            self.timings_ns[self._phase] += time.perf_counter_ns() - self._phase_start
+            self._phase = None
+
+    def add_time(self, phase, elapsed_ns):
+        """Suma tiempo medido externamente a una fase"""
+        self.timings_ns[phase] = self.timings_ns.get(phase, 0) + elapsed_ns
+
+    @property
+    def engine(self):
+        """Motor usado si fue uno solo (None si no hubo o fueron varios)"""
+        if len(self.engines) == 1:
+            return next(iter(self.engines))
+        return None
+
+    @property
+    def total_ns(self):
+        """Tiempo total de todas las fases"""
+        return sum(self.timings_ns.values())
+
+    def merge(self, other):
+        """
+        Acumula otras estadísticas sobre éstas
+
+        Args:
+            other: ParseStats a sumar
+
+        Returns:
+            self (para encadenar)
+        """
+        self.parses += other.parses
+        self.accepted += other.accepted
+        for phase, elapsed in other.timings_ns.items():
+            self.timings_ns[phase] = self.timings_ns.get(phase, 0) + elapsed
+        for counter in COUNTERS:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        for engine, count in other.engines.items():
+            self.engines[engine] = self.engines.get(engine, 0) + count
+        return self
+
+    def __add__(self, other):
+        return ParseStats().merge(self).merge(other)
+
+    @classmethod
+    def aggregate(cls, stats_list):
+        """Agrega una secuencia de ParseStats en uno solo"""
+        total = cls()
+        for stats in stats_list:
+            total.merge(stats)
+        return total
+
+    def to_dict(self):
+        """Representación como diccionario (para JSON o exportadores)"""
+        result = {
+            'parses': self.parses,
+            'accepted': self.accepted,
+            'timings_ns': dict(self.timings_ns),
+            'total_ns': self.total_ns,
+        }
+        for counter in COUNTERS:
+            result[counter] = getattr(self, counter)
+        result['engines'] = dict(self.engines)
+        return result
+
+    def __str__(self):
+        """Resumen legible de las estadísticas"""
+        parses = max(self.parses, 1)
+        lines = [f"Oraciones: {self.parses} (aceptadas: {self.accepted})"]
+
+        lines.append("Tiempos por fase (promedio):")
+        total = self.total_ns or 1
+        for phase, elapsed in self.timings_ns.items():
+            lines.append(
+                f"  {phase:<10} {elapsed / parses / 1000:10.2f} µs"
+                f"  ({elapsed / total * 100:5.1f}%)"
+            )
+
+        lines.append("Contadores (promedio):")
+        for counter in COUNTERS:
+            lines.append(f"  {counter:<13} {getattr(self, counter) / parses:12.1f}")
+
+        if self.engines:
+            lines.append("Motores: " + ", ".join(
+                f"{engine} {count}" for engine, count in sorted(self.engines.items())
+            ))
+
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"ParseStats(parses={self.parses}, total_ns={self.total_ns})"
+
@@ -1,7 +1,19 @@
 """
 Módulo para construir y visualizar el árbol de parsing (parse tree)
+
+Además del árbol completo (build_tree), ParseTreeBuilder ofrece:
+- lazy_tree: una vista cuyos nodos expanden sus hijos al accederlos
+- write_brackets / write_ascii / write_json: serializadores que escriben
+  directamente desde la tabla y los backpointers en un writer (archivo,
+  sys.stdout, io.StringIO), sin crear objetos de nodo
 """
 
+import io
+import json
+import time
+
+from .hooks import observed, STAGE_TREE
+
 
 class ParseTreeNode:
     """
@@ -25,6 +37,61 @@ class ParseTreeNode:
         return f"Node({self.symbol})"
 
 
+class LazyTreeNode:
+    """
+    Nodo de una vista perezosa del árbol: sus hijos se leen de la tabla
+    la primera vez que se accede a children
+
+    Tiene la misma interfaz que ParseTreeNode (symbol, children, is_leaf),
+    así que sirve con to_bracket_notation, visualize_tree_ascii, etc.
+    Con un ChartPool la vista solo es válida hasta el siguiente parse().
+    """
+    
+    __slots__ = ('symbol', 'start', 'length', '_builder', '_words', '_children')
+    
+    def __init__(self, builder, symbol, start, length, words):
+        """
+        Args:
+            builder: ParseTreeBuilder con la tabla
+            symbol: variable del nodo
+            start, length: subcadena que deriva
+            words: lista de palabras
+        """
+        self.symbol = symbol
+        self.start = start
+        self.length = length
+        self._builder = builder
+        self._words = words
+        self._children = None
+    
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = [
+                LazyTreeNode(self._builder, symbol, start, length, self._words)
+                if start is not None else ParseTreeNode(symbol)
+                for symbol, start, length in self._builder._expand(
+                    self.symbol, self.start, self.length, self._words
+                )
+            ]
+        return self._children
+    
+    def is_leaf(self):
+        """Verifica si el nodo es una hoja (terminal)"""
+        return len(self.children) == 0
+    
+    def materialize(self):
+        """Expande todo el subárbol y lo devuelve como ParseTreeNode"""
+        return ParseTreeNode(
+            self.symbol,
+            [child.materialize() if isinstance(child, LazyTreeNode) else child
+             for child in self.children]
+        )
+    
+    def __repr__(self):
+        return f"LazyNode({self.symbol}, {self.start}, {self.length})"
+
+
 class ParseTreeBuilder:
     """
     Construye el árbol de parsing a partir de la tabla CYK y backpointers
@@ -40,6 +107,7 @@ class ParseTreeBuilder:
         self.table = parser.table
         self.backpointers = parser.backpointers
     
+    @observed(STAGE_TREE)
     def build_tree(self, words):
         """
         Construye el árbol de parsing completo
@@ -52,17 +120,259 @@ class ParseTreeBuilder:
         """
         n = len(words)
         
+        found, tree = self._stored_tree(words)
+        if found:
+            return tree
+        entry = self._cache_entry(words)
+        
         # Verificar que la oración fue aceptada
-        if self.grammar.start_symbol not in self.table[0][n - 1]:
+        if not self._accepted(n):
             return None
         
+        stats = getattr(self.parser, 'last_stats', None)
+        start_ns = time.perf_counter_ns() if stats is not None else 0
+        
         # Construir árbol recursivamente desde la raíz
-        return self._build_recursive(
+        tree = self._build_recursive(
             self.grammar.start_symbol,
             0,  # posición inicial
             n - 1,  # índice en tabla (longitud - 1)
             words
         )
+        
+        if stats is not None:
+            stats.add_time('tree', time.perf_counter_ns() - start_ns)
+        
+        if entry is not None:
+            entry.tree = tree
+        
+        return tree
+    
+    def _cache_entry(self, words):
+        """Entrada de caché del parser si corresponde a estas palabras"""
+        entry = getattr(self.parser, 'cache_entry', None)
+        if entry is not None and entry.words != tuple(words):
+            entry = None
+        return entry
+    
+    def _stored_tree(self, words):
+        """
+        Árbol ya construido: el del motor Earley o el memorizado en la caché
+        
+        Returns:
+            tuple (encontrado, árbol)
+        """
+        # El motor Earley construye el árbol sobre la gramática original
+        if getattr(self.parser, 'last_engine', None) == 'earley':
+            return True, self.parser.earley.build_tree(words)
+        
+        # Reutilizar el árbol si la caché del parser ya lo tiene
+        entry = self._cache_entry(words)
+        if entry is not None and entry.tree is not None:
+            return True, entry.tree
+        
+        return False, None
+    
+    def _accepted(self, n):
+        """Verifica en la tabla que la oración de n palabras fue aceptada"""
+        if self.table is None:
+            raise ValueError(
+                "La tabla no está disponible (resultado tomado de una caché "
+                "que solo guarda la aceptación)"
+            )
+        return self.grammar.start_symbol in self.table.cell(0, n)
+    
+    def _expand(self, symbol, start, length, words):
+        """
+        Hijos de un nodo leídos de los backpointers
+        
+        Returns:
+            lista de (símbolo, inicio, longitud); las hojas (palabras)
+            tienen inicio y longitud None
+        """
+        if length == 1:
+            return [(words[start], None, None)]
+        
+        backpointer = self.table.backpointer(start, length, symbol)
+        if backpointer is None:
+            return []
+        
+        production, split_point = backpointer
+        if isinstance(production, tuple):
+            left_sym, right_sym = production
+            return [
+                (left_sym, start, split_point + 1),
+                (right_sym, start + split_point + 1, length - split_point - 1),
+            ]
+        return [(production, None, None)]
+    
+    def lazy_tree(self, words):
+        """
+        Vista perezosa del árbol: cada nodo lee sus hijos al accederlos
+        
+        Args:
+            words: lista de palabras de la oración
+            
+        Returns:
+            LazyTreeNode raíz (o el ParseTreeNode ya construido si el
+            motor fue Earley o la caché lo tenía), o None si no se aceptó
+        """
+        found, tree = self._stored_tree(words)
+        if found:
+            return tree
+        if not self._accepted(len(words)):
+            return None
+        return LazyTreeNode(self, self.grammar.start_symbol, 0, len(words), words)
+    
+    def _stream_source(self, words):
+        """
+        Raíz y función de expansión para los serializadores
+        
+        Returns:
+            tuple (raíz, expand) donde expand(ítem) devuelve (etiqueta, hijos);
+            raíz es None si la oración no se aceptó
+        """
+        found, tree = self._stored_tree(words)
+        if found:
+            return tree, _expand_node
+        if not self._accepted(len(words)):
+            return None, None
+        
+        def expand(item):
+            symbol, start, length = item
+            if start is None:
+                return symbol, ()
+            return symbol, self._expand(symbol, start, length, words)
+        
+        return (self.grammar.start_symbol, 0, len(words)), expand
+    
+    def write_brackets(self, words, writer):
+        """
+        Escribe el árbol en notación de brackets sin construir nodos
+        
+        Produce lo mismo que to_bracket_notation(build_tree(words)).
+        
+        Args:
+            words: lista de palabras de la oración
+            writer: objeto con método write (archivo, sys.stdout, StringIO)
+            
+        Returns:
+            True si se escribió el árbol, False si la oración no se aceptó
+        """
+        root, expand = self._stream_source(words)
+        if root is None:
+            return False
+        
+        write = writer.write
+        # Pila de ítems pendientes; los strings son texto literal
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                write(item)
+                continue
+            
+            label, children = expand(item)
+            if not children:
+                write(label)
+                continue
+            
+            write("[" + label)
+            stack.append("]")
+            for child in reversed(children):
+                stack.append(child)
+                stack.append(" ")
+        return True
+    
+    def write_ascii(self, words, writer):
+        """
+        Escribe la visualización ASCII sin construir nodos
+        
+        Produce lo mismo que visualize_tree_ascii(build_tree(words)).
+        
+        Args:
+            words: lista de palabras de la oración
+            writer: objeto con método write
+            
+        Returns:
+            True si se escribió el árbol, False si la oración no se aceptó
+        """
+        root, expand = self._stream_source(words)
+        if root is None:
+            return False
+        
+        write = writer.write
+        stack = [(root, "", "", "")]
+        first = True
+        while stack:
+            item, prefix, child_prefix, connector = stack.pop()
+            label, children = expand(item)
+            
+            if not first:
+                write("\n")
+            first = False
+            write(prefix + connector + label)
+            
+            last = len(children) - 1
+            for idx in range(last, -1, -1):
+                if idx == last:
+                    stack.append((children[idx], child_prefix,
+                                  child_prefix + "    ", "└── "))
+                else:
+                    stack.append((children[idx], child_prefix,
+                                  child_prefix + "│   ", "├── "))
+        return True
+    
+    def write_json(self, words, writer):
+        """
+        Escribe el árbol como JSON sin construir nodos
+        
+        Formato: {"symbol": "S", "children": [...]}; las hojas son
+        {"symbol": "palabra"}.
+        
+        Args:
+            words: lista de palabras de la oración
+            writer: objeto con método write
+            
+        Returns:
+            True si se escribió el árbol, False si la oración no se aceptó
+        """
+        root, expand = self._stream_source(words)
+        if root is None:
+            return False
+        
+        write = writer.write
+        dumps = json.dumps
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                write(item)
+                continue
+            
+            label, children = expand(item)
+            if not children:
+                write('{"symbol": ' + dumps(label) + '}')
+                continue
+            
+            write('{"symbol": ' + dumps(label) + ', "children": [')
+            stack.append("]}")
+            for idx in range(len(children) - 1, -1, -1):
+                stack.append(children[idx])
+                if idx:
+                    stack.append(", ")
+        return True
+    
+    def bracket_string(self, words):
+        """
+        Notación de brackets como string, sin construir el árbol
+        
+        Returns:
+            string (vacío si la oración no se aceptó)
+        """
+        buffer = io.StringIO()
+        self.write_brackets(words, buffer)
+        return buffer.getvalue()
     
     def _build_recursive(self, symbol, i, j, words):
         """
@@ -71,7 +381,7 @@ class ParseTreeBuilder:
         Args:
             symbol: símbolo actual (variable o terminal)
             i: posición inicial en la oración
-            j: índice en la tabla
+            j: índice en la tabla (longitud - 1)
             words: lista de palabras
             
         Returns:
@@ -84,11 +394,12 @@ class ParseTreeBuilder:
             return ParseTreeNode(symbol, [ParseTreeNode(word)])
         
         # Caso recursivo: obtener backpointer
-        if symbol not in self.backpointers[i][j]:
+        backpointer = self.table.backpointer(i, j + 1, symbol)
+        if backpointer is None:
             # No hay backpointer, error
             return ParseTreeNode(symbol)
         
-        production, split_point = self.backpointers[i][j][symbol]
+        production, split_point = backpointer
         
         # Si es una producción binaria (A → B C)
         if isinstance(production, tuple):
@@ -115,6 +426,27 @@ class ParseTreeBuilder:
             # Es una producción terminal (A → a)
             return ParseTreeNode(symbol, [ParseTreeNode(production)])
     
+    def build_chunk_trees(self, chunks, words):
+        """
+        Construye un subárbol para cada fragmento de un análisis parcial
+        
+        Args:
+            chunks: lista de Chunk (ver CYKParser.extract_chunks)
+            words: lista de palabras de la oración
+            
+        Returns:
+            lista de ParseTreeNode; los fragmentos sin etiqueta son hojas
+        """
+        trees = []
+        for chunk in chunks:
+            if chunk.label is None:
+                trees.append(ParseTreeNode(words[chunk.start]))
+            else:
+                trees.append(self._build_recursive(
+                    chunk.label, chunk.start, chunk.length - 1, words
+                ))
+        return trees
+    
     def print_tree(self, tree, indent=0):
         """
         Imprime el árbol de forma jerárquica
@@ -218,6 +550,11 @@ class ParseTreeBuilder:
             )
 
 
+def _expand_node(node):
+    """Expansión de un ParseTreeNode ya construido para los serializadores"""
+    return node.symbol, node.children
+
+
 if __name__ == "__main__":
     # Prueba del módulo
     from .grammar import create_english_grammar
@@ -0,0 +1,113 @@
+"""
+Análisis parcial de oraciones rechazadas a partir de la tabla CYK
+
+Aunque la oración completa no derive del símbolo inicial, la tabla ya
+contiene constituyentes válidos (NP, VP, PP, ...) para sus fragmentos.
+Este módulo elige, sin volver a parsear, una cobertura mínima de la
+oración con constituyentes maximales.
+"""
+
+from .cnf_converter import is_generated_variable
+
+
+class Chunk:
+    """
+    Fragmento de la oración cubierto por un constituyente
+
+    Atributos:
+        start: posición inicial (incluida)
+        end: posición final (excluida)
+        label: variable del constituyente, o None si la palabra no
+               pertenece a ningún constituyente permitido
+        words: palabras del fragmento
+    """
+
+    __slots__ = ('start', 'end', 'label', 'words')
+
+    def __init__(self, start, end, label, words):
+        self.start = start
+        self.end = end
+        self.label = label
+        self.words = words
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+    def __str__(self):
+        text = " ".join(self.words)
+        return f"[{self.label} {text}]" if self.label else text
+
+    def __repr__(self):
+        return f"Chunk({self.start}, {self.end}, {self.label!r})"
+
+
+def default_labels(grammar):
+    """
+    Etiquetas permitidas por defecto: variables que no creó el conversor
+    a CNF, con el símbolo inicial primero y el resto en orden alfabético
+    """
+    labels = sorted(
+        var for var in grammar.variables
+        if not is_generated_variable(var) and var != grammar.start_symbol
+    )
+    return [grammar.start_symbol] + labels
+
+
+def extract_chunks(chart, words, labels):
+    """
+    Cubre la oración con el menor número de constituyentes
+
+    Programación dinámica sobre las posiciones: best[e] es el mínimo de
+    fragmentos que cubren words[:e]. Cada celda de la tabla se revisa una
+    sola vez, así que el costo es proporcional al tamaño de la tabla.
+    Una palabra sin constituyente permitido forma un fragmento sin etiqueta.
+    Entre coberturas con el mismo número de fragmentos se prefieren las
+    que tienen menos palabras sin etiqueta.
+
+    Args:
+        chart: CYKChart ya calculada (puede ser parcial)
+        words: palabras de la oración
+        labels: lista de variables permitidas, en orden de preferencia
+
+    Returns:
+        lista de Chunk de izquierda a derecha
+    """
+    n = len(words)
+    if n == 0:
+        return []
+
+    rank = {label: idx for idx, label in enumerate(labels)}
+    # best[e] = (fragmentos, palabras sin etiqueta)
+    best = [(0, 0)] + [None] * n
+    choice = [None] * (n + 1)
+
+    for end in range(1, n + 1):
+        for start in range(end):
+            if best[start] is None:
+                continue
+
+            cell = chart.cell(start, end - start)
+            label = None
+            if cell:
+                allowed = [var for var in cell if var in rank]
+                if allowed:
+                    label = min(allowed, key=rank.__getitem__)
+
+            if label is None and end - start > 1:
+                continue
+
+            chunks, unlabeled = best[start]
+            cost = (chunks + 1, unlabeled + (label is None))
+            if best[end] is None or cost < best[end]:
+                best[end] = cost
+                choice[end] = (start, label)
+
+    result = []
+    end = n
+    while end > 0:
+        start, label = choice[end]
+        result.append(Chunk(start, end, label, words[start:end]))
+        end = start
+    result.reverse()
+    return result
@@ -0,0 +1,345 @@
+"""
+Pipeline en streaming para parsear documentos completos
+
+Lee el texto por bloques, lo segmenta en oraciones, tokeniza cada una,
+la parsea (opcionalmente en varios procesos) y devuelve los resultados
+como un generador, en el mismo orden del documento. La memoria usada
+está acotada por el tamaño del bloque y el número de lotes en vuelo,
+no por el tamaño del documento.
+
+Ejecuta: python -m src.pipeline documento.txt [--workers N]
+"""
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import compiled_grammar
+from .cyk_algorithm import CYKParser
+from .parse_tree import ParseTreeBuilder
+from .tokenizer import Tokenizer, PUNCT_DROP
+
+
+# Fin de oración: signos finales seguidos de espacio, o una línea en blanco
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+(?=\s)|\n\s*\n')
+# Minúsculas, sin puntuación (ver tokenizer.WORD_PATTERN)
+DOCUMENT_TOKENIZER = Tokenizer(punctuation=PUNCT_DROP)
+
+
+def tokenize(sentence):
+    """
+    Convierte una oración en lista de palabras normalizadas
+
+    Args:
+        sentence: string con la oración
+
+    Returns:
+        TokenList de palabras en minúsculas, sin puntuación (el parser
+        la usa sin volver a normalizarla)
+    """
+    return DOCUMENT_TOKENIZER.tokenize(sentence)
+
+
+def iter_chunks(source, chunk_size=65536):
+    """
+    Lee el texto por bloques
+
+    Args:
+        source: ruta de archivo, objeto archivo o iterable de strings
+        chunk_size: caracteres por bloque al leer archivos
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            for chunk in iter_chunks(f, chunk_size):
+                yield chunk
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        for chunk in source:
+            yield chunk
+
+
+def segment_sentences(chunks, max_sentence_chars=10000):
+    """
+    Segmenta un flujo de bloques de texto en oraciones
+
+    Un límite puede quedar partido entre dos bloques, así que el texto
+    posterior al último límite encontrado se conserva hasta el siguiente.
+
+    Args:
+        chunks: iterable de strings
+        max_sentence_chars: si una oración supera este tamaño sin encontrar
+                            un límite, se corta en el último espacio
+                            (mantiene la memoria acotada)
+
+    Yields:
+        oraciones (strings sin espacios en los extremos, nunca vacías)
+    """
+    buffer = ""
+
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+
+        for match in SENTENCE_BOUNDARY.finditer(buffer):
+            sentence = buffer[start:match.end()].strip()
+            if sentence:
+                yield sentence
+            start = match.end()
+
+        buffer = buffer[start:]
+
+        while len(buffer) > max_sentence_chars:
+            cut = buffer.rfind(' ', 0, max_sentence_chars)
+            if cut <= 0:
+                cut = max_sentence_chars
+            sentence = buffer[:cut].strip()
+            if sentence:
+                yield sentence
+            buffer = buffer[cut:]
+
+    sentence = buffer.strip()
+    if sentence:
+        yield sentence
+
+
+class PipelineResult:
+    """
+    Resultado del parsing de una oración del documento
+
+    Atributos:
+        index: posición de la oración en el documento (desde 0)
+        sentence: texto original de la oración
+        words: lista de palabras tokenizadas
+        accepted: si la oración fue aceptada
+        time_taken: tiempo del parsing en segundos
+        bracket: árbol en notación de brackets (si se pidió y fue aceptada)
+        output: texto del formatter del pipeline (si se indicó uno)
+    """
+
+    __slots__ = ('index', 'sentence', 'words', 'accepted', 'time_taken', 'bracket', 'output')
+
+    def __init__(self, index, sentence, words, accepted, time_taken, bracket=None,
+                 output=None):
+        self.index = index
+        self.sentence = sentence
+        self.words = words
+        self.accepted = accepted
+        self.time_taken = time_taken
+        self.bracket = bracket
+        self.output = output
+
+    def __repr__(self):
+        status = "ACEPTADA" if self.accepted else "RECHAZADA"
+        return f"PipelineResult({self.index}, {self.sentence!r}, {status})"
+
+
+def _parse_batch(parser, batch, build_trees, formatter=None):
+    """
+    Parsea un lote de (índice, oración, palabras)
+
+    Returns:
+        lista de PipelineResult
+    """
+    results = []
+    for index, sentence, words in batch:
+        if words:
+            accepted, time_taken, _ = parser.parse(words)
+        else:
+            accepted, time_taken = False, 0.0
+
+        bracket = None
+        if build_trees and accepted:
+            bracket = ParseTreeBuilder(parser).bracket_string(words)
+
+        output = None
+        if formatter is not None:
+            output = formatter(parser, words, accepted)
+
+        results.append(
+            PipelineResult(index, sentence, words, accepted, time_taken, bracket, output)
+        )
+    return results
+
+
+# Parser de cada proceso trabajador (se crea una vez por proceso)
+_worker_parser = None
+
+
+def _init_worker(grammar, parser_options, shared_name=None):
+    """
+    Inicializa el parser de un proceso trabajador
+
+    Con shared_name, el parser usa las tablas del segmento compartido
+    en lugar de su propia copia de la gramática.
+    """
+    global _worker_parser
+    if shared_name is not None:
+        grammar = compiled_grammar.attach(shared_name)
+    _worker_parser = CYKParser(grammar, **parser_options)
+
+
+def _worker_parse_batch(batch, build_trees, formatter):
+    """Parsea un lote dentro de un proceso trabajador"""
+    return _parse_batch(_worker_parser, batch, build_trees, formatter)
+
+
+class ParsePipeline:
+    """
+    Etapa de pipeline: texto → oraciones → palabras → resultados del parser
+
+    Uso:
+        pipeline = ParsePipeline(cnf_grammar, workers=4)
+        for result in pipeline.run('corpus.txt'):
+            print(result.index, result.accepted)
+    """
+
+    def __init__(self, grammar, workers=1, batch_size=64, max_pending=None,
+                 build_trees=False, chunk_size=65536, parser_options=None,
+                 shared_grammar=True, formatter=None):
+        """
+        Args:
+            grammar: gramática en CNF
+            workers: número de procesos (1 = parsear en el proceso actual)
+            batch_size: oraciones por lote enviado a un proceso
+            max_pending: lotes en vuelo como máximo (por defecto 2 por proceso)
+            build_trees: si incluir el árbol en notación de brackets
+            chunk_size: caracteres leídos por bloque
+            parser_options: argumentos adicionales para CYKParser
+            shared_grammar: con varios procesos, compartir las tablas de la
+                            gramática en memoria compartida (de solo lectura)
+                            en lugar de copiarla en cada proceso
+            formatter: función opcional formatter(parser, palabras, aceptada)
+                       → str, llamada en el proceso que parseó la oración
+                       justo después del parse (puede leer parser.table);
+                       su resultado queda en PipelineResult.output. Con
+                       varios procesos debe poder serializarse con pickle
+                       (función de nivel de módulo)
+        """
+        self.grammar = grammar
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending or 2 * workers
+        self.build_trees = build_trees
+        self.chunk_size = chunk_size
+        self.parser_options = parser_options or {}
+        self.shared_grammar = shared_grammar and compiled_grammar.shared_memory is not None
+        self.formatter = formatter
+
+    def _iter_batches(self, source):
+        """Segmenta el documento y agrupa las oraciones tokenizadas en lotes"""
+        return self._batch_sentences(segment_sentences(iter_chunks(source, self.chunk_size)))
+
+    def _batch_sentences(self, sentences):
+        """Agrupa oraciones ya segmentadas en lotes de (índice, oración, palabras)"""
+        batch = []
+
+        for index, sentence in enumerate(sentences):
+            batch.append((index, sentence, tokenize(sentence)))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def run(self, source):
+        """
+        Procesa un documento completo
+
+        Args:
+            source: ruta de archivo, objeto archivo o iterable de strings
+
+        Yields:
+            PipelineResult en el orden del documento
+        """
+        return self._run_batches(self._iter_batches(source))
+
+    def run_sentences(self, sentences):
+        """
+        Procesa oraciones ya segmentadas (una por elemento, sin buscar límites)
+
+        Args:
+            sentences: iterable de strings
+
+        Yields:
+            PipelineResult en el mismo orden; index es la posición en sentences
+        """
+        return self._run_batches(self._batch_sentences(sentences))
+
+    def _run_batches(self, batches):
+        """Parsea los lotes en este proceso o en el pool, conservando el orden"""
+        if self.workers <= 1:
+            parser = CYKParser(self.grammar, **self.parser_options)
+            for batch in batches:
+                for result in _parse_batch(parser, batch, self.build_trees, self.formatter):
+                    yield result
+            return
+
+        segment = None
+        initargs = (self.grammar, self.parser_options)
+        if self.shared_grammar:
+            segment = compiled_grammar.share(compiled_grammar.CompiledGrammar(self.grammar))
+            initargs = (None, self.parser_options, segment.name)
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=initargs
+            ) as executor:
+                pending = deque()
+
+                for batch in batches:
+                    pending.append(
+                        executor.submit(
+                            _worker_parse_batch, batch, self.build_trees, self.formatter
+                        )
+                    )
+                    # Acotar la memoria: esperar el lote más antiguo
+                    while len(pending) >= self.max_pending:
+                        for result in pending.popleft().result():
+                            yield result
+
+                while pending:
+                    for result in pending.popleft().result():
+                        yield result
+        finally:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from .grammar import create_english_grammar
+    from .cnf_converter import CNFConverter
+
+    arg_parser = argparse.ArgumentParser(description="Parsea un documento completo")
+    arg_parser.add_argument('path', help="archivo de texto (UTF-8)")
+    arg_parser.add_argument('--workers', type=int, default=1)
+    arg_parser.add_argument('--trees', action='store_true',
+                            help="mostrar el árbol de las oraciones aceptadas")
+    args = arg_parser.parse_args()
+
+    cnf_grammar = CNFConverter(create_english_grammar()).convert()
+    pipeline = ParsePipeline(cnf_grammar, workers=args.workers, build_trees=args.trees)
+
+    total = accepted = 0
+    start = time.perf_counter()
+    for result in pipeline.run(args.path):
+        total += 1
+        accepted += result.accepted
+        status = "✓" if result.accepted else "✗"
+        print(f"{status} {result.sentence}")
+        if result.bracket:
+            print(f"   {result.bracket}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{total} oraciones ({accepted} aceptadas) en {elapsed:.2f} s")
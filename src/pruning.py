@@ -0,0 +1,133 @@
+"""
+Utilidades de poda para el parser CYK
+
+Para entradas largas o adversarias se puede acotar el trabajo del CYK:
+- Longitud máxima de constituyente por variable: una variable que no es
+  recursiva nunca deriva más palabras que su rendimiento máximo, así que
+  no vale la pena buscarla en celdas más largas.
+- Beam por celda: se conservan solo las N variables con mejor puntaje.
+"""
+
+
+def _binary_children(grammar):
+    """{variable: [(B, C), ...]} con las producciones binarias de la gramática"""
+    children = {}
+    for var, productions in grammar.productions.items():
+        children[var] = [
+            prod for prod in productions
+            if isinstance(prod, tuple) and len(prod) == 2
+        ]
+    return children
+
+
+def compute_max_spans(grammar):
+    """
+    Calcula cuántas palabras puede derivar como máximo cada variable (CNF)
+
+    Args:
+        grammar: gramática en CNF
+
+    Returns:
+        dict {variable: longitud máxima}; las variables recursivas (o que
+        dependen de una recursiva) no aparecen porque no tienen límite
+    """
+    children = _binary_children(grammar)
+    spans = {}
+    unbounded = set()
+    state = {}  # 1 = visitando, 2 = terminado
+
+    def visit(var):
+        state[var] = 1
+        best = 1 if any(not isinstance(p, tuple) for p in grammar.productions[var]) else 0
+        bounded = True
+
+        for left, right in children[var]:
+            total = 0
+            for child in (left, right):
+                if child not in grammar.productions:
+                    # Símbolo sin producciones: no deriva nada
+                    total = None
+                    break
+                if state.get(child) == 1:
+                    # Ciclo: la variable es recursiva
+                    bounded = False
+                    break
+                if child not in state:
+                    visit(child)
+                if child in unbounded:
+                    bounded = False
+                    break
+                total += spans[child]
+            if not bounded:
+                break
+            if total is not None:
+                best = max(best, total)
+
+        state[var] = 2
+        if bounded:
+            spans[var] = best
+        else:
+            unbounded.add(var)
+
+    for var in sorted(grammar.productions):
+        if var not in state:
+            visit(var)
+
+    # Las variables de un ciclo detectado tarde pueden haber quedado acotadas
+    # si se terminaron antes de cerrar el ciclo: se corrige propagando
+    changed = True
+    while changed:
+        changed = False
+        for var, rules in children.items():
+            if var in spans and any(
+                left in unbounded or right in unbounded for left, right in rules
+            ):
+                del spans[var]
+                unbounded.add(var)
+                changed = True
+
+    return spans
+
+
+def default_symbol_scores(grammar):
+    """
+    Puntaje heurístico (figura de mérito) de cada variable para el beam
+
+    Una variable que aparece como hija en más reglas binarias tiene más
+    posibilidades de formar constituyentes mayores. El símbolo inicial
+    siempre recibe el puntaje más alto.
+
+    Returns:
+        dict {variable: puntaje}
+    """
+    scores = {var: 1.0 for var in grammar.productions}
+    for rules in _binary_children(grammar).values():
+        for left, right in rules:
+            scores[left] = scores.get(left, 1.0) + 1.0
+            scores[right] = scores.get(right, 1.0) + 1.0
+
+    scores[grammar.start_symbol] = max(scores.values(), default=0.0) + 1.0
+    return scores
+
+
+def apply_beam(cell, cell_backs, beam_size, scores):
+    """
+    Deja en la celda solo las beam_size variables con mejor puntaje
+
+    Args:
+        cell: conjunto de variables de la celda
+        cell_backs: backpointers de la celda
+        beam_size: número de variables a conservar
+        scores: dict {variable: puntaje}
+
+    Returns:
+        número de variables eliminadas
+    """
+    if len(cell) <= beam_size:
+        return 0
+
+    ranked = sorted(cell, key=lambda var: (-scores.get(var, 0.0), var))
+    for var in ranked[beam_size:]:
+        cell.discard(var)
+        del cell_backs[var]
+    return len(ranked) - beam_size
@@ -0,0 +1,442 @@
+"""
+Módulo para generar oraciones aleatorias a partir de una gramática (CFG)
+
+Se usa para pruebas de carga del parser: genera oraciones del lenguaje,
+variantes casi correctas (mutaciones) y secuencias aleatorias de terminales.
+
+El muestreo usa tablas precalculadas de conteo de derivaciones por longitud,
+de modo que generar cada oración no requiere backtracking:
+- count[A][m]: número (o peso) de derivaciones de A que producen m palabras
+- suffix[regla][idx][m]: formas de que los símbolos regla[idx:] produzcan m palabras
+"""
+
+import random
+from bisect import bisect_right
+
+
+MUTATION_MODES = ('swap', 'drop', 'insert')
+
+# Intentos seguidos sin una mutación válida antes de rendirse en
+# iter_near_misses (mutaciones idénticas, vacías o aceptadas)
+MAX_NEAR_MISS_ATTEMPTS = 1000
+
+
+class SentenceGenerator:
+    """
+    Genera oraciones de una gramática de forma rápida y en streaming.
+
+    Modos de muestreo:
+    - uniforme: cada derivación de longitud m tiene la misma probabilidad
+    - ponderado: cada derivación pesa el producto de los pesos de sus reglas
+      (como una PCFG), condicionado a la longitud elegida
+    """
+
+    def __init__(self, grammar, max_length=20, rule_weights=None, seed=None):
+        """
+        Args:
+            grammar: objeto Grammar (original o en CNF, sin producciones epsilon)
+            max_length: longitud máxima (en palabras) de las oraciones generadas
+            rule_weights: None para muestreo uniforme, o dict con pesos por regla
+                          {variable: [peso por cada producción, en orden]} o
+                          {(variable, producción): peso}
+            seed: semilla para reproducibilidad
+        """
+        self.grammar = grammar
+        self.max_length = max_length
+        self.weighted = rule_weights is not None
+        self.rng = random.Random(seed)
+
+        # Reglas normalizadas: {variable: [(tupla_de_símbolos, peso), ...]}
+        self._rules = self._normalize_rules(rule_weights)
+        self._terminals = sorted(grammar.terminals)
+
+        # Tablas de conteo
+        self._counts = {}
+        self._suffix = {}
+        # Pesos acumulados calculados bajo demanda para muestrear
+        self._rule_choices = {}
+        self._split_choices = {}
+
+        self._compute_counts()
+
+    def _normalize_rules(self, rule_weights):
+        """Convierte las producciones a tuplas de símbolos con su peso"""
+        rules = {}
+
+        for var, prods in self.grammar.productions.items():
+            rules[var] = []
+            for idx, prod in enumerate(prods):
+                symbols = prod if isinstance(prod, tuple) else (prod,)
+
+                if rule_weights is None:
+                    weight = 1
+                elif isinstance(rule_weights.get(var), (list, tuple)):
+                    weight = rule_weights[var][idx]
+                else:
+                    weight = rule_weights.get((var, prod), 1.0)
+
+                if weight:
+                    rules[var].append((symbols, weight))
+
+        return rules
+
+    def _is_variable(self, symbol):
+        """Un símbolo es variable si tiene producciones propias"""
+        return symbol in self._rules
+
+    def _unit_order(self):
+        """
+        Ordena las variables para que, en producciones unitarias A → B,
+        B se calcule antes que A (ambas producen la misma longitud)
+
+        Raises:
+            ValueError: si hay un ciclo de producciones unitarias
+        """
+        order = []
+        state = {}  # 1 = visitando, 2 = terminado
+
+        for root in sorted(self._rules):
+            if root in state:
+                continue
+            stack = [(root, iter(self._unit_children(root)))]
+            state[root] = 1
+
+            while stack:
+                var, children = stack[-1]
+                for child in children:
+                    if state.get(child) == 1:
+                        raise ValueError(
+                            f"Ciclo de producciones unitarias en '{child}'"
+                        )
+                    if child not in state:
+                        state[child] = 1
+                        stack.append((child, iter(self._unit_children(child))))
+                        break
+                else:
+                    state[var] = 2
+                    order.append(var)
+                    stack.pop()
+
+        return order
+
+    def _unit_children(self, var):
+        """Variables B tales que existe la producción unitaria var → B"""
+        return [
+            symbols[0] for symbols, _ in self._rules[var]
+            if len(symbols) == 1 and self._is_variable(symbols[0])
+        ]
+
+    def _symbol_count(self, symbol, m):
+        """Número (o peso) de derivaciones de un símbolo con m palabras"""
+        if self._is_variable(symbol):
+            return self._counts[symbol][m]
+        return 1 if m == 1 else 0
+
+    def _compute_counts(self):
+        """Precalcula las tablas de conteo para longitudes 1..max_length"""
+        max_len = self.max_length
+        zero = 0 if not self.weighted else 0.0
+
+        for var in self._rules:
+            self._counts[var] = [zero] * (max_len + 1)
+            for r_idx, (symbols, _) in enumerate(self._rules[var]):
+                if len(symbols) > 1:
+                    self._suffix[(var, r_idx)] = [
+                        [zero] * (max_len + 1) for _ in symbols
+                    ]
+
+        order = self._unit_order()
+
+        for m in range(1, max_len + 1):
+            # Primero los conteos de las variables para la longitud m
+            for var in order:
+                total = zero
+                for r_idx, (symbols, weight) in enumerate(self._rules[var]):
+                    total += weight * self._rule_ways(var, r_idx, symbols, 0, m)
+                self._counts[var][m] = total
+
+            # Luego los sufijos (idx >= 1) que usarán longitudes mayores
+            for (var, r_idx), table in self._suffix.items():
+                symbols = self._rules[var][r_idx][0]
+                for idx in range(len(symbols) - 1, 0, -1):
+                    table[idx][m] = self._rule_ways(var, r_idx, symbols, idx, m)
+
+    def _rule_ways(self, var, r_idx, symbols, idx, m):
+        """Formas de que symbols[idx:] produzcan exactamente m palabras"""
+        remaining = len(symbols) - idx
+
+        if remaining == 1:
+            return self._symbol_count(symbols[idx], m)
+
+        table = self._suffix[(var, r_idx)][idx + 1]
+        total = 0
+        # Cada símbolo restante necesita al menos una palabra
+        for length in range(1, m - remaining + 2):
+            left = self._symbol_count(symbols[idx], length)
+            if left:
+                total += left * table[m - length]
+        return total
+
+    def count_derivations(self, length, symbol=None):
+        """
+        Número de derivaciones (o peso total) de un símbolo con la longitud dada
+
+        Args:
+            length: número de palabras
+            symbol: variable (por defecto el símbolo inicial)
+        """
+        symbol = symbol or self.grammar.start_symbol
+        if length < 1 or length > self.max_length:
+            return 0
+        return self._counts[symbol][length]
+
+    def feasible_lengths(self):
+        """Longitudes para las que el símbolo inicial tiene derivaciones"""
+        start = self.grammar.start_symbol
+        return [
+            m for m in range(1, self.max_length + 1)
+            if self._counts[start][m]
+        ]
+
+    def _pick(self, cumulative):
+        """Elige un índice según una lista de pesos acumulados"""
+        total = cumulative[-1]
+        if isinstance(total, int):
+            r = self.rng.randrange(total)
+        else:
+            r = self.rng.random() * total
+        return bisect_right(cumulative, r)
+
+    def _choose_rule(self, var, m):
+        """Elige una regla de var con probabilidad proporcional a sus derivaciones"""
+        key = (var, m)
+        choices = self._rule_choices.get(key)
+
+        if choices is None:
+            cumulative = []
+            total = 0
+            for r_idx, (symbols, weight) in enumerate(self._rules[var]):
+                total += weight * self._rule_ways(var, r_idx, symbols, 0, m)
+                cumulative.append(total)
+            choices = cumulative
+            self._rule_choices[key] = choices
+
+        return self._pick(choices)
+
+    def _choose_split(self, var, r_idx, symbols, idx, m):
+        """Elige cuántas palabras produce symbols[idx] si symbols[idx:] produce m"""
+        key = (var, r_idx, idx, m)
+        choices = self._split_choices.get(key)
+
+        if choices is None:
+            table = self._suffix[(var, r_idx)][idx + 1]
+            remaining = len(symbols) - idx
+            cumulative = []
+            total = 0
+            for length in range(1, m - remaining + 2):
+                total += self._symbol_count(symbols[idx], length) * table[m - length]
+                cumulative.append(total)
+            choices = cumulative
+            self._split_choices[key] = choices
+
+        return self._pick(choices) + 1
+
+    def _choose_length(self, lengths):
+        """Elige la longitud de la próxima oración"""
+        if self.weighted:
+            # En modo ponderado la longitud sigue la distribución de la PCFG
+            start = self.grammar.start_symbol
+            cumulative = []
+            total = 0.0
+            for m in lengths:
+                total += self._counts[start][m]
+                cumulative.append(total)
+            return lengths[self._pick(cumulative)]
+        return lengths[self.rng.randrange(len(lengths))]
+
+    def generate(self, length=None):
+        """
+        Genera una oración del lenguaje
+
+        Args:
+            length: número de palabras (None = longitud aleatoria factible)
+
+        Returns:
+            lista de palabras
+
+        Raises:
+            ValueError: si no existe ninguna oración con esa longitud
+        """
+        if length is None:
+            lengths = self.feasible_lengths()
+            if not lengths:
+                raise ValueError("La gramática no genera oraciones dentro de max_length")
+            length = self._choose_length(lengths)
+        elif not self.count_derivations(length):
+            raise ValueError(f"No hay oraciones de longitud {length}")
+
+        words = []
+        # Pila de (símbolo, longitud); se procesa de izquierda a derecha
+        stack = [(self.grammar.start_symbol, length)]
+
+        while stack:
+            symbol, m = stack.pop()
+
+            if not self._is_variable(symbol):
+                words.append(symbol)
+                continue
+
+            r_idx = self._choose_rule(symbol, m)
+            symbols = self._rules[symbol][r_idx][0]
+
+            if len(symbols) == 1:
+                stack.append((symbols[0], m))
+                continue
+
+            # Repartir las m palabras entre los símbolos de la regla
+            parts = []
+            remaining = m
+            for idx in range(len(symbols) - 1):
+                part = self._choose_split(symbol, r_idx, symbols, idx, remaining)
+                parts.append((symbols[idx], part))
+                remaining -= part
+            parts.append((symbols[-1], remaining))
+
+            stack.extend(reversed(parts))
+
+        return words
+
+    def iter_sentences(self, count=None, length=None, as_string=True):
+        """
+        Iterador en streaming de oraciones del lenguaje
+
+        Args:
+            count: número de oraciones (None = infinito)
+            length: longitud fija o None para longitudes aleatorias
+            as_string: si devolver strings o listas de palabras
+        """
+        produced = 0
+        while count is None or produced < count:
+            words = self.generate(length)
+            yield " ".join(words) if as_string else words
+            produced += 1
+
+    def mutate(self, words, mode=None):
+        """
+        Aplica una mutación a una oración para obtener una variante cercana
+
+        Args:
+            words: lista de palabras
+            mode: 'swap', 'drop', 'insert' o None (aleatorio)
+
+        Returns:
+            nueva lista de palabras
+        """
+        mode = mode or self.rng.choice(MUTATION_MODES)
+        words = list(words)
+        n = len(words)
+
+        if mode == 'swap':
+            if n >= 2:
+                i = self.rng.randrange(n - 1)
+                words[i], words[i + 1] = words[i + 1], words[i]
+        elif mode == 'drop':
+            if n >= 1:
+                del words[self.rng.randrange(n)]
+        elif mode == 'insert':
+            words.insert(self.rng.randrange(n + 1), self.rng.choice(self._terminals))
+        else:
+            raise ValueError(f"Modo de mutación desconocido: {mode}")
+
+        return words
+
+    def iter_near_misses(self, count=None, modes=MUTATION_MODES,
+                         recognizer=None, as_string=True,
+                         max_attempts=MAX_NEAR_MISS_ATTEMPTS):
+        """
+        Iterador de oraciones mutadas a partir de oraciones del lenguaje
+
+        Args:
+            count: número de oraciones (None = infinito)
+            modes: modos de mutación permitidos
+            recognizer: función opcional (lista de palabras → bool); si se da,
+                        solo se devuelven las mutaciones que NO son aceptadas
+            as_string: si devolver strings o listas de palabras
+            max_attempts: intentos seguidos sin una mutación válida antes
+                          de abortar
+
+        Raises:
+            ValueError: si max_attempts mutaciones seguidas son iguales a la
+                        original, vacías o aceptadas por recognizer (por
+                        ejemplo 'drop' sobre oraciones de una palabra o una
+                        gramática que lo acepta todo)
+        """
+        produced = 0
+        attempts = 0
+        while count is None or produced < count:
+            if attempts >= max_attempts:
+                raise ValueError(
+                    f"Sin mutaciones válidas tras {max_attempts} intentos "
+                    f"(modos: {', '.join(modes)})"
+                )
+            attempts += 1
+
+            original = self.generate()
+            words = self.mutate(original, self.rng.choice(modes))
+
+            if words == original or not words:
+                continue
+            if recognizer is not None and recognizer(words):
+                continue
+
+            yield " ".join(words) if as_string else words
+            produced += 1
+            attempts = 0
+
+    def iter_junk(self, count=None, min_length=1, max_length=None, as_string=True):
+        """
+        Iterador de secuencias aleatorias de terminales (ruido)
+
+        Args:
+            count: número de oraciones (None = infinito)
+            min_length: longitud mínima
+            max_length: longitud máxima (por defecto self.max_length)
+            as_string: si devolver strings o listas de palabras
+        """
+        max_length = max_length or self.max_length
+        choice = self.rng.choice
+        produced = 0
+        while count is None or produced < count:
+            length = self.rng.randint(min_length, max_length)
+            words = [choice(self._terminals) for _ in range(length)]
+            yield " ".join(words) if as_string else words
+            produced += 1
+
+
+if __name__ == "__main__":
+    # Prueba del módulo
+    import time
+    from .grammar import create_english_grammar
+
+    g = create_english_grammar()
+    generator = g.sentence_generator(max_length=12, seed=42)
+
+    print("=== ORACIONES DEL LENGUAJE ===")
+    for sentence in generator.iter_sentences(5):
+        print(" ", sentence)
+
+    print("\n=== MUTACIONES ===")
+    for sentence in generator.iter_near_misses(5):
+        print(" ", sentence)
+
+    print("\n=== RUIDO ===")
+    for sentence in generator.iter_junk(3, max_length=6):
+        print(" ", sentence)
+
+    total = 100000
+    start = time.perf_counter()
+    for _ in generator.iter_sentences(total, as_string=False):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"\n{total} oraciones en {elapsed:.2f} s "
+          f"({total / elapsed * 60 / 1e6:.2f} millones/minuto)")
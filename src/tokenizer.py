@@ -0,0 +1,167 @@
+"""
+Tokenización y normalización de oraciones
+
+Tokenizer convierte un texto en la lista de palabras que recibe el
+parser. Todas las reglas se preparan al crear el tokenizador (tabla de
+str.translate y expresión regular precompilada), así que tokenizar es
+una pasada de translate más split() o findall().
+
+El resultado es un TokenList: una lista de palabras ya normalizadas.
+CYKParser.parse y EarleyParser.parse la usan tal cual, sin volver a
+normalizarla, de modo que una oración se tokeniza una sola vez y la
+misma lista sirve para parsear y para construir el árbol:
+
+    words = parser.tokenizer.tokenize(sentence)
+    parser.parse(words)
+    ParseTreeBuilder(parser).build_tree(words)
+
+Ejecuta: python -m src.tokenizer "Texto a tokenizar"
+"""
+
+import re
+import unicodedata
+
+
+# Tratamiento de la puntuación
+PUNCT_KEEP = 'keep'      # separar solo por espacios (la puntuación queda pegada)
+PUNCT_SPLIT = 'split'    # cada signo de puntuación es un token aparte
+PUNCT_DROP = 'drop'      # descartar la puntuación
+
+# Palabras: secuencias de letras, dígitos, apóstrofes o guiones internos
+WORD_PATTERN = re.compile(r"\w+(?:['-]\w+)*")
+# Palabras o signos sueltos (PUNCT_SPLIT)
+TOKEN_PATTERN = re.compile(r"\w+(?:['-]\w+)*|[^\w\s]")
+
+# Comillas, apóstrofes y guiones tipográficos → ASCII
+TYPOGRAPHIC_MAP = {
+    '‘': "'", '’': "'", '‚': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '″': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-',
+    '\u00a0': ' ', '\u2009': ' ', '\u202f': ' ',
+}
+
+
+class TokenList(list):
+    """
+    Lista de palabras ya tokenizadas y normalizadas
+
+    Los parsers la reciben sin volver a normalizarla (una lista común
+    sí se normaliza palabra por palabra).
+    """
+
+    __slots__ = ()
+
+
+class Tokenizer:
+    """
+    Tokenizador configurable con reglas precompiladas
+
+    Atributos:
+        case_folding: 'lower', 'casefold' o None (conservar mayúsculas)
+        punctuation: PUNCT_KEEP, PUNCT_SPLIT o PUNCT_DROP
+        unicode_form: forma de unicodedata.normalize ('NFC', 'NFKC', ...)
+                      o None
+    """
+
+    def __init__(self, case_folding='lower', punctuation=PUNCT_KEEP,
+                 unicode_form=None, replacements=None):
+        """
+        Args:
+            case_folding: 'lower', 'casefold' o None
+            punctuation: PUNCT_KEEP, PUNCT_SPLIT o PUNCT_DROP
+            unicode_form: normalización Unicode a aplicar antes de todo
+            replacements: dict {carácter: reemplazo} aplicado con
+                          str.translate (por ejemplo TYPOGRAPHIC_MAP)
+        """
+        if case_folding not in ('lower', 'casefold', None):
+            raise ValueError(f"case_folding desconocido: {case_folding}")
+        if punctuation not in (PUNCT_KEEP, PUNCT_SPLIT, PUNCT_DROP):
+            raise ValueError(f"Tratamiento de puntuación desconocido: {punctuation}")
+        if unicode_form is not None:
+            unicodedata.normalize(unicode_form, '')  # valida la forma
+
+        self.case_folding = case_folding
+        self.punctuation = punctuation
+        self.unicode_form = unicode_form
+        self.replacements = dict(replacements) if replacements else None
+
+        self._table = str.maketrans(self.replacements) if self.replacements else None
+        self._fold = {'lower': str.lower, 'casefold': str.casefold, None: None}[case_folding]
+        if punctuation == PUNCT_SPLIT:
+            self._split = TOKEN_PATTERN.findall
+        elif punctuation == PUNCT_DROP:
+            self._split = WORD_PATTERN.findall
+        else:
+            self._split = str.split
+
+    def normalize(self, text):
+        """Aplica Unicode, reemplazos y mayúsculas a un texto (sin separarlo)"""
+        if self.unicode_form is not None:
+            text = unicodedata.normalize(self.unicode_form, text)
+        if self._table is not None:
+            text = text.translate(self._table)
+        if self._fold is not None:
+            text = self._fold(text)
+        return text
+
+    def tokenize(self, sentence):
+        """
+        Convierte una oración en lista de palabras
+
+        Args:
+            sentence: string, TokenList (se devuelve tal cual) o lista de
+                      palabras (se normaliza cada una, sin separarlas)
+
+        Returns:
+            TokenList
+        """
+        if isinstance(sentence, TokenList):
+            return sentence
+        if isinstance(sentence, str):
+            return TokenList(self._split(self.normalize(sentence)))
+        normalize = self.normalize
+        return TokenList([normalize(word) for word in sentence])
+
+    def __call__(self, sentence):
+        return self.tokenize(sentence)
+
+    def __repr__(self):
+        return (f"Tokenizer(case_folding={self.case_folding!r}, "
+                f"punctuation={self.punctuation!r}, unicode_form={self.unicode_form!r})")
+
+
+class _DefaultTokenizer(Tokenizer):
+    """
+    Tokenizador por defecto de los parsers: minúsculas y split()
+
+    Evita el paso genérico por normalize() en el caso más común.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def tokenize(self, sentence):
+        if sentence.__class__ is str:
+            return TokenList(sentence.lower().split())
+        if isinstance(sentence, TokenList):
+            return sentence
+        if isinstance(sentence, str):
+            return TokenList(sentence.lower().split())
+        return TokenList([word.lower() for word in sentence])
+
+
+# Igual al comportamiento histórico de CYKParser.parse
+DEFAULT_TOKENIZER = _DefaultTokenizer()
+
+
+if __name__ == "__main__":
+    import sys
+
+    text = " ".join(sys.argv[1:]) or "The dog — she said “drinks” the beer!"
+    for tokenizer in (
+        DEFAULT_TOKENIZER,
+        Tokenizer(punctuation=PUNCT_SPLIT, replacements=TYPOGRAPHIC_MAP),
+        Tokenizer(case_folding='casefold', punctuation=PUNCT_DROP, unicode_form='NFKC'),
+    ):
+        print(f"{tokenizer!r}\n  {tokenizer.tokenize(text)}")
+
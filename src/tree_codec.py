@@ -0,0 +1,385 @@
+"""
+Formatos de salida para guardar muchos árboles de parsing
+
+- Binario: cada árbol se codifica en pre-orden como IDs de símbolo y
+  longitudes de subcadena empaquetados en varints (LEB128). Un archivo
+  binario empieza con la tabla de símbolos y luego tiene un registro por
+  árbol (longitud en varint + datos), así que se escribe y se lee en
+  streaming.
+- JSONL: una línea JSON por oración, con el árbol en el formato de
+  ParseTreeBuilder.write_json.
+
+Codificación de un nodo:
+    varint(id << 1 | es_hoja)      las hojas (nodos sin hijos) cubren 1 palabra
+    varint(longitud)               solo en nodos con hijos
+Los hijos de un nodo se leen hasta cubrir su longitud.
+"""
+
+import io
+import json
+
+from .parse_tree import ParseTreeNode
+
+
+MAGIC = b'CYKT'
+FORMAT_VERSION = 1
+
+
+def write_varint(buffer, value):
+    """Agrega un entero no negativo en LEB128 a un bytearray"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, position):
+    """
+    Lee un entero LEB128
+
+    Returns:
+        tuple (valor, posición siguiente)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class TreeCodec:
+    """
+    Codifica árboles de parsing en binario compacto con una tabla de símbolos fija
+
+    Uso:
+        codec = TreeCodec.from_grammar(cnf_grammar)
+        data = codec.encode(tree)
+        tree = codec.decode(data)
+    """
+
+    def __init__(self, symbols):
+        """
+        Args:
+            symbols: lista de símbolos (variables y terminales); el índice es el ID
+        """
+        self.symbols = list(symbols)
+        self.symbol_ids = {symbol: idx for idx, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_grammar(cls, grammar):
+        """Tabla de símbolos con las variables y los terminales de la gramática"""
+        return cls(sorted(grammar.variables) + sorted(grammar.terminals))
+
+    def encode(self, tree):
+        """
+        Codifica un árbol (ParseTreeNode o LazyTreeNode)
+
+        Raises:
+            ValueError: si el árbol tiene un símbolo fuera de la tabla
+
+        Returns:
+            bytes
+        """
+        buffer = bytearray()
+        if tree is not None:
+            self.encode_into(tree, buffer)
+        return bytes(buffer)
+
+    def encode_into(self, tree, buffer):
+        """Agrega la codificación de un árbol a un bytearray"""
+        spans = _spans(tree)
+        symbol_ids = self.symbol_ids
+        stack = [tree]
+
+        while stack:
+            node = stack.pop()
+            idx = symbol_ids.get(node.symbol)
+            if idx is None:
+                raise ValueError(f"Símbolo fuera de la tabla del codec: {node.symbol!r}")
+
+            children = node.children
+            if not children:
+                write_varint(buffer, idx << 1 | 1)
+                continue
+
+            write_varint(buffer, idx << 1)
+            write_varint(buffer, spans[id(node)])
+            stack.extend(reversed(children))
+
+    def decode(self, data):
+        """
+        Decodifica un árbol
+
+        Returns:
+            ParseTreeNode raíz (None si data está vacío)
+        """
+        if not data:
+            return None
+
+        symbols = self.symbols
+        root = None
+        # Pila de [nodo, longitud pendiente de cubrir, longitud total]
+        stack = []
+        position = 0
+        end = len(data)
+
+        while position < end:
+            code, position = read_varint(data, position)
+            node = ParseTreeNode(symbols[code >> 1])
+            if stack:
+                stack[-1][0].children.append(node)
+            else:
+                root = node
+
+            if code & 1:
+                _consume(stack, 1)
+            else:
+                span, position = read_varint(data, position)
+                stack.append([node, span, span])
+
+        return root
+
+    def decode_compact(self, data):
+        """
+        Decodifica un árbol a su forma compacta, sin crear nodos
+
+        Returns:
+            lista en pre-orden de (símbolo, longitud, es_hoja)
+        """
+        symbols = self.symbols
+        nodes = []
+        position = 0
+        end = len(data)
+
+        while position < end:
+            code, position = read_varint(data, position)
+            if code & 1:
+                nodes.append((symbols[code >> 1], 1, True))
+            else:
+                span, position = read_varint(data, position)
+                nodes.append((symbols[code >> 1], span, False))
+        return nodes
+
+
+def _consume(stack, span):
+    """Descuenta la longitud de un nodo completo de sus ancestros"""
+    while stack:
+        top = stack[-1]
+        top[1] -= span
+        if top[1] > 0:
+            return
+        # El padre quedó completo: su longitud se descuenta del abuelo
+        stack.pop()
+        span = top[2]
+
+
+def _spans(tree):
+    """Longitud (número de hojas) de cada nodo {id(nodo): longitud}, en post-orden"""
+    spans = {}
+    stack = [(tree, False)]
+    while stack:
+        node, done = stack.pop()
+        if not node.children:
+            spans[id(node)] = 1
+        elif done:
+            spans[id(node)] = sum(spans[id(child)] for child in node.children)
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+    return spans
+
+
+class BinaryTreeWriter:
+    """
+    Escribe árboles en un archivo binario: encabezado con la tabla de
+    símbolos y un registro (varint longitud + datos) por árbol
+
+    Un registro vacío representa una oración sin árbol (rechazada).
+    """
+
+    def __init__(self, stream, codec):
+        """
+        Args:
+            stream: archivo abierto en modo binario
+            codec: TreeCodec con la tabla de símbolos
+        """
+        self.stream = stream
+        self.codec = codec
+        self.count = 0
+
+        header = bytearray(MAGIC)
+        header.append(FORMAT_VERSION)
+        write_varint(header, len(codec.symbols))
+        for symbol in codec.symbols:
+            encoded = symbol.encode('utf-8')
+            write_varint(header, len(encoded))
+            header.extend(encoded)
+        stream.write(header)
+
+    def write(self, tree):
+        """Agrega un árbol (o None)"""
+        data = self.codec.encode(tree)
+        prefix = bytearray()
+        write_varint(prefix, len(data))
+        self.stream.write(bytes(prefix) + data)
+        self.count += 1
+
+
+class BinaryTreeReader:
+    """
+    Lee un archivo escrito con BinaryTreeWriter
+
+    Uso:
+        with open('trees.bin', 'rb') as f:
+            for tree in BinaryTreeReader(f):
+                ...
+    """
+
+    def __init__(self, stream, chunk_size=1 << 16):
+        """
+        Args:
+            stream: archivo abierto en modo binario
+            chunk_size: bytes leídos por bloque
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._buffer = b''
+        self._position = 0
+
+        if self._read_exact(len(MAGIC)) != MAGIC:
+            raise ValueError("El archivo no contiene árboles codificados")
+        version = self._read_exact(1)[0]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+
+        symbols = []
+        for _ in range(self._read_varint()):
+            symbols.append(self._read_exact(self._read_varint()).decode('utf-8'))
+        self.codec = TreeCodec(symbols)
+
+    def _fill(self, size):
+        """Asegura al menos size bytes en el buffer (False al llegar al final)"""
+        while len(self._buffer) - self._position < size:
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                return False
+            self._buffer = self._buffer[self._position:] + chunk
+            self._position = 0
+        return True
+
+    def _read_exact(self, size):
+        if not self._fill(size):
+            raise ValueError("Archivo de árboles truncado")
+        data = self._buffer[self._position:self._position + size]
+        self._position += size
+        return data
+
+    def _read_varint(self):
+        value = 0
+        shift = 0
+        while True:
+            byte = self._read_exact(1)[0]
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def iter_records(self):
+        """Itera los registros codificados (bytes; vacíos = sin árbol)"""
+        while self._fill(1):
+            yield self._read_exact(self._read_varint())
+
+    def __iter__(self):
+        """Itera los árboles como ParseTreeNode (None = sin árbol)"""
+        decode = self.codec.decode
+        for record in self.iter_records():
+            yield decode(record)
+
+    def iter_compact(self):
+        """Itera los árboles en forma compacta (ver TreeCodec.decode_compact)"""
+        decode = self.codec.decode_compact
+        for record in self.iter_records():
+            yield decode(record)
+
+
+class JsonlWriter:
+    """
+    Escribe resultados del parser en JSON Lines (una oración por línea)
+
+    Cada línea: {"sentence": ..., "accepted": ..., "tree": árbol o null, ...}
+    """
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: archivo abierto en modo texto
+        """
+        self.stream = stream
+        self.count = 0
+
+    def write(self, words, accepted, builder=None, **fields):
+        """
+        Agrega una oración
+
+        Args:
+            words: lista de palabras
+            accepted: si la oración fue aceptada
+            builder: ParseTreeBuilder del parse; si se da y la oración fue
+                     aceptada, el árbol se escribe directamente desde la tabla
+            **fields: campos adicionales (por ejemplo time_ms)
+        """
+        write = self.stream.write
+        record = {'sentence': " ".join(words), 'accepted': accepted}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False)
+
+        write(line[:-1] + ', "tree": ')
+        if not (accepted and builder is not None and builder.write_json(words, self.stream)):
+            write('null')
+        write('}\n')
+        self.count += 1
+
+
+def read_jsonl(stream, as_nodes=True):
+    """
+    Lee un archivo escrito con JsonlWriter
+
+    Args:
+        stream: archivo abierto en modo texto (o ruta)
+        as_nodes: si convertir el árbol a ParseTreeNode
+
+    Yields:
+        dict por línea
+    """
+    if isinstance(stream, str):
+        with io.open(stream, 'r', encoding='utf-8') as f:
+            for record in read_jsonl(f, as_nodes):
+                yield record
+        return
+
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if as_nodes and record.get('tree') is not None:
+            record['tree'] = tree_from_json(record['tree'])
+        yield record
+
+
+def tree_from_json(data):
+    """Convierte un árbol en formato JSON (dict) a ParseTreeNode"""
+    root = ParseTreeNode(data['symbol'])
+    stack = [(root, data.get('children', ()))]
+    while stack:
+        node, children = stack.pop()
+        for child in children:
+            child_node = ParseTreeNode(child['symbol'])
+            node.children.append(child_node)
+            grandchildren = child.get('children')
+            if grandchildren:
+                stack.append((child_node, grandchildren))
+    return root
@@ -0,0 +1,184 @@
+"""
+Modelo de palabras desconocidas a partir del léxico de la gramática
+
+Una palabra fuera del léxico deja vacía su celda de la diagonal y la
+oración se rechaza siempre. UnknownWordModel le asigna variables
+candidatas según las palabras conocidas que se le parecen:
+
+- Sufijos: un trie de sufijos invertidos (hasta max_suffix letras) guarda
+  en cada nodo la clase candidata de las palabras del léxico que
+  terminan así ("-s" → V/VP, "-er" → N, ...). La búsqueda baja por el trie
+  con las últimas letras de la palabra y se queda con el nodo más
+  profundo: O(longitud de la palabra).
+- Forma: la palabra se reduce a su forma (letras → x, dígitos → d, el
+  resto se conserva, repeticiones colapsadas: "3-d" → "d-x"). Las formas
+  que no son solo letras usan la clase de las palabras del léxico con la
+  misma forma, si existen.
+
+Las candidatas de cada nodo se precalculan al construir el índice y
+tienen como máximo max_candidates variables, así que la tabla no crece
+sin límite con muchas palabras desconocidas. Cada combinación de
+candidatas es una clase léxica más (ver CompiledGrammar.classes), con un
+ID a continuación de las clases de la gramática; la caché del parser la
+usa como cualquier otra clase.
+"""
+
+import re
+from collections import Counter
+
+
+# Letras → x, dígitos → d (el resto de caracteres se conserva)
+_SHAPE_TABLE = str.maketrans(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789',
+    'x' * 52 + 'd' * 10
+)
+_REPEATS = re.compile(r'(.)\1+')
+
+
+def word_shape(word):
+    """Forma de una palabra: 'cat' → 'x', 'B-52' → 'x-d', '3.14' → 'd.d'"""
+    return _REPEATS.sub(r'\1', word.translate(_SHAPE_TABLE))
+
+
+class UnknownWordModel:
+    """
+    Asigna variables candidatas a palabras fuera del léxico
+
+    Uso:
+        parser = CYKParser(cnf_grammar, unknown_words=UnknownWordModel())
+
+    El índice se construye con las tablas compiladas del parser la primera
+    vez que aparece una palabra desconocida y se reconstruye si la
+    gramática cambia.
+    """
+
+    def __init__(self, max_candidates=3, max_suffix=4, min_count=2):
+        """
+        Args:
+            max_candidates: máximo de variables asignadas a una palabra
+            max_suffix: letras finales que se consideran como sufijo
+            min_count: palabras del léxico necesarias para que un sufijo
+                       o una forma tenga sus propias candidatas (si no,
+                       se usan las del sufijo más corto)
+        """
+        if max_candidates < 1:
+            raise ValueError("max_candidates debe ser al menos 1")
+
+        self.max_candidates = max_candidates
+        self.max_suffix = max_suffix
+        self.min_count = min_count
+
+        self.classes = []
+        self._class_index = {}
+        self._compiled = None
+        self._version = None
+        self._root = None
+        self._shapes = {}
+
+    def prepare(self, compiled):
+        """
+        Construye el índice para unas tablas compiladas (si hace falta)
+
+        Args:
+            compiled: CompiledGrammar del parser
+
+        Returns:
+            lista de clases: las de la gramática seguidas de las
+            combinaciones de candidatas del modelo
+        """
+        if compiled is not self._compiled or compiled.version != self._version:
+            self._build(compiled)
+        return self.classes
+
+    def _build(self, compiled):
+        """Construye el trie de sufijos y el índice de formas"""
+        self._compiled = compiled
+        self._version = compiled.version
+        self.classes = list(compiled.classes)
+        self._class_index = {
+            variables: idx for idx, variables in enumerate(self.classes)
+        }
+
+        # Conteo de clases léxicas por sufijo invertido y por forma
+        root = [{}, Counter()]
+        shapes = {}
+        for idx, terminal in enumerate(compiled.terminals):
+            class_id = compiled.word_classes[idx]
+            if not compiled.classes[class_id]:
+                continue
+
+            node = root
+            node[1][class_id] += 1
+            for char in reversed(terminal[-self.max_suffix:]):
+                node = node[0].setdefault(char, [{}, Counter()])
+                node[1][class_id] += 1
+
+            shapes.setdefault(word_shape(terminal), Counter())[class_id] += 1
+
+        self._root = self._freeze(root, self._candidates(root[1]))
+        self._shapes = {
+            shape: self._candidates(counts)
+            for shape, counts in shapes.items()
+            if sum(counts.values()) >= self.min_count
+        }
+
+    def _freeze(self, node, inherited):
+        """Convierte un nodo de conteos a (hijos, clase candidata)"""
+        children, counts = node
+        if sum(counts.values()) >= self.min_count:
+            class_id = self._candidates(counts)
+        else:
+            class_id = inherited
+        return (
+            {char: self._freeze(child, class_id) for char, child in children.items()},
+            class_id
+        )
+
+    def _candidates(self, counts):
+        """
+        Clase con las variables de las clases más frecuentes, sin pasar de
+        max_candidates (una clase que no cabe entera se omite)
+        """
+        variables = []
+        for class_id, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            new = [
+                variable for variable in self.classes[class_id]
+                if variable not in variables
+            ]
+            if len(variables) + len(new) <= self.max_candidates:
+                variables.extend(new)
+
+        variables = tuple(variables)
+        idx = self._class_index.get(variables)
+        if idx is None:
+            idx = len(self.classes)
+            self.classes.append(variables)
+            self._class_index[variables] = idx
+        return idx
+
+    def classify(self, word):
+        """
+        Clase candidata de una palabra desconocida (llamar antes a prepare)
+
+        Returns:
+            ID de clase en self.classes
+        """
+        shape = word_shape(word)
+        if shape != 'x':
+            class_id = self._shapes.get(shape)
+            if class_id is not None:
+                return class_id
+
+        node = self._root
+        class_id = node[1]
+        for char in reversed(word[-self.max_suffix:]):
+            node = node[0].get(char)
+            if node is None:
+                break
+            class_id = node[1]
+        return class_id
+
+    def candidates(self, word, compiled):
+        """Variables candidatas de una palabra desconocida"""
+        classes = self.prepare(compiled)
+        return classes[self.classify(word)]
@@ -0,0 +1,266 @@
+"""
+Llenado paralelo de la tabla CYK por frentes de onda (anti-diagonales)
+
+Todas las celdas de una misma longitud dependen solo de longitudes
+menores, así que cada anti-diagonal se reparte en rangos de posiciones
+que calculan varios procesos a la vez (los hilos no sirven: el GIL
+serializa el Python puro). Las matrices de bits del kernel de
+bitset_cyk.py viven en un segmento de multiprocessing.shared_memory que
+los procesos leen sin copiarlas; el proceso principal escribe en él las
+celdas nuevas al terminar cada longitud.
+
+Cada frente cuesta un viaje de ida y vuelta al pool (~0.3 ms), así que
+solo compensa con oraciones muy largas: por debajo de
+WAVEFRONT_MIN_LENGTH palabras se usa el kernel en un solo proceso, y
+dentro de una oración larga los frentes con pocas celdas (las
+longitudes altas) también se calculan localmente.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+from .bitset_cyk import BitsetKernel
+
+
+# Longitud a partir de la cual CYKParser reparte la oración entre procesos
+WAVEFRONT_MIN_LENGTH = 600
+
+# Celdas mínimas por proceso para repartir un frente
+MIN_CHUNK_CELLS = 64
+
+
+class SharedBits:
+    """
+    Matrices de bits rows/cols del kernel en un segmento de memoria compartida
+
+    Cada entrada [símbolo][posición] ocupa width bytes (little endian):
+    primero todas las de rows y después todas las de cols.
+    """
+
+    def __init__(self, symbol_count, n, name=None):
+        """
+        Args:
+            symbol_count: número de símbolos del kernel
+            n: número de palabras
+            name: nombre de un segmento existente (None = crearlo)
+        """
+        self.symbol_count = symbol_count
+        self.n = n
+        self.width = (n + 8) // 8
+        self.plane = symbol_count * (n + 1) * self.width
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=2 * self.plane)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+        self.rows = _BitPlane(self, 0)
+        self.cols = _BitPlane(self, self.plane)
+
+    def write(self, rows, cols):
+        """Copia matrices completas de enteros al segmento"""
+        buf = self.shm.buf
+        width = self.width
+        for plane, matrix in ((self.rows, rows), (self.cols, cols)):
+            for symbol, positions in enumerate(matrix):
+                for pos, bits in enumerate(positions):
+                    if bits:
+                        offset = plane.offset(symbol, pos)
+                        buf[offset:offset + width] = bits.to_bytes(width, 'little')
+
+    def set_bit(self, plane, symbol, pos, bit):
+        """Enciende un bit de una entrada"""
+        offset = plane.offset(symbol, pos) + bit // 8
+        self.shm.buf[offset] |= 1 << (bit % 8)
+
+    def close(self):
+        """Libera el segmento (y lo elimina si este objeto lo creó)"""
+        self.rows = self.cols = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _BitPlane:
+    """Vista [símbolo][posición] → entero de una de las dos matrices"""
+
+    __slots__ = ('bits', 'base')
+
+    def __init__(self, bits, base):
+        self.bits = bits
+        self.base = base
+
+    def offset(self, symbol, pos):
+        return self.base + (symbol * (self.bits.n + 1) + pos) * self.bits.width
+
+    def __getitem__(self, symbol):
+        return _BitRow(self, symbol)
+
+
+class _BitRow:
+    """Fila de un símbolo: row[pos] decodifica la entrada como entero"""
+
+    __slots__ = ('plane', 'symbol')
+
+    def __init__(self, plane, symbol):
+        self.plane = plane
+        self.symbol = symbol
+
+    def __getitem__(self, pos):
+        bits = self.plane.bits
+        offset = self.plane.offset(self.symbol, pos)
+        return int.from_bytes(bits.shm.buf[offset:offset + bits.width], 'little')
+
+
+# Estado de cada proceso trabajador
+_worker_kernel = None
+_worker_bits = None
+
+
+def _init_worker(compiled):
+    """Prepara el kernel una vez por proceso"""
+    global _worker_kernel
+    _worker_kernel = BitsetKernel(compiled)
+
+
+def _attach(name, symbol_count, n):
+    """Se conecta al segmento de la oración actual (reutilizando la conexión)"""
+    global _worker_bits
+    if _worker_bits is not None and _worker_bits.name != name:
+        _worker_bits.close()
+        _worker_bits = None
+    if _worker_bits is None:
+        # Los trabajadores comparten el resource_tracker del proceso
+        # principal, que es quien elimina el segmento
+        _worker_bits = SharedBits(symbol_count, n, name=name)
+    return _worker_bits
+
+
+def _worker_fill_span(name, symbol_count, n, length, start, stop):
+    """Calcula un rango de celdas de un frente dentro de un trabajador"""
+    bits = _attach(name, symbol_count, n)
+    results, hits, checks, _ = _worker_kernel.fill_span(
+        bits.rows, bits.cols, length, start, stop
+    )
+    return results, hits, checks
+
+
+class WavefrontFiller:
+    """
+    Llena la parte binaria de una CYKChart repartiendo cada frente entre procesos
+
+    Tiene la misma interfaz que BitsetKernel.fill y produce la misma tabla.
+    """
+
+    def __init__(self, compiled, workers=None, min_chunk_cells=MIN_CHUNK_CELLS):
+        """
+        Args:
+            compiled: CompiledGrammar de la gramática en CNF
+            workers: número de procesos (None = os.cpu_count())
+            min_chunk_cells: celdas mínimas por proceso para repartir un frente
+        """
+        self.compiled = compiled
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chunk_cells = min_chunk_cells
+        self.kernel = BitsetKernel(compiled)
+        self._executor = None
+
+    @staticmethod
+    def available():
+        """Verifica que la plataforma tiene memoria compartida (Python 3.8+)"""
+        return shared_memory is not None
+
+    def is_current(self):
+        """Verifica que la gramática no cambió desde la compilación"""
+        return self.kernel.is_current()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.compiled,)
+            )
+        return self._executor
+
+    def fill(self, chart, deadline=None, clock=None):
+        """
+        Llena las celdas de longitud >= 2 de una tabla con la diagonal lista
+
+        Args:
+            chart: CYKChart con las celdas de longitud 1 ya llenas
+            deadline: instante límite (según clock) o None; se revisa
+                      entre frentes
+            clock: función de tiempo para el límite
+
+        Returns:
+            tuple (rule_hits, rule_checks, timed_out)
+        """
+        kernel = self.kernel
+        symbols = kernel.symbols
+        n = chart.n
+        rows, cols = kernel.initial_bits(chart)
+        rule_hits = 0
+        rule_checks = 0
+
+        bits = SharedBits(len(symbols), n)
+        try:
+            bits.write(rows, cols)
+
+            for length in range(2, n + 1):
+                count = n - length + 1
+                chunks = min(self.workers, count // self.min_chunk_cells)
+
+                if chunks < 2:
+                    results, hits, checks, timed_out = kernel.fill_span(
+                        rows, cols, length, 0, count, deadline, clock
+                    )
+                else:
+                    executor = self._get_executor()
+                    bounds = [count * c // chunks for c in range(chunks + 1)]
+                    futures = [
+                        executor.submit(
+                            _worker_fill_span, bits.name, len(symbols), n,
+                            length, bounds[c], bounds[c + 1]
+                        )
+                        for c in range(chunks)
+                    ]
+                    results = []
+                    hits = checks = 0
+                    for future in futures:
+                        chunk_results, chunk_hits, chunk_checks = future.result()
+                        results.extend(chunk_results)
+                        hits += chunk_hits
+                        checks += chunk_checks
+                    timed_out = deadline is not None and clock() > deadline
+
+                rule_hits += hits
+                rule_checks += checks
+                kernel.apply_span(chart, rows, cols, length, results)
+
+                # Publicar las celdas nuevas para el siguiente frente
+                for i, best in results:
+                    j = i + length
+                    for variable in best:
+                        idx = symbols[variable]
+                        bits.set_bit(bits.rows, idx, i, j)
+                        bits.set_bit(bits.cols, idx, j, i)
+
+                if timed_out:
+                    return rule_hits, rule_checks, True
+        finally:
+            bits.close()
+
+        return rule_hits, rule_checks, False
+
+    def close(self):
+        """Termina los procesos trabajadores"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -9,6 +9,29 @@ from src.cyk_algorithm import CYKParser
 from src.parse_tree import ParseTreeBuilder
 
 
+# Oraciones de prueba con el resultado esperado (también las usa benchmark.py)
+TEST_SENTENCES = [
+    # Oraciones válidas con verbo + objeto
+    ("she eats a cake", True),
+    ("the dog drinks the beer", True),
+    ("the fork eats the oven", True),
+    
+    # Oraciones válidas con solo verbo
+    ("she eats", True),
+    ("he drinks", True),
+    
+    # Oraciones válidas con preposiciones
+    ("she eats with a fork", True),
+    ("the dog drinks in the oven", True),
+    
+    # Oraciones inválidas
+    ("eats she cake", False),  # Orden incorrecto
+    ("she the cake", False),   # Falta verbo
+    ("drinks dog", False),     # Falta determinante
+    ("she eats the", False),   # Falta sustantivo después de determinante
+]
+
+
 def test_basic():
     """Prueba básica del sistema completo"""
     
@@ -36,28 +59,7 @@ def test_basic():
     print("\n[4/4] Probando oraciones de ejemplo...")
     print("\n" + "-"*70)
     
-    test_sentences = [
-        # Oraciones válidas con verbo + objeto
-        ("she eats a cake", True),
-        ("the dog drinks the beer", True),
-        ("the fork eats the oven", True),
-        
-        # Oraciones válidas con solo verbo
-        ("she eats", True),
-        ("he drinks", True),
-        
-        # Oraciones válidas con preposiciones
-        ("she eats with a fork", True),
-        ("the dog drinks in the oven", True),
-        
-        # Oraciones inválidas
-        ("eats she cake", False),  # Orden incorrecto
-        ("she the cake", False),   # Falta verbo
-        ("drinks dog", False),     # Falta determinante
-        ("she eats the", False),   # Falta sustantivo después de determinante
-    ]
-    
-    for sentence, expected in test_sentences:
+    for sentence, expected in TEST_SENTENCES:
         accepted, time_ms, _ = parser.parse(sentence)
         time_ms = time_ms * 1000
         
@@ -70,8 +72,7 @@ def test_basic():
         # Si fue aceptada, mostrar árbol pequeño
         if accepted:
             builder = ParseTreeBuilder(parser)
-            tree = builder.build_tree(sentence.split())
-            bracket = builder.to_bracket_notation(tree)
+            bracket = builder.bracket_string(sentence.split())
             print(f"   Árbol: {bracket}")
         
         print()
@@ -81,5 +82,285 @@ def test_basic():
     print("\nPara ejecutar el programa completo, usa: python main.py")
 
 
+def test_near_misses_terminan():
+    """iter_near_misses aborta si ninguna mutación puede ser válida"""
+    from src.grammar import Grammar
+    
+    # Solo oraciones de una palabra: 'drop' siempre deja la oración vacía
+    grammar = Grammar({'S'}, {'hi'}, {'S': ['hi']})
+    generator = grammar.sentence_generator(max_length=3, seed=0)
+    try:
+        next(generator.iter_near_misses(1, modes=('drop',), max_attempts=50))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("iter_near_misses debió abortar")
+    
+    # Un reconocedor que lo acepta todo tampoco deja pasar ninguna
+    generator = create_english_grammar().sentence_generator(max_length=6, seed=0)
+    try:
+        next(generator.iter_near_misses(1, recognizer=lambda words: True, max_attempts=50))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("iter_near_misses debió abortar")
+
+
+def test_tracemalloc_etapas_anidadas():
+    """El pico de una etapa incluye lo asignado antes de una etapa anidada"""
+    import tracemalloc
+    from src.hooks import TracemallocObserver
+    
+    observer = TracemallocObserver()
+    observer.on_start('externa', {})
+    big = bytearray(4 * 1024 * 1024)
+    del big
+    observer.on_start('interna', {})
+    observer.on_end('interna', {})
+    observer.on_end('externa', {})
+    observer.stop()
+    
+    assert observer.peak_bytes('externa') >= 4 * 1024 * 1024
+    if hasattr(tracemalloc, 'reset_peak'):  # Python >= 3.9
+        assert observer.peak_bytes('interna') < 1024 * 1024
+
+def test_cache_compartida_entre_gramaticas():
+    """Dos gramáticas con las mismas clases léxicas no mezclan resultados"""
+    from src.parse_cache import ParseCache, STORE_TREE
+    
+    sentence = "she eats a cake with a fork"
+    cache = ParseCache(store=STORE_TREE)
+    
+    grammar = create_english_grammar()
+    parser = CYKParser(CNFConverter(grammar).convert(), cache=cache)
+    assert parser.parse(sentence)[0]
+    
+    # Sin VP → VP PP el complemento con preposición no tiene dónde colgar
+    reduced = create_english_grammar()
+    reduced.remove_production('VP', ('VP', 'PP'))
+    other = CYKParser(CNFConverter(reduced).convert(), cache=cache)
+    assert not other.parse(sentence)[0]
+    
+    # Las entradas de la primera gramática siguen sirviendo
+    hits = cache.hits
+    assert parser.parse(sentence)[0]
+    assert cache.hits == hits + 1
+    assert parser.last_engine == 'cache'
+
+def test_max_span_invalido():
+    """Un max_span que no es None, 'auto' ni dict se rechaza"""
+    cnf = CNFConverter(create_english_grammar()).convert()
+    for value in (3, 'automatic', ['NP']):
+        try:
+            CYKParser(cnf, max_span=value)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"max_span={value!r} debió rechazarse")
+    CYKParser(cnf, max_span={'NP': 2})
+
+def test_sin_tabla_error_claro():
+    """Tras un acierto en una caché STORE_ACCEPT no hay tabla que mostrar"""
+    from src.parse_cache import ParseCache, STORE_ACCEPT
+    
+    parser = CYKParser(CNFConverter(create_english_grammar()).convert(),
+                       cache=ParseCache(store=STORE_ACCEPT), collect_stats=True)
+    words = "she eats a cake".split()
+    parser.parse(words)
+    assert parser.extract_chunks(words)
+    
+    assert parser.parse(words)[0] and parser.table is None
+    assert parser.last_engine == 'cache' and parser.last_stats.engines == {'cache': 1}
+    for show in (parser.extract_chunks, parser.print_table, parser.get_parse_explanation):
+        try:
+            show(words)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{show.__name__} debió fallar sin tabla")
+
+def _ambiguous_grammar():
+    """Gramática en inglés con NP → NP PP: los PP pueden colgar de NP o de VP"""
+    grammar = create_english_grammar()
+    grammar.add_production('NP', ('NP', 'PP'))
+    return grammar
+
+
+def _engine_sentences(grammar, lengths, count=4, seed=0):
+    """Oraciones generadas, mutadas y basura (listas de palabras) por longitud"""
+    generator = grammar.sentence_generator(max_length=max(lengths) + 1, seed=seed)
+    sentences = []
+    for length in lengths:
+        generated = [generator.generate(length) for _ in range(count)]
+        sentences.extend(generated)
+        sentences.extend(generator.mutate(words) for words in generated)
+        sentences.extend(generator.iter_junk(count, min_length=length,
+                                             max_length=length, as_string=False))
+    return sentences
+
+
+def _assert_same_as_classic(parser, engine, sentences, counters):
+    """El motor da la misma aceptación, árbol y contadores que el bucle clásico"""
+    reference = CYKParser(parser.grammar, engine='classic', collect_stats=True)
+    for words in sentences:
+        expected = reference.parse(words)[0]
+        accepted = parser.parse(words)[0]
+        assert parser.last_engine == engine, (parser.last_engine, words)
+        assert accepted == expected, words
+        if expected:
+            assert (ParseTreeBuilder(parser).bracket_string(words)
+                    == ParseTreeBuilder(reference).bracket_string(words)), words
+        for name in counters:
+            assert (getattr(parser.last_stats, name)
+                    == getattr(reference.last_stats, name)), (name, words)
+
+
+def test_bitset_igual_al_clasico():
+    """El kernel de bits llena la misma tabla que el bucle clásico"""
+    grammar = _ambiguous_grammar()
+    parser = CYKParser(CNFConverter(grammar).convert(), engine='bitset',
+                       collect_stats=True)
+    # rule_checks cuenta pares (B, C) en el kernel, no reglas por división
+    _assert_same_as_classic(parser, 'bitset', _engine_sentences(grammar, (3, 8, 20)),
+                            ('rule_hits', 'cells_filled'))
+
+def test_wavefront_igual_al_clasico():
+    """El llenado por frentes en varios procesos da la tabla del bucle clásico"""
+    from src.wavefront import WavefrontFiller
+    if not WavefrontFiller.available():
+        return
+    
+    grammar = _ambiguous_grammar()
+    # Con ~130 palabras los frentes cortos se reparten entre los procesos
+    parser = CYKParser(CNFConverter(grammar).convert(), parallel_workers=2,
+                       parallel_min_length=2, collect_stats=True)
+    try:
+        _assert_same_as_classic(parser, 'wavefront',
+                                _engine_sentences(grammar, (4, 130), count=2),
+                                ('rule_hits', 'cells_filled'))
+    finally:
+        parser.close()
+
+def test_codegen_igual_al_clasico():
+    """El kernel generado reproduce tabla y contadores del bucle clásico"""
+    grammar = _ambiguous_grammar()
+    parser = CYKParser(CNFConverter(grammar).convert(), engine='codegen',
+                       collect_stats=True)
+    _assert_same_as_classic(parser, 'codegen', _engine_sentences(grammar, (3, 8, 20)),
+                            ('rule_hits', 'rule_checks', 'cells_filled'))
+
+def test_codegen_poda_kernels():
+    """Los kernels guardados no crecen sin límite con cada cambio de gramática"""
+    import os
+    import tempfile
+    from src.codegen_kernel import KERNEL_CACHE_LIMIT, generate_source, load_kernel
+    
+    rules = [('S', 'NP', 'VP'), ('VP', 'V', 'NP'), ('PP', 'P', 'NP')]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for count in range(KERNEL_CACHE_LIMIT + 3):
+            load_kernel(generate_source(rules[:count % 3 + 1] * (count // 3 + 1)), cache_dir)
+        names = os.listdir(cache_dir)
+        assert len(names) == 2 * KERNEL_CACHE_LIMIT, names
+        assert not [name for name in names if name.endswith('.tmp')]
+        
+        # Un kernel guardado se vuelve a cargar del disco
+        source = generate_source(rules)
+        load_kernel(source, cache_dir)
+        assert load_kernel(source, cache_dir)[1]
+
+def test_auto_sin_earley_por_defecto():
+    """ENGINE_AUTO solo considera Earley si se pide en auto_engines"""
+    grammar = create_english_grammar()
+    cnf = CNFConverter(grammar).convert()
+    
+    parser = CYKParser(cnf, original_grammar=grammar, engine='auto', calibration_file=None)
+    assert 'earley' not in parser.engine_selector.eligible_engines()
+    
+    parser = CYKParser(cnf, original_grammar=grammar, engine='auto', calibration_file=None,
+                       auto_engines=('classic', 'earley'))
+    assert parser.engine_selector.eligible_engines() == ('classic', 'earley')
+    
+    try:
+        CYKParser(cnf, auto_engines=('classic', 'wavefront'))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("auto_engines con un motor no admitido debió rechazarse")
+
+def test_tabla_muestra_variables_completas():
+    """La diagonal mostrada incluye las T_a que las clases léxicas omiten"""
+    from src.compiled_grammar import CompiledGrammar
+    
+    cnf = CNFConverter(create_english_grammar()).convert()
+    block = CompiledGrammar.from_buffer(CompiledGrammar(cnf).to_bytes())
+    words = "she eats a cake".split()
+    for grammar in (cnf, block):
+        parser = CYKParser(grammar)
+        parser.parse(words)
+        assert "'cake' puede ser: N, T_cake" in parser.get_parse_explanation(words)
+    assert set(block.lexical[block.terminal_id('cake')]) == {'N', 'T_cake'}
+
+def test_delta_actualiza_clases():
+    """apply_delta deja las mismas clases y reglas que compilar de nuevo"""
+    from src.compiled_grammar import CompiledGrammar
+    
+    # Las reglas nuevas van al final: se compara sin orden
+    def snapshot(compiled):
+        return (
+            {term: (set(compiled.classes[compiled.word_classes[idx]]),
+                    set(compiled.hidden[idx]))
+             for idx, term in enumerate(compiled.terminals)},
+            sorted(compiled.binary_rules),
+        )
+    
+    cnf = CNFConverter(create_english_grammar()).convert()
+    compiled = CompiledGrammar(cnf)
+    steps = [
+        # T_eats pasa a usarse: 'eats' sale de la clase de los otros verbos
+        ([('VP', ('T_eats', 'NP'))], []),
+        ([('N', 'zebra'), ('T_zebra', 'zebra')], [('N', 'cat')]),
+        ([], [('VP', ('T_eats', 'NP')), ('T_zebra', 'zebra')]),
+    ]
+    for added, removed in steps:
+        for variable, prod in removed:
+            cnf.remove_production(variable, prod)
+        for variable, prod in added:
+            cnf.add_production(variable, prod)
+        compiled.apply_delta(added, removed, cnf.version)
+        assert snapshot(compiled) == snapshot(CompiledGrammar(cnf))
+
+def test_informe_muestra_variables_completas():
+    """La tabla del informe técnico también incluye las T_a de la diagonal"""
+    from generate_report import render_example
+    
+    parser = CYKParser(CNFConverter(create_english_grammar()).convert())
+    words = "she eats a cake".split()
+    accepted = parser.parse(words)[0]
+    text = render_example(parser, words, accepted)
+    row = next(line for line in text.splitlines() if line.startswith("Longitud 1:"))
+    assert "T_cake" in row, row
+
+def test_cache_olvida_gramaticas_liberadas():
+    """La caché compartida no acumula dueños ni entradas de gramáticas liberadas"""
+    import gc
+    from src.parse_cache import ParseCache
+    
+    cache = ParseCache()
+    keep = CYKParser(CNFConverter(create_english_grammar()).convert(), cache=cache)
+    keep.parse("she eats a cake")
+    for _ in range(5):
+        reduced = create_english_grammar()
+        reduced.remove_production('VP', ('VP', 'PP'))
+        other = CYKParser(CNFConverter(reduced).convert(), cache=cache)
+        other.parse("she eats a cake")
+        del other, reduced
+        gc.collect()
+    
+    # Solo queda la gramática viva y su entrada
+    assert len(cache._owners) == 1 and len(cache) == 1
+    hits = cache.hits
+    assert keep.parse("she eats a cake")[0] and cache.hits == hits + 1
+
+
 if __name__ == "__main__":
     test_basic()
\ No newline at end of file